@@ -0,0 +1,222 @@
+"""Benchmark reproducible de las operaciones del catálogo en cada implementación.
+
+Mide agregar, buscar, listar, reportar y eliminar sobre catálogos sintéticos
+(con semilla y mezcla de géneros configurables) para la Biblioteca original
+de biblioteca.py y cada backend registrado en main.BACKENDS. Los resultados
+se escriben como JSON; con ``--base`` se comparan contra una corrida guardada
+y se marcan las operaciones más lentas que la tolerancia. Uso:
+
+    python benchmark_biblioteca.py [--tamanos 1000 10000 100000] [--backends original refactorizada]
+        [--mezcla novela=4 ciencia=3 historia=2 poesia=1] [--semilla 0] [--repeticiones 3]
+        [--salida resultados.json] [--base base.json] [--tolerancia 0.2]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import random
+import sys
+import time
+
+import biblioteca
+import libro
+import libroRefactorizado
+from main import BACKENDS
+
+MEZCLA_POR_DEFECTO = {"novela": 4, "ciencia": 3, "historia": 2, "poesia": 1}
+OPERACIONES = ("agregar", "buscar", "listar", "reporte", "eliminar")
+# Búsquedas y bajas por corrida: lo suficiente para medir sin dominar el tiempo
+CONSULTAS = 1000
+# Tiempos base menores que esto son ruido de medición y no se comparan
+MINIMO_COMPARABLE = 0.001
+
+
+def generar_catalogo(cantidad, semilla=0, mezcla=None):
+    """Tuplas (título, autor, género, páginas, año, disponible) reproducibles para una semilla.
+
+    ``mezcla`` asigna a cada género un peso relativo; algunos títulos se repiten
+    para que búsquedas y bajas encuentren más de un ejemplar.
+    """
+    mezcla = MEZCLA_POR_DEFECTO if mezcla is None else mezcla
+    azar = random.Random(semilla)
+    generos = azar.choices(list(mezcla), weights=list(mezcla.values()), k=cantidad)
+    titulos = max(1, cantidad * 9 // 10)
+    return [(f"Libro {azar.randrange(titulos)}", f"Autor {azar.randrange(max(1, cantidad // 20))}", genero,
+             azar.randint(10, 1000), azar.randint(1900, 2024), azar.random() < 0.8)
+            for genero in generos]
+
+
+class _Salida(io.TextIOBase):
+    """Descarta lo que la Biblioteca original imprime, sin acumularlo en memoria."""
+    def write(self, texto):
+        return len(texto)
+
+
+class Backend:
+    """Adapta una biblioteca a las operaciones medidas."""
+    clase_libro = libroRefactorizado.Libro
+
+    def __init__(self, fabrica):
+        self.fabrica = fabrica
+
+    def crear(self):
+        return self.fabrica()
+
+    def agregar(self, catalogo, libros):
+        catalogo.agregar_libros(libros)
+
+    def buscar(self, catalogo, titulos):
+        for titulo in titulos:
+            catalogo.buscar_libro(titulo)
+
+    def listar(self, catalogo):
+        catalogo.listar_libros()
+
+    def reporte(self, catalogo):
+        catalogo.generar_reporte()
+
+    def eliminar(self, catalogo, titulos):
+        for titulo in titulos:
+            catalogo.eliminar_libro(titulo)
+
+
+class BackendOriginal(Backend):
+    """biblioteca.Biblioteca: pide los datos por input() e imprime el reporte.
+
+    El alta agrega a la lista como lo hace ``agregar_libro`` tras leer los
+    datos y el reporte se mide con la salida descartada. No tiene búsqueda,
+    listado ni bajas, así que esas operaciones quedan sin medir.
+    """
+    clase_libro = libro.Libro
+    buscar = listar = eliminar = None
+
+    def __init__(self):
+        super().__init__(biblioteca.Biblioteca)
+
+    def agregar(self, catalogo, libros):
+        catalogo.libros.extend(libros)
+
+    def reporte(self, catalogo):
+        with contextlib.redirect_stdout(_Salida()):
+            catalogo.generar_reporte()
+
+
+REGISTRO_BACKENDS = {"original": BackendOriginal(),
+                     **{nombre: Backend(clase) for nombre, clase in BACKENDS.items()}}
+
+
+def medir_corrida(backend, datos, consultas):
+    """Segundos de cada operación sobre un catálogo nuevo (None si no está soportada)."""
+    libros = [backend.clase_libro(*fila) for fila in datos]
+    catalogo = backend.crear()
+    pasos = (("agregar", backend.agregar, (libros,)), ("buscar", backend.buscar, (consultas,)),
+             ("listar", backend.listar, ()), ("reporte", backend.reporte, ()),
+             ("eliminar", backend.eliminar, (consultas,)))
+    tiempos = {}
+    for nombre, operacion, argumentos in pasos:
+        if operacion is None:
+            tiempos[nombre] = None
+            continue
+        inicio = time.perf_counter()
+        operacion(catalogo, *argumentos)
+        tiempos[nombre] = time.perf_counter() - inicio
+    cerrar = getattr(catalogo, "cerrar", None)
+    if cerrar is not None:
+        cerrar()
+    return tiempos
+
+
+def medir(backends, tamanos, semilla, mezcla, repeticiones):
+    resultados = {nombre: {} for nombre in backends}
+    for tamano in tamanos:
+        datos = generar_catalogo(tamano, semilla, mezcla)
+        azar = random.Random(semilla + tamano)
+        consultas = [azar.choice(datos)[0] for _ in range(CONSULTAS)]
+        for nombre in backends:
+            corridas = [medir_corrida(REGISTRO_BACKENDS[nombre], datos, consultas) for _ in range(repeticiones)]
+            resultados[nombre][str(tamano)] = {
+                operacion: None if corridas[0][operacion] is None else min(c[operacion] for c in corridas)
+                for operacion in OPERACIONES}
+            print(f"{nombre:>14} {tamano:>9}  " + "  ".join(
+                f"{operacion}={'-' if segundos is None else f'{segundos:.4f}'}"
+                for operacion, segundos in resultados[nombre][str(tamano)].items()), file=sys.stderr)
+    return resultados
+
+
+def comparar(actual, base, tolerancia):
+    """Lista de (backend, tamaño, operación, base, actual) más lentos que ``base * (1 + tolerancia)``.
+
+    Se ignoran las operaciones que en la base tardaron menos de ``MINIMO_COMPARABLE``.
+    """
+    regresiones = []
+    for nombre, por_tamano in actual["resultados"].items():
+        for tamano, operaciones in por_tamano.items():
+            anteriores = base["resultados"].get(nombre, {}).get(tamano, {})
+            for operacion, segundos in operaciones.items():
+                anterior = anteriores.get(operacion)
+                if segundos is None or not anterior or anterior < MINIMO_COMPARABLE:
+                    continue
+                if segundos > anterior * (1 + tolerancia):
+                    regresiones.append((nombre, tamano, operacion, anterior, segundos))
+    return regresiones
+
+
+def leer_mezcla(pares):
+    mezcla = {}
+    for par in pares:
+        genero, _, peso = par.partition("=")
+        mezcla[genero] = float(peso or 1)
+    return mezcla
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--backends", nargs="+", choices=REGISTRO_BACKENDS, default=list(REGISTRO_BACKENDS))
+    parser.add_argument("--mezcla", nargs="+", metavar="GENERO=PESO",
+                        default=[f"{genero}={peso}" for genero, peso in MEZCLA_POR_DEFECTO.items()])
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto, la salida estándar)")
+    parser.add_argument("--base", help="Resultados JSON anteriores contra los que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Fracción de tiempo extra admitida antes de marcar una regresión")
+    args = parser.parse_args()
+
+    mezcla = leer_mezcla(args.mezcla)
+    actual = {
+        "metadatos": {
+            "fecha": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "semilla": args.semilla,
+            "mezcla": mezcla,
+            "repeticiones": args.repeticiones,
+            "consultas": CONSULTAS,
+            "unidad": "segundos (mejor de las repeticiones)",
+        },
+        "resultados": medir(args.backends, args.tamanos, args.semilla, mezcla, args.repeticiones),
+    }
+    texto = json.dumps(actual, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.base:
+        with open(args.base, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(actual, base, args.tolerancia)
+        for nombre, tamano, operacion, anterior, segundos in regresiones:
+            print(f"REGRESIÓN {nombre} {tamano} {operacion}: {anterior:.4f} s -> {segundos:.4f} s "
+                  f"(+{(segundos / anterior - 1) * 100:.0f}%)", file=sys.stderr)
+        if regresiones:
+            raise SystemExit(1)
+        print(f"Sin regresiones (tolerancia {args.tolerancia:.0%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Prueba de carga multihilo sobre BibliotecaConcurrente.
+
+Varios hilos lectores consultan el catálogo mientras un hilo escritor presta
+y devuelve libros. Al final se verifica que los totales acumulados sigan
+siendo consistentes y se informa el rendimiento de lectura por cantidad de
+hilos. Uso:
+
+    python benchmark_concurrencia.py [--libros 20000] [--hilos 1 2 4 8 16] [--segundos 2]
+"""
+import argparse
+import random
+import threading
+import time
+
+from bibliotecaConcurrente import BibliotecaConcurrente
+from libroRefactorizado import GENEROS, Libro
+
+
+def crear_biblioteca(cantidad):
+    biblioteca = BibliotecaConcurrente()
+    biblioteca.agregar_libros(Libro(f"Libro {i}", f"Autor {i % 500}", GENEROS[i % len(GENEROS)],
+                                    50 + i % 700, 1900 + i % 120) for i in range(cantidad))
+    return biblioteca
+
+
+def lector(biblioteca, cantidad, fin, operaciones, indice):
+    azar = random.Random(indice)
+    realizadas = 0
+    while time.perf_counter() < fin:
+        eleccion = azar.random()
+        if eleccion < 0.6:
+            biblioteca.buscar_libro(f"libro {azar.randrange(cantidad)}")
+        elif eleccion < 0.8:
+            biblioteca.generar_reporte()
+        else:
+            biblioteca.mas_populares(10, azar.choice(GENEROS))
+        realizadas += 1
+    operaciones[indice] = realizadas
+
+
+def escritor(biblioteca, cantidad, fin, contador):
+    azar = random.Random(-1)
+    prestados = []
+    while time.perf_counter() < fin:
+        if prestados and azar.random() < 0.5:
+            biblioteca.devolver(prestados.pop())
+        else:
+            titulo = f"Libro {azar.randrange(cantidad)}"
+            if biblioteca.prestar(titulo) is not None:
+                prestados.append(titulo)
+        contador[0] += 1
+
+
+def medir(biblioteca, cantidad, hilos, segundos):
+    fin = time.perf_counter() + segundos
+    operaciones = [0] * hilos
+    escrituras = [0]
+    trabajadores = [threading.Thread(target=lector, args=(biblioteca, cantidad, fin, operaciones, i))
+                    for i in range(hilos)]
+    trabajadores.append(threading.Thread(target=escritor, args=(biblioteca, cantidad, fin, escrituras)))
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    return sum(operaciones) / segundos, escrituras[0] / segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--libros", type=int, default=20_000)
+    parser.add_argument("--hilos", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--segundos", type=float, default=2.0)
+    args = parser.parse_args()
+
+    biblioteca = crear_biblioteca(args.libros)
+    print(f"{'Hilos':>6}{'Lecturas/s':>14}{'Escrituras/s':>14}")
+    for hilos in args.hilos:
+        lecturas, escrituras = medir(biblioteca, args.libros, hilos, args.segundos)
+        print(f"{hilos:>6}{lecturas:>14.0f}{escrituras:>14.0f}")
+    consistente = biblioteca.verificar_agregados()
+    print(f"Totales consistentes: {'Sí' if consistente else 'No'}")
+    if not consistente:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
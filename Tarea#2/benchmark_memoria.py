@@ -0,0 +1,64 @@
+"""Mide la memoria por libro y el ritmo de construcción de las clases Libro.
+
+Compara el Libro original de libro.py (un __dict__ por instancia y el género
+sin internar) con el de libroRefactorizado.py (__slots__ y género internado).
+Uso:
+
+    python benchmark_memoria.py [--tamanos 10000 100000 1000000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import libro
+import libroRefactorizado
+
+GENEROS = ("novela", "ciencia", "historia")
+
+
+def construir(clase, titulos):
+    return [clase(titulo, "Autor", GENEROS[i % len(GENEROS)].lower(), 100 + i % 500, 1900 + i % 120)
+            for i, titulo in enumerate(titulos)]
+
+
+def medir(clase, cantidad):
+    # Los títulos se generan antes de medir para contar solo el objeto Libro.
+    # El género se crea dentro de la medición con lower(), como lo entrega
+    # input(): una cadena nueva por libro que solo se conserva si no se interna.
+    titulos = [f"Título {i}" for i in range(cantidad)]
+
+    # El ritmo se mide sin tracemalloc, que ralentiza cada asignación
+    gc.collect()
+    inicio = time.perf_counter()
+    libros = construir(clase, titulos)
+    duracion = time.perf_counter() - inicio
+    del libros
+
+    gc.collect()
+    tracemalloc.start()
+    libros = construir(clase, titulos)
+    usado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del libros
+    return usado / cantidad, cantidad / duracion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10**4, 10**5, 10**6])
+    args = parser.parse_args()
+
+    clases = [
+        ("libro (dict)", libro.Libro),
+        ("libroRefactorizado (slots)", libroRefactorizado.Libro),
+    ]
+    print(f"{'Clase':<28}{'Libros':>10}{'Bytes/libro':>14}{'Libros/s':>14}")
+    for cantidad in args.tamanos:
+        for nombre, clase in clases:
+            bytes_por_libro, ritmo = medir(clase, cantidad)
+            print(f"{nombre:<28}{cantidad:>10}{bytes_por_libro:>14.1f}{ritmo:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Microbenchmark del costo por libro de calcular la popularidad.
+
+Compara la cadena if/elif original (libro.Libro) con la tabla de reglas de
+libroRefactorizado.Libro sin caché, con caché y con el cálculo por lotes.
+El lote se compara con las cachés invalidadas (su caso de uso, tras un
+cambio de reglas); con la caché válida el cálculo por libro es más barato.
+Uso:
+
+    python benchmark_popularidad.py [--libros 100000] [--repeticiones 5]
+"""
+import argparse
+import random
+import time
+
+import libro
+import libroRefactorizado
+from popularidad import REGLAS, calcular_popularidades
+
+GENEROS = ("novela", "ciencia", "historia", "poesia")
+
+
+def mejor_tiempo(funcion, repeticiones, preparar=None):
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def invalidar_cache():
+    # Volver a cargar la misma tabla sube la versión e invalida las cachés
+    REGLAS.actualizar(*REGLAS.reglas())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--libros", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    azar = random.Random(0)
+    datos = [(f"Libro {i}", "Autor", azar.choice(GENEROS), azar.randint(10, 1000), 1990)
+             for i in range(args.libros)]
+    originales = [libro.Libro(*fila) for fila in datos]
+    refactorizados = [libroRefactorizado.Libro(*fila) for fila in datos]
+
+    esperado = [l.calcular_popularidad() for l in originales]
+    assert [l.calcular_popularidad() for l in refactorizados] == esperado
+    assert calcular_popularidades(refactorizados) == esperado
+
+    casos = [
+        ("if/elif original", lambda: [l.calcular_popularidad() for l in originales], None),
+        ("tabla, sin caché", lambda: [l.calcular_popularidad() for l in refactorizados], invalidar_cache),
+        ("tabla, con caché", lambda: [l.calcular_popularidad() for l in refactorizados], None),
+        ("lote, cachés inválidas", lambda: calcular_popularidades(refactorizados), invalidar_cache),
+    ]
+    print(f"{'Variante':<22}{'ns/libro':>12}")
+    for nombre, funcion, preparar in casos:
+        segundos = mejor_tiempo(funcion, args.repeticiones, preparar)
+        print(f"{nombre:<22}{segundos / args.libros * 1e9:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Escalado del reporte paralelo según la cantidad de procesos.
+
+Genera un catálogo sintético en disco, calcula el reporte con 1..N procesos
+y compara el resultado con el de Biblioteca (si el catálogo no es demasiado
+grande para cargarlo en memoria). Uso:
+
+    python benchmark_reporte_paralelo.py [--libros 2000000] [--procesos 1 2 4 8] [--verificar]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bibliotecaRefactorizada import Biblioteca
+from libroRefactorizado import GENEROS, Libro
+from persistencia import abrir_catalogo, guardar_catalogo
+from reporteParalelo import generar_reporte_paralelo
+
+
+def libros_sinteticos(cantidad, semilla=0):
+    azar = random.Random(semilla)
+    for i in range(cantidad):
+        yield Libro(f"Libro {i}", f"Autor {i % 5000}", azar.choice(GENEROS), azar.randint(10, 1000),
+                    azar.randint(1900, 2024), azar.random() < 0.8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--libros", type=int, default=2_000_000)
+    parser.add_argument("--procesos", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--verificar", action="store_true",
+                        help="Carga el catálogo en Biblioteca y compara los reportes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "catalogo.bin")
+        guardar_catalogo(libros_sinteticos(args.libros), ruta)
+        esperado = None
+        if args.verificar:
+            biblioteca = Biblioteca()
+            with abrir_catalogo(ruta) as catalogo:
+                biblioteca.agregar_libros(catalogo)
+            inicio = time.perf_counter()
+            esperado = biblioteca.generar_reporte()
+            print(f"Biblioteca.generar_reporte: {time.perf_counter() - inicio:.3f} s (totales acumulados)")
+
+        print(f"{'Procesos':>9}{'Segundos':>11}{'Aceleración':>13}")
+        base = None
+        for procesos in args.procesos:
+            inicio = time.perf_counter()
+            reporte = generar_reporte_paralelo(ruta, procesos)
+            segundos = time.perf_counter() - inicio
+            base = base or segundos
+            print(f"{procesos:>9}{segundos:>11.3f}{base / segundos:>12.2f}x")
+            if esperado is not None and reporte != esperado:
+                raise SystemExit(f"El reporte con {procesos} procesos no coincide: {reporte} != {esperado}")
+        print(reporte)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+import bisect
+import itertools
+from array import array
+from collections import Counter
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se recorre el array en Python
+    np = None
+
+from libroRefactorizado import ANIO_ANTIGUO, CAMPOS_INFO, Libro, validar_campos
+from popularidad import REGLAS
+
+
+class TablaCadenas:
+    """Interna cadenas repetidas y las identifica con un código entero."""
+    def __init__(self):
+        self._cadenas = []
+        self._codigos = {}
+        self._por_normalizada = {}
+
+    def codigo(self, texto):
+        codigo = self._codigos.get(texto)
+        if codigo is None:
+            codigo = len(self._cadenas)
+            self._cadenas.append(texto)
+            self._codigos[texto] = codigo
+            self._por_normalizada.setdefault(texto.casefold(), []).append(codigo)
+        return codigo
+
+    def codigos_normalizados(self, texto):
+        """Códigos de todas las variantes de mayúsculas de ``texto``."""
+        return self._por_normalizada.get(texto.casefold(), [])
+
+    def __getitem__(self, codigo):
+        return self._cadenas[codigo]
+
+    def __len__(self):
+        return len(self._cadenas)
+
+
+class LibroVista:
+    """Vista de solo lectura (salvo disponibilidad) sobre una fila de BibliotecaColumnar.
+
+    Ofrece la misma interfaz pública que ``Libro``. La vista guarda el id
+    estable del libro además de la fila: si la biblioteca se compactó desde
+    que se creó (cambió su generación), la fila se vuelve a ubicar por id.
+    Si el libro fue eliminado, acceder a la vista lanza ``LookupError``.
+    """
+    __slots__ = ("_biblioteca", "_id", "_fila", "_generacion")
+
+    def __init__(self, biblioteca, fila):
+        self._biblioteca = biblioteca
+        self._id = biblioteca._ids[fila]
+        self._fila = fila
+        self._generacion = biblioteca._generacion
+
+    def _ubicar(self):
+        biblioteca = self._biblioteca
+        if self._generacion != biblioteca._generacion:
+            self._fila = biblioteca._fila_de_id(self._id)
+            self._generacion = biblioteca._generacion
+        return self._fila
+
+    @property
+    def titulo(self):
+        return self._biblioteca._cadenas[self._biblioteca._titulos[self._ubicar()]]
+
+    @property
+    def autor(self):
+        return self._biblioteca._cadenas[self._biblioteca._autores[self._ubicar()]]
+
+    @property
+    def genero(self):
+        return self._biblioteca._generos[self._biblioteca._codigos_genero[self._ubicar()]]
+
+    @property
+    def paginas(self):
+        return self._biblioteca._paginas[self._ubicar()]
+
+    @property
+    def anio_publicacion(self):
+        return self._biblioteca._anios[self._ubicar()]
+
+    @property
+    def disponible(self):
+        return bool(self._biblioteca._disponibles[self._ubicar()])
+
+    @disponible.setter
+    def disponible(self, valor):
+        self._biblioteca._disponibles[self._ubicar()] = 1 if valor else 0
+
+    def calcular_popularidad(self):
+        return REGLAS.calcular(self.genero, self.paginas)
+
+    def es_antiguo(self, umbral=ANIO_ANTIGUO):
+        return self.anio_publicacion < umbral
+
+    def obtener_info(self, campos=None):
+        if campos is not None:
+            return {campo: CAMPOS_INFO[campo](self) for campo in campos}
+        return {
+            "Título": self.titulo,
+            "Autor": self.autor,
+            "Género": self.genero,
+            "Páginas": self.paginas,
+            "Año": self.anio_publicacion,
+            "Disponible": "Sí" if self.disponible else "No",
+            "Popularidad": self.calcular_popularidad(),
+            "Es antiguo": "Sí" if self.es_antiguo() else "No"
+        }
+
+    def imprimir_info(self):
+        for clave, valor in self.obtener_info().items():
+            print(f"{clave}: {valor}")
+
+
+class BibliotecaColumnar:
+    """Biblioteca que guarda cada atributo de los libros en un array tipado.
+
+    Títulos, autores y géneros se guardan como códigos de tablas de cadenas
+    internadas; páginas, año y disponibilidad en arrays paralelos. Los
+    reportes se calculan sobre las columnas completas (con NumPy si está
+    instalado) y las consultas devuelven ``LibroVista`` compatibles con ``Libro``.
+
+    Las bajas solo marcan la fila como muerta en ``_vivos``; las columnas se
+    compactan cuando la fracción de filas muertas supera ``umbral_compactacion``
+    o al llamar a ``compactar``.
+    """
+    UMBRAL_COMPACTACION = 0.25
+
+    def __init__(self, umbral_compactacion=UMBRAL_COMPACTACION):
+        self._cadenas = TablaCadenas()
+        self._generos = TablaCadenas()
+        self._titulos = array("q")
+        self._autores = array("q")
+        self._codigos_genero = array("q")
+        self._paginas = array("q")
+        self._anios = array("q")
+        self._disponibles = array("B")
+        self._vivos = array("B")
+        # Id estable de cada fila: crece con cada alta y compactar() no lo
+        # cambia, así que la columna queda ordenada y se busca con bisect.
+        # La generación cuenta las compactaciones (ver LibroVista)
+        self._ids = array("q")
+        self._siguiente_id = 0
+        self._generacion = 0
+        self._muertos = 0
+        self._umbral_compactacion = umbral_compactacion
+        # título normalizado -> filas vivas
+        self._por_titulo = {}
+        # género normalizado -> libros vivos, en el orden en que aparecieron
+        # (un género que se vacía sale y, si vuelve, pasa al final, como en
+        # Biblioteca.reporte_por_genero)
+        self._conteo_generos = {}
+
+    def __len__(self):
+        return len(self._titulos) - self._muertos
+
+    def _filas_vivas(self, inicio=0, fin=None):
+        """Filas vivas desde la ``inicio``-ésima hasta antes de la ``fin``-ésima."""
+        if not self._muertos:
+            return range(inicio, len(self._titulos) if fin is None else min(fin, len(self._titulos)))
+        vivas = (fila for fila, viva in enumerate(self._vivos) if viva)
+        return itertools.islice(vivas, inicio, fin)
+
+    def __iter__(self):
+        return (LibroVista(self, fila) for fila in self._filas_vivas())
+
+    def agregar_libro(self, libro):
+        self.agregar_libros((libro,))
+
+    def agregar_libros(self, libros):
+        """Agrega un lote de libros extendiendo cada columna una sola vez."""
+        libros = list(libros)
+        if not all(isinstance(libro, (Libro, LibroVista)) for libro in libros):
+            raise ValueError("Solo se pueden agregar instancias de Libro.")
+        primera = len(self._titulos)
+        self._titulos.extend(self._cadenas.codigo(libro.titulo) for libro in libros)
+        self._autores.extend(self._cadenas.codigo(libro.autor) for libro in libros)
+        self._codigos_genero.extend(self._generos.codigo(libro.genero) for libro in libros)
+        self._paginas.extend(libro.paginas for libro in libros)
+        self._anios.extend(libro.anio_publicacion for libro in libros)
+        self._disponibles.extend(1 if libro.disponible else 0 for libro in libros)
+        self._vivos.extend(bytes([1]) * len(libros))
+        self._ids.extend(range(self._siguiente_id, self._siguiente_id + len(libros)))
+        self._siguiente_id += len(libros)
+        for fila, libro in enumerate(libros, primera):
+            self._por_titulo.setdefault(libro.titulo.casefold(), []).append(fila)
+            genero = libro.genero.casefold()
+            self._conteo_generos[genero] = self._conteo_generos.get(genero, 0) + 1
+
+    def buscar_libro(self, titulo):
+        return [LibroVista(self, fila) for fila in self._por_titulo.get(titulo.casefold(), [])]
+
+    def _filas_con_codigo(self, columna, codigos):
+        if not codigos:
+            return []
+        if np is not None:
+            coincide = np.isin(np.frombuffer(columna, dtype=np.int64), codigos)
+            if self._muertos:
+                coincide &= np.frombuffer(self._vivos, dtype=np.uint8).astype(bool)
+            return np.flatnonzero(coincide).tolist()
+        buscados = set(codigos)
+        return [fila for fila, (codigo, viva) in enumerate(zip(columna, self._vivos))
+                if viva and codigo in buscados]
+
+    def buscar_por_autor(self, autor):
+        filas = self._filas_con_codigo(self._autores, self._cadenas.codigos_normalizados(autor))
+        return [LibroVista(self, fila) for fila in filas]
+
+    def buscar_por_genero(self, genero):
+        filas = self._filas_con_codigo(self._codigos_genero, self._generos.codigos_normalizados(genero))
+        return [LibroVista(self, fila) for fila in filas]
+
+    def eliminar_libro(self, titulo):
+        self.eliminar_libros((titulo,))
+
+    def eliminar_libros(self, titulos):
+        """Marca como muertas las filas de cada uno de los ``titulos``; devuelve cuántas."""
+        eliminadas = 0
+        for titulo in titulos:
+            for fila in self._por_titulo.pop(titulo.casefold(), []):
+                self._vivos[fila] = 0
+                genero = self._generos[self._codigos_genero[fila]].casefold()
+                self._conteo_generos[genero] -= 1
+                if not self._conteo_generos[genero]:
+                    del self._conteo_generos[genero]
+                eliminadas += 1
+        self._muertos += eliminadas
+        if self._muertos > self._umbral_compactacion * len(self._titulos):
+            self.compactar()
+        return eliminadas
+
+    def compactar(self):
+        """Quita las filas muertas de todas las columnas y renumera el índice de títulos."""
+        if not self._muertos:
+            return
+        columnas = (self._titulos, self._autores, self._codigos_genero,
+                    self._paginas, self._anios, self._disponibles, self._ids)
+        for columna in columnas:
+            columna[:] = array(columna.typecode, itertools.compress(columna, self._vivos))
+        self._vivos = array("B", bytes([1]) * len(self._titulos))
+        self._muertos = 0
+        # Las filas se desplazaron: las vistas existentes se reubican por id
+        self._generacion += 1
+        self._por_titulo = {}
+        for fila, codigo in enumerate(self._titulos):
+            self._por_titulo.setdefault(self._cadenas[codigo].casefold(), []).append(fila)
+
+    def _fila_de_id(self, id_libro):
+        fila = bisect.bisect_left(self._ids, id_libro)
+        if fila == len(self._ids) or self._ids[fila] != id_libro:
+            raise LookupError("El libro de esta vista fue eliminado de la biblioteca")
+        return fila
+
+    def estadisticas(self):
+        """Cantidad de filas vivas y de filas muertas pendientes de compactar."""
+        return {"vivos": len(self), "muertos": self._muertos}
+
+    def listar_libros(self):
+        return [LibroVista(self, fila).obtener_info() for fila in self._filas_vivas()]
+
+    def iterar_libros(self, offset=0, limite=None, campos=None):
+        """Genera la información de los libros desde el ``offset``-ésimo sin armar una lista.
+
+        ``campos`` limita cada registro a esas claves de ``obtener_info``.
+        """
+        validar_campos(campos)
+        filas = self._filas_vivas(offset, None if limite is None else offset + limite)
+        return (LibroVista(self, fila).obtener_info(campos) for fila in filas)
+
+    def _agregados(self, filtro_genero=None):
+        """Total, disponibles, antiguos y popularidad total de las filas vivas.
+
+        Las filas se cuentan por (género, páginas) y la popularidad se suma de
+        forma exacta con ``Fraction`` una vez por par, como ``reporteParalelo``:
+        el promedio coincide con el de los demás backends hasta el último dígito.
+        """
+        if np is not None:
+            codigos = np.frombuffer(self._codigos_genero, dtype=np.int64)
+            paginas = np.frombuffer(self._paginas, dtype=np.int64)
+            disponibles = np.frombuffer(self._disponibles, dtype=np.uint8).astype(bool)
+            antiguos = np.frombuffer(self._anios, dtype=np.int64) < ANIO_ANTIGUO
+            mascara = np.frombuffer(self._vivos, dtype=np.uint8).astype(bool)
+            if filtro_genero is not None:
+                mascara &= np.isin(codigos, filtro_genero)
+            total = int(mascara.sum())
+            if not total:
+                return 0, 0, 0, Fraction(0)
+            pares, veces = np.unique(np.stack((codigos[mascara], paginas[mascara]), axis=1),
+                                     axis=0, return_counts=True)
+            por_par = zip(map(tuple, pares.tolist()), veces.tolist())
+            return (total, int(disponibles[mascara].sum()), int(antiguos[mascara].sum()),
+                    self._popularidad_exacta(por_par))
+        filas = self._filas_vivas()
+        if filtro_genero is not None:
+            buscados = set(filtro_genero)
+            filas = [fila for fila in filas if self._codigos_genero[fila] in buscados]
+        elif self._muertos:
+            filas = list(filas)
+        por_par = Counter((self._codigos_genero[fila], self._paginas[fila]) for fila in filas)
+        return (len(filas),
+                sum(self._disponibles[fila] for fila in filas),
+                sum(1 for fila in filas if self._anios[fila] < ANIO_ANTIGUO),
+                self._popularidad_exacta(por_par.items()))
+
+    def _popularidad_exacta(self, por_par):
+        """Suma exacta de popularidades a partir de ((código de género, páginas), veces)."""
+        return sum((Fraction(REGLAS.calcular(self._generos[codigo], paginas)) * veces
+                    for (codigo, paginas), veces in por_par), Fraction(0))
+
+    @staticmethod
+    def _formatear_reporte(total, disponibles, antiguos, popularidad_total):
+        return {
+            "Total libros": total,
+            "Disponibles": disponibles,
+            "Antiguos": antiguos,
+            "Promedio de popularidad": float(popularidad_total / total) if total > 0 else 0
+        }
+
+    def generar_reporte(self):
+        return self._formatear_reporte(*self._agregados())
+
+    def reporte_por_genero(self):
+        return {genero: self._formatear_reporte(*self._agregados(self._generos.codigos_normalizados(genero)))
+                for genero in self._conteo_generos}
@@ -0,0 +1,185 @@
+import threading
+from contextlib import contextmanager
+
+from bibliotecaRefactorizada import Biblioteca
+
+
+class LockLecturaEscritura:
+    """Lock de lectores/escritor: muchos lectores a la vez o un único escritor.
+
+    Un escritor en espera bloquea la entrada de lectores nuevos, de modo que
+    un flujo continuo de lecturas no puede postergar las escrituras.
+    """
+    def __init__(self):
+        self._condicion = threading.Condition()
+        self._lectores = 0
+        self._escribiendo = False
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def lectura(self):
+        with self._condicion:
+            while self._escribiendo or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._lectores -= 1
+                if not self._lectores:
+                    self._condicion.notify_all()
+
+    @contextmanager
+    def escritura(self):
+        with self._condicion:
+            self._escritores_esperando += 1
+            while self._escribiendo or self._lectores:
+                self._condicion.wait()
+            self._escritores_esperando -= 1
+            self._escribiendo = True
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._escribiendo = False
+                self._condicion.notify_all()
+
+
+class BibliotecaConcurrente:
+    """Biblioteca segura para usar desde muchos hilos a la vez.
+
+    Envuelve una ``Biblioteca``: las consultas toman el lock en modo lectura
+    y no se bloquean entre sí; altas, bajas y préstamos lo toman en modo
+    escritura. Los cambios de disponibilidad deben hacerse con ``prestar`` y
+    ``devolver``, no asignando ``Libro.disponible`` desde otro hilo.
+    """
+    def __init__(self, biblioteca=None):
+        self._biblioteca = Biblioteca() if biblioteca is None else biblioteca
+        # Las consultas no modifican la biblioteca: lo que recalculan de forma
+        # perezosa se pone al día en _lectura_preparada, con el lock de escritura
+        self._biblioteca.preparar_en_consultas = False
+        self._lock = LockLecturaEscritura()
+
+    def __len__(self):
+        with self._lock.lectura():
+            return len(self._biblioteca)
+
+    @contextmanager
+    def _lectura_preparada(self):
+        """Modo lectura con la biblioteca lista para responder sin modificarse.
+
+        Si cambiaron las reglas de popularidad o hay lápidas sin ordenar,
+        Biblioteca las pone al día en la próxima consulta; eso es una
+        escritura y no puede ocurrir con el lock en modo lectura. Se hace con
+        el lock de escritura (que vuelve a revisar, otro hilo pudo adelantarse)
+        y se vuelve a comprobar ya con el de lectura, porque entre ambos otro
+        escritor pudo cambiar algo. Si las reglas cambian ya con el lock de
+        lectura tomado, la consulta responde con las anteriores (como si
+        hubiera ocurrido antes del cambio) en lugar de recalcular.
+        """
+        while True:
+            with self._lock.lectura():
+                if self._biblioteca.consultas_preparadas:
+                    yield
+                    return
+            with self._lock.escritura():
+                self._biblioteca.preparar_consultas()
+
+    def agregar_libro(self, libro):
+        with self._lock.escritura():
+            self._biblioteca.agregar_libro(libro)
+
+    def agregar_libros(self, libros):
+        libros = list(libros)
+        with self._lock.escritura():
+            self._biblioteca.agregar_libros(libros)
+
+    def eliminar_libro(self, titulo):
+        with self._lock.escritura():
+            self._biblioteca.eliminar_libro(titulo)
+
+    def eliminar_libros(self, titulos):
+        titulos = list(titulos)
+        with self._lock.escritura():
+            return self._biblioteca.eliminar_libros(titulos)
+
+    def compactar(self):
+        with self._lock.escritura():
+            self._biblioteca.compactar()
+
+    def estadisticas(self):
+        with self._lock.lectura():
+            return self._biblioteca.estadisticas()
+
+    def prestar(self, titulo):
+        """Marca como no disponible un ejemplar disponible de ``titulo`` y lo devuelve (o None)."""
+        with self._lock.escritura():
+            for libro in self._biblioteca.buscar_libro(titulo):
+                if libro.disponible:
+                    libro.disponible = False
+                    return libro
+            return None
+
+    def devolver(self, titulo):
+        """Marca como disponible un ejemplar prestado de ``titulo``; indica si había alguno."""
+        with self._lock.escritura():
+            for libro in self._biblioteca.buscar_libro(titulo):
+                if not libro.disponible:
+                    libro.disponible = True
+                    return True
+            return False
+
+    def buscar_libro(self, titulo):
+        with self._lock.lectura():
+            return self._biblioteca.buscar_libro(titulo)
+
+    def buscar_por_autor(self, autor):
+        with self._lock.lectura():
+            return self._biblioteca.buscar_por_autor(autor)
+
+    def buscar_por_genero(self, genero):
+        with self._lock.lectura():
+            return self._biblioteca.buscar_por_genero(genero)
+
+    def autocompletar(self, prefijo, k=10):
+        with self._lock.lectura():
+            return self._biblioteca.autocompletar(prefijo, k)
+
+    def buscar_aproximado(self, titulo, k=10):
+        with self._lock.lectura():
+            return self._biblioteca.buscar_aproximado(titulo, k)
+
+    def mas_populares(self, k, genero=None):
+        with self._lectura_preparada():
+            return self._biblioteca.mas_populares(k, genero)
+
+    def por_rango_anios(self, desde, hasta):
+        with self._lock.lectura():
+            return self._biblioteca.por_rango_anios(desde, hasta)
+
+    def contar_antiguos(self, umbral=None):
+        with self._lectura_preparada():
+            return self._biblioteca.contar_antiguos(umbral)
+
+    def listar_libros(self):
+        with self._lock.lectura():
+            return self._biblioteca.listar_libros()
+
+    def iterar_libros(self, offset=0, limite=None, campos=None):
+        # El generador de Biblioteca recorre su dict de forma perezosa; aquí la
+        # página se arma bajo el lock para no iterar mientras otro hilo escribe.
+        with self._lock.lectura():
+            return iter(list(self._biblioteca.iterar_libros(offset, limite, campos)))
+
+    def generar_reporte(self):
+        with self._lectura_preparada():
+            return self._biblioteca.generar_reporte()
+
+    def reporte_por_genero(self):
+        with self._lectura_preparada():
+            return self._biblioteca.reporte_por_genero()
+
+    def verificar_agregados(self):
+        with self._lectura_preparada():
+            return self._biblioteca.verificar_agregados()
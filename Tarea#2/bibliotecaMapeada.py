@@ -0,0 +1,196 @@
+"""Biblioteca que atiende las consultas directamente desde un catálogo mapeado.
+
+Abrirla solo mapea el archivo de ``persistencia``: no se decodifica ni se
+indexa ningún libro, así que el arranque no depende del tamaño del catálogo.
+Cada operación decodifica solo lo que necesita:
+
+- ``iterar_libros`` salta el ``offset`` por índice y decodifica la página pedida.
+- ``buscar_libro`` y ``eliminar_libro`` usan un índice de títulos que se arma
+  la primera vez que hacen falta, decodificando solo los títulos (una vez por
+  título distinto, porque el heap no repite textos).
+- Los reportes cuentan los registros crudos con ``reporteParalelo`` (sin
+  decodificar títulos ni autores) una sola vez; después se ajustan con las
+  altas, bajas y cambios de disponibilidad de la sesión.
+
+Los cambios no tocan el archivo: las altas van a una ``Biblioteca`` en memoria
+y las bajas del catálogo se marcan por índice hasta que se guarda con
+``guardar``. El archivo no debe modificarse mientras está abierto; ``guardar``
+sobre el propio archivo cierra el mapeo antes de reemplazarlo.
+"""
+import itertools
+import os
+
+from bibliotecaRefactorizada import Biblioteca
+from libroRefactorizado import ANIO_ANTIGUO, validar_campos
+from persistencia import abrir_catalogo, guardar_catalogo
+from reporteParalelo import _combinar, _parcial_vacio, _reportes, agregar_catalogo
+
+
+class BibliotecaMapeada:
+    """Biblioteca con la interfaz básica de ``Biblioteca`` sobre un ``CatalogoMapeado``."""
+    def __init__(self, ruta, umbral_antiguo=ANIO_ANTIGUO, procesos=1):
+        self._catalogo = abrir_catalogo(ruta)
+        self._umbral_antiguo = umbral_antiguo
+        self._procesos = procesos
+        # Libros del catálogo ya decodificados: se conservan para que los
+        # cambios de disponibilidad hechos sobre ellos no se pierdan
+        self._decodificados = {}
+        self._borrados = set()
+        self._por_titulo = None
+        # Altas de la sesión
+        self._nuevos = Biblioteca(umbral_antiguo)
+        # Totales por género del archivo (sin popularidad, que depende de las
+        # reglas) y ajustes de la sesión en el mismo formato
+        self._parciales = None
+        self._ajustes = {}
+        self._observador = self._al_cambiar_disponibilidad
+        self.modificada = False
+
+    def cerrar(self):
+        self._catalogo.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __len__(self):
+        return len(self._catalogo) - len(self._borrados) + len(self._nuevos)
+
+    def __iter__(self):
+        return itertools.chain((self._libro(indice) for indice in self._indices_vivos()), self._nuevos)
+
+    def _indices_vivos(self):
+        return (indice for indice in range(len(self._catalogo)) if indice not in self._borrados)
+
+    def _libro(self, indice):
+        libro = self._decodificados.get(indice)
+        if libro is None:
+            libro = self._decodificados[indice] = self._catalogo[indice]
+            libro.suscribir(self._observador)
+        return libro
+
+    def _libro_sin_guardar(self, indice):
+        """Como ``_libro``, pero sin agregar el libro a ``_decodificados``."""
+        libro = self._decodificados.get(indice)
+        return self._catalogo[indice] if libro is None else libro
+
+    def _ajustar(self, genero, paginas, anio, disponible, signo):
+        """Suma (signo 1) o resta (signo -1) un libro a los ajustes de la sesión."""
+        ajuste = self._ajustes.get(genero)
+        if ajuste is None:
+            ajuste = self._ajustes[genero] = _parcial_vacio()
+        ajuste["total"] += signo
+        ajuste["disponibles"] += signo if disponible else 0
+        ajuste["antiguos"] += signo if anio < self._umbral_antiguo else 0
+        ajuste["paginas"][paginas] += signo
+
+    def _ajustar_libro(self, libro, signo):
+        self._ajustar(libro.genero, libro.paginas, libro.anio_publicacion, libro.disponible, signo)
+
+    def _al_cambiar_disponibilidad(self, libro, anterior):
+        ajuste = self._ajustes.setdefault(libro.genero, _parcial_vacio())
+        ajuste["disponibles"] += bool(libro.disponible) - bool(anterior)
+        self.modificada = True
+
+    def _indice_titulos(self):
+        """Título normalizado -> índices del catálogo; se arma en el primer uso."""
+        if self._por_titulo is None:
+            textos = {}
+            por_titulo = {}
+            for indice, (titulo, largo, *_) in enumerate(self._catalogo.registros()):
+                normalizado = textos.get(titulo)
+                if normalizado is None:
+                    normalizado = textos[titulo] = self._catalogo.texto(titulo, largo).casefold()
+                por_titulo.setdefault(normalizado, []).append(indice)
+            self._por_titulo = por_titulo
+        return self._por_titulo
+
+    def agregar_libro(self, libro):
+        self.agregar_libros((libro,))
+
+    def agregar_libros(self, libros):
+        """Agrega un lote de libros a la sesión; el archivo no cambia hasta guardarlo."""
+        libros = list(libros)
+        self._nuevos.agregar_libros(libros)
+        for libro in libros:
+            self._ajustar_libro(libro, 1)
+            libro.suscribir(self._observador)
+        self.modificada = self.modificada or bool(libros)
+
+    def buscar_libro(self, titulo):
+        indices = self._indice_titulos().get(titulo.casefold(), ())
+        return ([self._libro(indice) for indice in indices if indice not in self._borrados]
+                + self._nuevos.buscar_libro(titulo))
+
+    def eliminar_libro(self, titulo):
+        self.eliminar_libros((titulo,))
+
+    def eliminar_libros(self, titulos):
+        """Elimina los libros con cada uno de los ``titulos``; devuelve cuántos eliminó."""
+        por_titulo = self._indice_titulos()
+        eliminados = 0
+        for titulo in titulos:
+            for indice in por_titulo.pop(titulo.casefold(), ()):
+                if indice in self._borrados:
+                    continue
+                self._borrados.add(indice)
+                libro = self._decodificados.pop(indice, None)
+                if libro is not None:
+                    libro.desuscribir(self._observador)
+                    self._ajustar_libro(libro, -1)
+                else:
+                    _, _, _, _, genero, largo, paginas, anio, disponible = self._catalogo.registro(indice)
+                    self._ajustar(self._catalogo.texto(genero, largo), paginas, anio, disponible, -1)
+                eliminados += 1
+            for libro in self._nuevos.buscar_libro(titulo):
+                libro.desuscribir(self._observador)
+                self._ajustar_libro(libro, -1)
+                eliminados += 1
+            self._nuevos.eliminar_libro(titulo)
+        self.modificada = self.modificada or bool(eliminados)
+        return eliminados
+
+    def guardar(self, ruta):
+        """Escribe el catálogo con los cambios de la sesión en ``ruta``.
+
+        Los libros que la sesión no decodificó se decodifican de a uno y no se
+        guardan en ``_decodificados``, así que guardar no carga el catálogo en
+        memoria. Si ``ruta`` es el archivo mapeado, la biblioteca queda cerrada.
+        """
+        propio = os.path.exists(ruta) and os.path.samefile(ruta, self._catalogo.ruta)
+        libros = itertools.chain((self._libro_sin_guardar(indice) for indice in self._indices_vivos()),
+                                 self._nuevos)
+        guardar_catalogo(libros, ruta, antes_de_reemplazar=self.cerrar if propio else None)
+        self.modificada = False
+
+    def listar_libros(self):
+        return [libro.obtener_info() for libro in self]
+
+    def iterar_libros(self, offset=0, limite=None, campos=None):
+        """Genera la información de los libros desde ``offset`` decodificando solo los que devuelve.
+
+        ``campos`` limita cada registro a esas claves de ``obtener_info``.
+        """
+        validar_campos(campos)
+        fin = None if limite is None else offset + limite
+        # El offset se salta con índices: los libros salteados no se decodifican
+        referencias = itertools.chain(self._indices_vivos(), iter(self._nuevos))
+        return (self._libro(referencia).obtener_info(campos) if isinstance(referencia, int)
+                else referencia.obtener_info(campos)
+                for referencia in itertools.islice(referencias, offset, fin))
+
+    def _agregados(self):
+        if self._parciales is None:
+            self._parciales = agregar_catalogo(self._catalogo.ruta, self._procesos, self._umbral_antiguo)
+        return _reportes(_combinar(([*self._parciales.items()], [*self._ajustes.items()])))
+
+    def generar_reporte(self):
+        total, _ = self._agregados()
+        return Biblioteca._formatear_reporte(total)
+
+    def reporte_por_genero(self):
+        _, por_genero = self._agregados()
+        return {genero: Biblioteca._formatear_reporte(agregados)
+                for genero, agregados in por_genero.items() if agregados["total"]}
@@ -1,34 +1,332 @@
-from libroRefactorizado import Libro
+import bisect
+import heapq
+import itertools
+from fractions import Fraction
+
+from busqueda import IndicePrefijos, IndiceTrigramas
+from libroRefactorizado import ANIO_ANTIGUO, Libro, validar_campos
+from popularidad import REGLAS, calcular_popularidades
 
 class Biblioteca:
     """Gestiona una colección de libros."""
-    def __init__(self):
-        self._libros = []
+    # Fracción de entradas muertas en los índices ordenados que dispara la compactación
+    UMBRAL_COMPACTACION = 0.25
+
+    def __init__(self, umbral_antiguo=ANIO_ANTIGUO, umbral_compactacion=UMBRAL_COMPACTACION):
+        self._umbral_antiguo = umbral_antiguo
+        self._umbral_compactacion = umbral_compactacion
+        # clave interna -> libro; el dict conserva el orden de inserción
+        self._libros = {}
+        self._siguiente_clave = 0
+        # Índices secundarios: texto en minúsculas -> {clave: libro}
+        self._por_titulo = {}
+        self._por_autor = {}
+        self._por_genero = {}
+        # Búsqueda por prefijo y tolerante a errores sobre los títulos normalizados
+        self._prefijos = IndicePrefijos()
+        self._trigramas = IndiceTrigramas()
+        # Índices ordenados: (año, clave) y, por género, (-popularidad, clave).
+        # La clave desempata sin comparar libros y fija un orden estable.
+        self._por_anio = []
+        self._popularidad_genero = {}
+        # Las bajas no se quitan de los índices ordenados (sería O(n) por baja):
+        # sus claves quedan como lápidas que las consultas saltean hasta compactar.
+        # Los años de las lápidas permiten descontarlas en contar_antiguos.
+        self._muertos = set()
+        self._anios_muertos = []
+        self._anios_muertos_ordenados = True
+        # Totales acumulados: se actualizan al agregar, eliminar o cambiar
+        # la disponibilidad, de modo que generar_reporte no recorre el catálogo.
+        # La popularidad se suma como Fraction para que el total sea exacto
+        # sin importar el orden de altas y bajas.
+        self._agregados = self._agregados_vacios()
+        self._agregados_genero = {}
+        # Un único método ligado para todos los libros: cada acceso a
+        # self._al_cambiar_disponibilidad crearía un objeto nuevo por libro
+        self._observador = self._al_cambiar_disponibilidad
+        # Versión de las reglas de popularidad con la que se calcularon totales y rankings
+        self._version_reglas = REGLAS.version
+        # Si las consultas ponen al día popularidad y lápidas antes de responder.
+        # BibliotecaConcurrente lo desactiva y lo hace ella con el lock de escritura
+        self.preparar_en_consultas = True
+
+    def __len__(self):
+        return len(self._libros)
+
+    def __iter__(self):
+        return iter(self._libros.values())
+
+    @staticmethod
+    def _normalizar(texto):
+        return texto.casefold()
+
+    @staticmethod
+    def _indexar(indice, valor, clave, libro):
+        indice.setdefault(valor, {})[clave] = libro
+
+    @staticmethod
+    def _desindexar(indice, valor, clave):
+        grupo = indice.get(valor)
+        if grupo is not None:
+            grupo.pop(clave, None)
+            if not grupo:
+                del indice[valor]
+
+    @staticmethod
+    def _agregados_vacios():
+        return {"total": 0, "disponibles": 0, "antiguos": 0, "popularidad": Fraction(0)}
+
+    @staticmethod
+    def _suma_exacta(valores):
+        """Suma exacta de popularidades: cada float es un entero sobre una potencia de dos."""
+        razones = [valor.as_integer_ratio() for valor in valores]
+        denominador = max((d for _, d in razones), default=1)
+        return Fraction(sum(n * (denominador // d) for n, d in razones), denominador)
+
+    def _acumular(self, libros, signo):
+        """Aplica a los totales las altas (signo 1) o bajas (signo -1) de ``libros``."""
+        por_genero = {}
+        for libro in libros:
+            por_genero.setdefault(self._normalizar(libro.genero), []).append(libro)
+        for nombre, grupo in por_genero.items():
+            genero = self._agregados_genero.setdefault(nombre, self._agregados_vacios())
+            disponibles = sum(1 for l in grupo if l.disponible)
+            antiguos = sum(1 for l in grupo if l.es_antiguo(self._umbral_antiguo))
+            popularidad = self._suma_exacta(l.calcular_popularidad() for l in grupo)
+            for agregados in (self._agregados, genero):
+                agregados["total"] += signo * len(grupo)
+                agregados["disponibles"] += signo * disponibles
+                agregados["antiguos"] += signo * antiguos
+                agregados["popularidad"] += signo * popularidad
+            if not genero["total"]:
+                del self._agregados_genero[nombre]
+
+    @property
+    def popularidad_actualizada(self):
+        return self._version_reglas == REGLAS.version
+
+    @property
+    def consultas_preparadas(self):
+        """Si las consultas pueden responder sin modificar el estado interno."""
+        return self.popularidad_actualizada and self._anios_muertos_ordenados
+
+    def preparar_consultas(self):
+        """Pone al día lo que las consultas recalculan de forma perezosa.
+
+        Recalcula la popularidad si cambiaron las reglas y ordena los años de
+        las lápidas. Después, mientras no haya escrituras, ninguna consulta
+        modifica la biblioteca.
+        """
+        self.actualizar_popularidad()
+        if not self._anios_muertos_ordenados:
+            # Timsort ordena en O(n) la lista casi ordenada de años de las lápidas
+            self._anios_muertos.sort()
+            self._anios_muertos_ordenados = True
+
+    def _antes_de_consultar(self):
+        if self.preparar_en_consultas:
+            self.preparar_consultas()
+
+    def actualizar_popularidad(self):
+        """Recalcula totales y rankings de popularidad si cambiaron las reglas."""
+        if self.popularidad_actualizada:
+            return
+        claves = list(self._libros)
+        popularidades = calcular_popularidades(self._libros.values())
+        por_genero = {}
+        for clave, popularidad in zip(claves, popularidades):
+            por_genero.setdefault(self._normalizar(self._libros[clave].genero), []).append((-popularidad, clave))
+        self._agregados["popularidad"] = self._suma_exacta(popularidades)
+        for genero, ranking in por_genero.items():
+            ranking.sort()
+            self._agregados_genero[genero]["popularidad"] = self._suma_exacta(-negativa for negativa, _ in ranking)
+        self._popularidad_genero = por_genero
+        self._version_reglas = REGLAS.version
+
+    def _al_cambiar_disponibilidad(self, libro, anterior):
+        delta = bool(libro.disponible) - bool(anterior)
+        self._agregados["disponibles"] += delta
+        self._agregados_genero[self._normalizar(libro.genero)]["disponibles"] += delta
+
+    @staticmethod
+    def _formatear_reporte(agregados):
+        total = agregados["total"]
+        return {
+            "Total libros": total,
+            "Disponibles": agregados["disponibles"],
+            "Antiguos": agregados["antiguos"],
+            "Promedio de popularidad": float(agregados["popularidad"] / total) if total > 0 else 0
+        }
 
     def agregar_libro(self, libro):
-        if isinstance(libro, Libro):
-            self._libros.append(libro)
-        else:
+        self.agregar_libros((libro,))
+
+    def agregar_libros(self, libros):
+        """Agrega un lote de libros actualizando los totales una sola vez por lote."""
+        libros = list(libros)
+        if not all(isinstance(libro, Libro) for libro in libros):
             raise ValueError("Solo se pueden agregar instancias de Libro.")
+        self.actualizar_popularidad()
+        # Las entradas de los índices ordenados se juntan y se insertan al final
+        nuevos_anio = []
+        nuevos_genero = {}
+        for libro in libros:
+            clave = self._siguiente_clave
+            self._siguiente_clave += 1
+            self._libros[clave] = libro
+            self._indexar(self._por_titulo, self._normalizar(libro.titulo), clave, libro)
+            self._indexar(self._por_autor, self._normalizar(libro.autor), clave, libro)
+            self._indexar(self._por_genero, self._normalizar(libro.genero), clave, libro)
+            self._prefijos.agregar(self._normalizar(libro.titulo))
+            self._trigramas.agregar(self._normalizar(libro.titulo))
+            nuevos_anio.append((libro.anio_publicacion, clave))
+            nuevos_genero.setdefault(self._normalizar(libro.genero), []).append(
+                (-libro.calcular_popularidad(), clave))
+            libro.suscribir(self._observador)
+        self._insertar_ordenados(self._por_anio, nuevos_anio)
+        for genero, entradas in nuevos_genero.items():
+            self._insertar_ordenados(self._popularidad_genero.setdefault(genero, []), entradas)
+        self._acumular(libros, 1)
+
+    @staticmethod
+    def _insertar_ordenados(indice, entradas):
+        """Inserta ``entradas`` en la lista ordenada ``indice``.
+
+        Un libro suelto usa insort. Un lote se ordena y se agrega al final:
+        Timsort detecta las dos corridas ordenadas y las mezcla en O(n + k log k),
+        en lugar de los O(n) por libro de un insort por entrada.
+        """
+        if len(entradas) == 1:
+            bisect.insort(indice, entradas[0])
+        elif entradas:
+            entradas.sort()
+            indice.extend(entradas)
+            indice.sort()
 
     def buscar_libro(self, titulo):
-        return [libro for libro in self._libros if libro.titulo.lower() == titulo.lower()]
+        return list(self._por_titulo.get(self._normalizar(titulo), {}).values())
+
+    def buscar_por_autor(self, autor):
+        return list(self._por_autor.get(self._normalizar(autor), {}).values())
+
+    def buscar_por_genero(self, genero):
+        return list(self._por_genero.get(self._normalizar(genero), {}).values())
+
+    def _libros_por_titulos(self, resultados):
+        return [libro for titulo, _ in resultados for libro in self._por_titulo.get(titulo, {}).values()]
+
+    def autocompletar(self, prefijo, k=10):
+        """Libros de los ``k`` títulos más cortos que empiezan por ``prefijo``."""
+        return self._libros_por_titulos(self._prefijos.buscar(self._normalizar(prefijo), k))
+
+    def buscar_aproximado(self, titulo, k=10):
+        """Libros de los ``k`` títulos más parecidos a ``titulo`` (tolera errores de tipeo)."""
+        return self._libros_por_titulos(self._trigramas.buscar(self._normalizar(titulo), k))
+
+    def mas_populares(self, k, genero=None):
+        """Los ``k`` libros más populares, de todo el catálogo o de un género."""
+        self._antes_de_consultar()
+        if genero is not None:
+            ranking = self._popularidad_genero.get(self._normalizar(genero), [])
+        else:
+            ranking = heapq.merge(*self._popularidad_genero.values())
+        vivos = (self._libros[clave] for _, clave in ranking if clave not in self._muertos)
+        return list(itertools.islice(vivos, k))
+
+    def por_rango_anios(self, desde, hasta):
+        """Libros publicados entre ``desde`` y ``hasta`` (ambos incluidos), ordenados por año."""
+        inicio = bisect.bisect_left(self._por_anio, (desde,))
+        fin = bisect.bisect_left(self._por_anio, (hasta + 1,))
+        return [self._libros[clave] for _, clave in self._por_anio[inicio:fin] if clave not in self._muertos]
+
+    def contar_antiguos(self, umbral=None):
+        """Cantidad de libros publicados antes de ``umbral`` (por defecto, el de la biblioteca)."""
+        umbral = self._umbral_antiguo if umbral is None else umbral
+        self._antes_de_consultar()
+        return (bisect.bisect_left(self._por_anio, (umbral,))
+                - bisect.bisect_left(self._anios_muertos, umbral))
 
     def eliminar_libro(self, titulo):
-        self._libros = [libro for libro in self._libros if libro.titulo.lower() != titulo.lower()]
+        self.eliminar_libros((titulo,))
+
+    def eliminar_libros(self, titulos):
+        """Elimina todos los libros con cada uno de los ``titulos``; devuelve cuántos eliminó.
+
+        Los índices ordenados solo reciben una lápida por libro, así que cada
+        baja es O(1) más el largo del título; se compactan al superar el umbral.
+        """
+        self.actualizar_popularidad()
+        eliminados = []
+        for titulo in titulos:
+            grupo = self._por_titulo.pop(self._normalizar(titulo), {})
+            if not grupo:
+                continue
+            self._prefijos.eliminar(self._normalizar(titulo), len(grupo))
+            self._trigramas.eliminar(self._normalizar(titulo), len(grupo))
+            for clave, libro in grupo.items():
+                del self._libros[clave]
+                self._desindexar(self._por_autor, self._normalizar(libro.autor), clave)
+                self._desindexar(self._por_genero, self._normalizar(libro.genero), clave)
+                self._muertos.add(clave)
+                self._anios_muertos.append(libro.anio_publicacion)
+                self._anios_muertos_ordenados = False
+                libro.desuscribir(self._observador)
+                eliminados.append(libro)
+        self._acumular(eliminados, -1)
+        if len(self._muertos) > self._umbral_compactacion * len(self._por_anio):
+            self.compactar()
+        return len(eliminados)
+
+    def compactar(self):
+        """Quita las lápidas de los índices ordenados en una pasada O(n)."""
+        if not self._muertos:
+            return
+        self._por_anio = [entrada for entrada in self._por_anio if entrada[1] not in self._muertos]
+        rankings = {}
+        for genero, ranking in self._popularidad_genero.items():
+            vivos = [entrada for entrada in ranking if entrada[1] not in self._muertos]
+            if vivos:
+                rankings[genero] = vivos
+        self._popularidad_genero = rankings
+        self._muertos = set()
+        self._anios_muertos = []
+        self._anios_muertos_ordenados = True
+
+    def estadisticas(self):
+        """Cantidad de libros vivos y de lápidas pendientes de compactar."""
+        return {"vivos": len(self._libros), "muertos": len(self._muertos)}
 
     def listar_libros(self):
-        return [libro.obtener_info() for libro in self._libros]
+        return [libro.obtener_info() for libro in self._libros.values()]
+
+    def iterar_libros(self, offset=0, limite=None, campos=None):
+        """Genera la información de los libros desde ``offset`` sin armar una lista.
+
+        ``campos`` limita cada registro a esas claves de ``obtener_info``.
+        """
+        validar_campos(campos)
+        fin = None if limite is None else offset + limite
+        return (libro.obtener_info(campos) for libro in itertools.islice(self._libros.values(), offset, fin))
 
     def generar_reporte(self):
-        total = len(self._libros)
-        antiguos = sum(1 for l in self._libros if l.es_antiguo())
-        disponibles = sum(1 for l in self._libros if l.disponible)
-        popularidad_total = sum(l.calcular_popularidad() for l in self._libros)
-        promedio_popularidad = popularidad_total / total if total > 0 else 0
-        return {
-            "Total libros": total,
-            "Disponibles": disponibles,
-            "Antiguos": antiguos,
-            "Promedio de popularidad": promedio_popularidad
-        }
+        self._antes_de_consultar()
+        return self._formatear_reporte(self._agregados)
+
+    def reporte_por_genero(self):
+        self._antes_de_consultar()
+        return {genero: self._formatear_reporte(agregados)
+                for genero, agregados in self._agregados_genero.items()}
+
+    def verificar_agregados(self):
+        """Recalcula los totales recorriendo el catálogo y los compara con los acumulados."""
+        self._antes_de_consultar()
+        esperados = self._agregados_vacios()
+        esperados_genero = {}
+        for libro in self._libros.values():
+            genero = esperados_genero.setdefault(self._normalizar(libro.genero), self._agregados_vacios())
+            for agregados in (esperados, genero):
+                agregados["total"] += 1
+                agregados["disponibles"] += 1 if libro.disponible else 0
+                agregados["antiguos"] += 1 if libro.es_antiguo(self._umbral_antiguo) else 0
+                agregados["popularidad"] += self._suma_exacta((libro.calcular_popularidad(),))
+        return esperados == self._agregados and esperados_genero == self._agregados_genero
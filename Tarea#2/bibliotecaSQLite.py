@@ -0,0 +1,183 @@
+import sqlite3
+from fractions import Fraction
+
+from libroRefactorizado import ANIO_ANTIGUO, Libro, validar_campos
+from popularidad import REGLAS
+
+# Los textos normalizados (casefold) se guardan en columnas propias: lower() de
+# SQLite solo entiende ASCII y así los índices coinciden con Biblioteca.
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS libros (
+    id INTEGER PRIMARY KEY,
+    titulo TEXT NOT NULL,
+    autor TEXT NOT NULL,
+    genero TEXT NOT NULL,
+    paginas INTEGER NOT NULL,
+    anio INTEGER NOT NULL,
+    disponible INTEGER NOT NULL,
+    titulo_norm TEXT NOT NULL,
+    autor_norm TEXT NOT NULL,
+    genero_norm TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS libros_titulo ON libros (titulo_norm);
+CREATE INDEX IF NOT EXISTS libros_autor ON libros (autor_norm);
+CREATE INDEX IF NOT EXISTS libros_genero ON libros (genero_norm);
+CREATE INDEX IF NOT EXISTS libros_anio ON libros (anio);
+CREATE TABLE IF NOT EXISTS generos (
+    genero_norm TEXT PRIMARY KEY,
+    orden INTEGER NOT NULL
+);
+"""
+
+_COLUMNAS = "id, titulo, autor, genero, paginas, anio, disponible"
+_INSERTAR = ("INSERT INTO libros (titulo, autor, genero, paginas, anio, disponible,"
+             " titulo_norm, autor_norm, genero_norm) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_POR_TITULO = f"SELECT {_COLUMNAS} FROM libros WHERE titulo_norm = ? ORDER BY id"
+_POR_AUTOR = f"SELECT {_COLUMNAS} FROM libros WHERE autor_norm = ? ORDER BY id"
+_POR_GENERO = f"SELECT {_COLUMNAS} FROM libros WHERE genero_norm = ? ORDER BY id"
+_TODOS = f"SELECT {_COLUMNAS} FROM libros ORDER BY id"
+_PAGINA = f"SELECT {_COLUMNAS} FROM libros ORDER BY id LIMIT ? OFFSET ?"
+_ELIMINAR = "DELETE FROM libros WHERE titulo_norm = ?"
+# Orden de los géneros en reporte_por_genero, como en Biblioteca: el de su
+# primera aparición, y al final si se vació y vuelve a aparecer
+_REGISTRAR_GENERO = ("INSERT OR IGNORE INTO generos (genero_norm, orden)"
+                     " SELECT ?, COALESCE(MAX(orden), 0) + 1 FROM generos")
+_OLVIDAR_GENEROS = "DELETE FROM generos WHERE genero_norm NOT IN (SELECT genero_norm FROM libros)"
+_COMPLETAR_GENEROS = ("INSERT OR IGNORE INTO generos (genero_norm, orden)"
+                      " SELECT genero_norm, MIN(id) FROM libros GROUP BY genero_norm")
+_ACTUALIZAR_DISPONIBLE = "UPDATE libros SET disponible = ? WHERE id = ?"
+
+# Conteos por (género, páginas): la popularidad depende solo de esos dos
+# datos, así que se suma en Python de forma exacta con Fraction, igual que
+# Biblioteca (un SUM de floats en SQL difiere en los últimos decimales)
+_AGREGADOS_POR_PAGINAS = f"""SELECT genero_norm, genero, paginas, COUNT(*), SUM(disponible <> 0),
+    SUM(anio < {ANIO_ANTIGUO}) FROM libros JOIN generos USING (genero_norm)
+    GROUP BY genero_norm, genero, paginas ORDER BY MIN(generos.orden)"""
+
+
+class BibliotecaSQLite:
+    """Biblioteca con la misma interfaz que ``Biblioteca`` guardada en SQLite.
+
+    Las búsquedas y bajas usan índices sobre título, autor, género y año, y el
+    reporte es una sola consulta agregada, por lo que el catálogo puede ser
+    mucho mayor que la memoria. Los ``Libro`` devueltos escriben en la base
+    los cambios de disponibilidad.
+    """
+    def __init__(self, ruta=":memory:"):
+        self._conexion = sqlite3.connect(ruta)
+        self._conexion.executescript(_ESQUEMA)
+        # Bases creadas antes de la tabla de géneros
+        with self._conexion:
+            self._conexion.execute(_COMPLETAR_GENEROS)
+
+    def cerrar(self):
+        self._conexion.close()
+
+    def __len__(self):
+        return self._conexion.execute("SELECT COUNT(*) FROM libros").fetchone()[0]
+
+    def __iter__(self):
+        return self._libros(self._conexion.execute(_TODOS))
+
+    def _observador_disponibilidad(self, id_libro):
+        def actualizar(libro, anterior):
+            with self._conexion:
+                self._conexion.execute(_ACTUALIZAR_DISPONIBLE, (1 if libro.disponible else 0, id_libro))
+        return actualizar
+
+    def _libros(self, filas):
+        for id_libro, titulo, autor, genero, paginas, anio, disponible in filas:
+            libro = Libro(titulo, autor, genero, paginas, anio, bool(disponible))
+            libro.suscribir(self._observador_disponibilidad(id_libro))
+            yield libro
+
+    @staticmethod
+    def _fila(libro):
+        return (libro.titulo, libro.autor, libro.genero, libro.paginas, libro.anio_publicacion,
+                1 if libro.disponible else 0,
+                libro.titulo.casefold(), libro.autor.casefold(), libro.genero.casefold())
+
+    def agregar_libro(self, libro):
+        self.agregar_libros((libro,))
+
+    def agregar_libros(self, libros):
+        """Inserta un lote de libros con executemany en una sola transacción."""
+        libros = list(libros)
+        if not all(isinstance(libro, Libro) for libro in libros):
+            raise ValueError("Solo se pueden agregar instancias de Libro.")
+        with self._conexion:
+            self._conexion.executemany(_REGISTRAR_GENERO, ((libro.genero.casefold(),) for libro in libros))
+            self._conexion.executemany(_INSERTAR, map(self._fila, libros))
+
+    def buscar_libro(self, titulo):
+        return list(self._libros(self._conexion.execute(_POR_TITULO, (titulo.casefold(),))))
+
+    def buscar_por_autor(self, autor):
+        return list(self._libros(self._conexion.execute(_POR_AUTOR, (autor.casefold(),))))
+
+    def buscar_por_genero(self, genero):
+        return list(self._libros(self._conexion.execute(_POR_GENERO, (genero.casefold(),))))
+
+    def eliminar_libro(self, titulo):
+        self.eliminar_libros((titulo,))
+
+    def eliminar_libros(self, titulos):
+        """Elimina los libros de cada uno de los ``titulos`` en una sola transacción."""
+        antes = self._conexion.total_changes
+        with self._conexion:
+            self._conexion.executemany(_ELIMINAR, ((titulo.casefold(),) for titulo in titulos))
+            eliminados = self._conexion.total_changes - antes
+            if eliminados:
+                self._conexion.execute(_OLVIDAR_GENEROS)
+        return eliminados
+
+    def compactar(self):
+        """Devuelve al sistema las páginas libres que dejaron las bajas (VACUUM)."""
+        self._conexion.execute("VACUUM")
+
+    def estadisticas(self):
+        """SQLite reutiliza el espacio de las filas borradas: no hay filas muertas."""
+        return {"vivos": len(self), "muertos": 0}
+
+    def listar_libros(self):
+        return [libro.obtener_info() for libro in self]
+
+    def iterar_libros(self, offset=0, limite=None, campos=None):
+        """Genera la información de los libros desde ``offset`` leyendo el cursor por partes.
+
+        ``campos`` limita cada registro a esas claves de ``obtener_info``.
+        """
+        validar_campos(campos)
+        filas = self._conexion.execute(_PAGINA, (-1 if limite is None else limite, offset))
+        return (libro.obtener_info(campos) for libro in self._libros(filas))
+
+    def _agregados_por_genero(self):
+        """Género normalizado -> [total, disponibles, antiguos, popularidad (Fraction)]."""
+        por_genero = {}
+        for genero_norm, genero, paginas, total, disponibles, antiguos in self._conexion.execute(
+                _AGREGADOS_POR_PAGINAS):
+            agregados = por_genero.setdefault(genero_norm, [0, 0, 0, Fraction(0)])
+            agregados[0] += total
+            agregados[1] += disponibles
+            agregados[2] += antiguos
+            agregados[3] += Fraction(REGLAS.calcular(genero, paginas)) * total
+        return por_genero
+
+    @staticmethod
+    def _formatear_reporte(total, disponibles, antiguos, popularidad_total):
+        return {
+            "Total libros": total,
+            "Disponibles": disponibles,
+            "Antiguos": antiguos,
+            "Promedio de popularidad": float(popularidad_total / total) if total > 0 else 0
+        }
+
+    def generar_reporte(self):
+        totales = [0, 0, 0, Fraction(0)]
+        for agregados in self._agregados_por_genero().values():
+            totales = [acumulado + valor for acumulado, valor in zip(totales, agregados)]
+        return self._formatear_reporte(*totales)
+
+    def reporte_por_genero(self):
+        return {genero: self._formatear_reporte(*agregados)
+                for genero, agregados in self._agregados_por_genero().items()}
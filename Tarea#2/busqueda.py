@@ -0,0 +1,223 @@
+"""Índices de búsqueda aproximada de títulos.
+
+- ``IndicePrefijos``: trie para autocompletar; cada nodo recuerda el título
+  más corto de su subárbol, de modo que los títulos más cortos (más parecidos
+  al prefijo) salen primero y la búsqueda se detiene al juntar ``k``.
+- ``IndiceTrigramas``: índice de trigramas sobre el vocabulario de los
+  títulos para tolerar errores de tipeo; los candidatos se ordenan por
+  similitud de Jaccard de trigramas.
+
+Ambos trabajan con títulos normalizados (casefold) y cuentan cuántos libros
+comparten cada título, así que se actualizan en O(largo del título) al
+agregar o eliminar un libro.
+"""
+import heapq
+import itertools
+import math
+from collections import Counter
+
+
+class _Nodo:
+    __slots__ = ("hijos", "cantidad", "minimo")
+
+    def __init__(self):
+        self.hijos = {}
+        # Libros cuyo título termina en este nodo
+        self.cantidad = 0
+        # Largo del título más corto del subárbol, para buscar primero por ahí
+        self.minimo = math.inf
+
+
+class IndicePrefijos:
+    """Trie de títulos normalizados para autocompletar."""
+    def __init__(self):
+        self._raiz = _Nodo()
+
+    def agregar(self, titulo):
+        nodo = self._raiz
+        nodo.minimo = min(nodo.minimo, len(titulo))
+        for letra in titulo:
+            hijo = nodo.hijos.get(letra)
+            if hijo is None:
+                hijo = nodo.hijos[letra] = _Nodo()
+            nodo = hijo
+            nodo.minimo = min(nodo.minimo, len(titulo))
+        nodo.cantidad += 1
+
+    def eliminar(self, titulo, cantidad=1):
+        camino = [self._raiz]
+        for letra in titulo:
+            nodo = camino[-1].hijos.get(letra)
+            if nodo is None:
+                return
+            camino.append(nodo)
+        camino[-1].cantidad = max(0, camino[-1].cantidad - cantidad)
+        # De la hoja a la raíz: se podan los nodos vacíos y se recalcula el mínimo
+        for profundidad in range(len(camino) - 1, -1, -1):
+            nodo = camino[profundidad]
+            if profundidad and not nodo.cantidad and not nodo.hijos:
+                del camino[profundidad - 1].hijos[titulo[profundidad - 1]]
+                continue
+            propio = profundidad if nodo.cantidad else math.inf
+            nodo.minimo = min(propio, min((hijo.minimo for hijo in nodo.hijos.values()), default=math.inf))
+
+    def buscar(self, prefijo, k=10):
+        """Hasta ``k`` pares (título, similitud) que empiezan por ``prefijo``.
+
+        La similitud es ``len(prefijo) / len(título)``: 1.0 para la coincidencia
+        exacta. Se exploran primero los subárboles con el título más corto, así
+        que el costo depende de ``k`` y no de cuántos títulos tengan el prefijo.
+        """
+        nodo = self._raiz
+        for letra in prefijo:
+            nodo = nodo.hijos.get(letra)
+            if nodo is None:
+                return []
+        resultados = []
+        # (largo mínimo alcanzable, 0 = título / 1 = subárbol, texto, nodo)
+        pendientes = [(nodo.minimo, 1, prefijo, nodo)]
+        while pendientes and len(resultados) < k:
+            largo, es_subarbol, texto, nodo = heapq.heappop(pendientes)
+            if not es_subarbol:
+                resultados.append((texto, len(prefijo) / largo if largo else 1.0))
+                continue
+            if nodo.cantidad:
+                heapq.heappush(pendientes, (len(texto), 0, texto, None))
+            for letra, hijo in nodo.hijos.items():
+                heapq.heappush(pendientes, (hijo.minimo, 1, texto + letra, hijo))
+        return resultados
+
+
+def trigramas(texto):
+    """Trigramas del texto con relleno, para que palabras cortas también tengan."""
+    relleno = f"  {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceTrigramas:
+    """Búsqueda tolerante a errores en dos niveles.
+
+    Los trigramas se indexan sobre el vocabulario (palabras distintas de los
+    títulos), que es mucho menor que el catálogo. Cada palabra de la consulta
+    se compara con las palabras parecidas del vocabulario. Los candidatos son
+    primero los títulos que contienen parecidas de dos o más palabras de la
+    consulta (intersecciones de conjuntos, sin recorrer título por título) y,
+    si faltan, los de una sola palabra, empezando por la más parecida; solo
+    esos candidatos se ordenan por similitud de Jaccard de trigramas.
+
+    El trabajo por consulta está acotado: las palabras con más de
+    ``MAXIMO_TITULOS_POR_PALABRA`` títulos (como "de" o "la") no generan
+    candidatos salvo que no haya otras, y el relleno examina a lo sumo
+    ``k * CANDIDATOS_POR_RESULTADO`` títulos.
+    """
+    # Candidatos por resultado pedido que se evalúan con la similitud completa
+    CANDIDATOS_POR_RESULTADO = 4
+    # Palabras más comunes que esto no generan candidatos (sí cuentan en Jaccard)
+    MAXIMO_TITULOS_POR_PALABRA = 10_000
+
+    def __init__(self):
+        # título -> libros con ese título
+        self._titulos = {}
+        # palabra -> títulos que la contienen
+        self._por_palabra = {}
+        # palabra -> cantidad de trigramas de la palabra
+        self._tamanos = {}
+        # trigrama -> palabras del vocabulario que lo contienen
+        self._vocabulario = {}
+
+    def agregar(self, titulo):
+        cantidad = self._titulos.get(titulo, 0)
+        self._titulos[titulo] = cantidad + 1
+        if cantidad:
+            return
+        for palabra in set(titulo.split()):
+            titulos = self._por_palabra.get(palabra)
+            if titulos is None:
+                titulos = self._por_palabra[palabra] = set()
+                propios = trigramas(palabra)
+                self._tamanos[palabra] = len(propios)
+                for trigrama in propios:
+                    self._vocabulario.setdefault(trigrama, set()).add(palabra)
+            titulos.add(titulo)
+
+    def eliminar(self, titulo, cantidad=1):
+        if titulo not in self._titulos:
+            return
+        restantes = self._titulos[titulo] - cantidad
+        if restantes > 0:
+            self._titulos[titulo] = restantes
+            return
+        del self._titulos[titulo]
+        for palabra in set(titulo.split()):
+            titulos = self._por_palabra.get(palabra)
+            if titulos is None:
+                continue
+            titulos.discard(titulo)
+            if not titulos:
+                del self._por_palabra[palabra]
+                del self._tamanos[palabra]
+                for trigrama in trigramas(palabra):
+                    palabras = self._vocabulario.get(trigrama)
+                    if palabras is not None:
+                        palabras.discard(palabra)
+                        if not palabras:
+                            del self._vocabulario[trigrama]
+
+    @staticmethod
+    def _jaccard(a, b):
+        comunes = len(a & b)
+        return comunes / (len(a) + len(b) - comunes) if a or b else 1.0
+
+    def _palabras_parecidas(self, palabra, similitud_minima):
+        consulta = trigramas(palabra)
+        # Un solo Counter sobre todas las listas: el conteo corre en C
+        coincidencias = Counter(itertools.chain.from_iterable(
+            self._vocabulario.get(trigrama, ()) for trigrama in consulta))
+        parecidas = {}
+        for candidata, comunes in coincidencias.items():
+            similitud = comunes / (len(consulta) + self._tamanos[candidata] - comunes)
+            if similitud >= similitud_minima:
+                parecidas[candidata] = similitud
+        return parecidas
+
+    def _candidatos(self, texto, cantidad, similitud_minima):
+        """Hasta ``cantidad`` títulos, primero los que coinciden en más palabras."""
+        # Por palabra de la consulta: sus parecidas de la más a la menos
+        # similar y la unión de los títulos que las contienen
+        grupos = []
+        for palabra in set(texto.split()):
+            parecidas = self._palabras_parecidas(palabra, similitud_minima)
+            if parecidas:
+                ordenadas = sorted(parecidas, key=parecidas.get, reverse=True)
+                if len(ordenadas) == 1:
+                    # Sin copiar: el conjunto del índice solo se lee
+                    titulos = self._por_palabra[ordenadas[0]]
+                else:
+                    titulos = set().union(*(self._por_palabra[parecida] for parecida in ordenadas))
+                grupos.append((ordenadas, titulos))
+        raras = [grupo for grupo in grupos if len(grupo[1]) <= self.MAXIMO_TITULOS_POR_PALABRA]
+        if not raras and grupos:
+            raras = [min(grupos, key=lambda grupo: len(grupo[1]))]
+        conjuntos = [titulos for _, titulos in raras]
+        varias = set().union(*(a & b for a, b in itertools.combinations(conjuntos, 2)))
+        candidatos = heapq.nlargest(cantidad, varias,
+                                    key=lambda titulo: sum(titulo in titulos for titulos in conjuntos))
+        for ordenadas, _ in sorted(raras, key=lambda grupo: len(grupo[1])):
+            for parecida in ordenadas:
+                for titulo in self._por_palabra[parecida]:
+                    if len(candidatos) >= cantidad:
+                        return candidatos
+                    if titulo not in varias:
+                        varias.add(titulo)
+                        candidatos.append(titulo)
+        return candidatos
+
+    def buscar(self, texto, k=10, similitud_minima=0.5):
+        """Hasta ``k`` pares (título, similitud de Jaccard) ordenados de mayor a menor."""
+        consulta = trigramas(texto)
+        resultados = []
+        for titulo in self._candidatos(texto, k * self.CANDIDATOS_POR_RESULTADO, similitud_minima):
+            similitud = self._jaccard(consulta, trigramas(titulo))
+            if similitud >= similitud_minima:
+                resultados.append((similitud, titulo))
+        return [(titulo, similitud) for similitud, titulo in heapq.nlargest(k, resultados)]
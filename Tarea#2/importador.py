@@ -0,0 +1,98 @@
+"""Importación masiva de libros desde archivos CSV o JSONL.
+
+Cada fila debe traer ``titulo``, ``autor``, ``genero``, ``paginas`` y ``anio``
+(``disponible`` es opcional). Las filas se leen en lotes y se validan con las
+mismas reglas que ``main.solicitar_datos_libro``; las inválidas se escriben en
+un archivo de rechazos sin detener la importación.
+"""
+import csv
+import itertools
+import json
+import time
+
+from libroRefactorizado import crear_libro
+
+CAMPOS = ("titulo", "autor", "genero", "paginas", "anio")
+TAMANO_LOTE = 10_000
+
+
+def _leer_filas(archivo, formato):
+    """Genera pares (número de línea, fila como dict) sin cargar el archivo completo."""
+    if formato == "csv":
+        lector = csv.DictReader(archivo)
+        for fila in lector:
+            yield lector.line_num, fila
+    else:
+        for numero, linea in enumerate(archivo, 1):
+            if linea.strip():
+                try:
+                    yield numero, json.loads(linea)
+                except json.JSONDecodeError:
+                    # Se conserva el texto original para el archivo de rechazos
+                    yield numero, linea.rstrip("\n")
+
+
+def _interpretar_disponible(valor):
+    if isinstance(valor, str):
+        return valor.strip().lower() not in ("0", "false", "no", "n")
+    return bool(valor)
+
+
+def _libro_desde_fila(fila):
+    if not isinstance(fila, dict):
+        raise ValueError("La fila no es un objeto JSON válido")
+    faltantes = [campo for campo in CAMPOS if fila.get(campo) in (None, "")]
+    if faltantes:
+        raise ValueError(f"Faltan campos: {', '.join(faltantes)}")
+    return crear_libro(fila["titulo"], fila["autor"], str(fila["genero"]), fila["paginas"], fila["anio"],
+                       _interpretar_disponible(fila.get("disponible", True)))
+
+
+def importar_libros(ruta, biblioteca, ruta_rechazos=None, tamano_lote=TAMANO_LOTE, formato=None):
+    """Importa los libros de ``ruta`` en ``biblioteca`` y devuelve un resumen.
+
+    El formato se deduce de la extensión (``.csv`` o ``.jsonl``) salvo que se
+    indique. Cada lote válido se agrega con ``biblioteca.agregar_libros`` para
+    que índices y totales se actualicen una vez por lote. Las filas rechazadas
+    se guardan en ``ruta_rechazos`` (por defecto ``<ruta>.rechazos.jsonl``)
+    como JSONL con la línea, el error y la fila original.
+    """
+    formato = formato or ("csv" if ruta.lower().endswith(".csv") else "jsonl")
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"Formato no soportado: {formato}")
+    ruta_rechazos = ruta_rechazos or ruta + ".rechazos.jsonl"
+
+    importados = 0
+    rechazados = 0
+    rechazos = None
+    inicio = time.perf_counter()
+    try:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            filas = _leer_filas(archivo, formato)
+            while True:
+                lote = list(itertools.islice(filas, tamano_lote))
+                if not lote:
+                    break
+                libros = []
+                for numero, fila in lote:
+                    try:
+                        libros.append(_libro_desde_fila(fila))
+                    except ValueError as error:
+                        if rechazos is None:
+                            rechazos = open(ruta_rechazos, "w", encoding="utf-8")
+                        rechazos.write(json.dumps({"linea": numero, "error": str(error), "fila": fila},
+                                                  ensure_ascii=False) + "\n")
+                        rechazados += 1
+                biblioteca.agregar_libros(libros)
+                importados += len(libros)
+    finally:
+        if rechazos is not None:
+            rechazos.close()
+    segundos = time.perf_counter() - inicio
+    return {
+        "importados": importados,
+        "rechazados": rechazados,
+        "archivo_rechazos": ruta_rechazos if rechazados else None,
+        "segundos": segundos,
+        "filas_por_segundo": (importados + rechazados) / segundos if segundos > 0 else 0,
+    }
@@ -1,12 +1,30 @@
+import sys
+
+from popularidad import REGLAS
+
+GENEROS = ("novela", "ciencia", "historia")
+# Año a partir del cual un libro deja de considerarse antiguo
+ANIO_ANTIGUO = 1980
+
+
 class Libro:
     """Representa un libro en la biblioteca."""
+    # __slots__ evita el __dict__ por instancia; el género se interna para que
+    # todos los libros del mismo género compartan una única cadena.
+    __slots__ = ("_titulo", "_autor", "_genero", "_paginas", "_anio_publicacion",
+                 "_disponible", "_observadores", "_popularidad", "_version_popularidad")
+
     def __init__(self, titulo, autor, genero, paginas, anio_publicacion, disponible=True):
         self._titulo = titulo
         self._autor = autor
-        self._genero = genero
+        self._genero = sys.intern(genero)
         self._paginas = paginas
         self._anio_publicacion = anio_publicacion
         self._disponible = disponible
+        self._observadores = ()
+        # Caché de calcular_popularidad, válida mientras no cambien las reglas
+        self._popularidad = None
+        self._version_popularidad = -1
 
     @property
     def titulo(self):
@@ -34,27 +52,32 @@ class Libro:
 
     @disponible.setter
     def disponible(self, valor):
+        anterior = self._disponible
         self._disponible = valor
+        if anterior != valor:
+            for observador in self._observadores:
+                observador(self, anterior)
+
+    def suscribir(self, observador):
+        """Registra un callback ``observador(libro, anterior)`` para cambios de disponibilidad."""
+        self._observadores = self._observadores + (observador,)
+
+    def desuscribir(self, observador):
+        # Por identidad: la biblioteca suscribe siempre el mismo objeto
+        self._observadores = tuple(o for o in self._observadores if o is not observador)
 
     def calcular_popularidad(self):
-        if self._genero == 'novela':
-            base = 50
-            extra = self._paginas / 10
-        elif self._genero == 'ciencia':
-            base = 70
-            extra = self._paginas / 5
-        elif self._genero == 'historia':
-            base = 40
-            extra = self._paginas / 8
-        else:
-            base = 10
-            extra = 0
-        return base + extra
-
-    def es_antiguo(self):
-        return self._anio_publicacion < 1980
-
-    def obtener_info(self):
+        if self._version_popularidad != REGLAS.version:
+            self._popularidad = REGLAS.calcular(self._genero, self._paginas)
+            self._version_popularidad = REGLAS.version
+        return self._popularidad
+
+    def es_antiguo(self, umbral=ANIO_ANTIGUO):
+        return self._anio_publicacion < umbral
+
+    def obtener_info(self, campos=None):
+        if campos is not None:
+            return {campo: CAMPOS_INFO[campo](self) for campo in campos}
         return {
             "Título": self._titulo,
             "Autor": self._autor,
@@ -70,3 +93,53 @@ class Libro:
         info = self.obtener_info()
         for clave, valor in info.items():
             print(f"{clave}: {valor}")
+
+
+# Cómo obtener cada clave de obtener_info; permite calcular solo los campos pedidos
+CAMPOS_INFO = {
+    "Título": lambda libro: libro.titulo,
+    "Autor": lambda libro: libro.autor,
+    "Género": lambda libro: libro.genero,
+    "Páginas": lambda libro: libro.paginas,
+    "Año": lambda libro: libro.anio_publicacion,
+    "Disponible": lambda libro: "Sí" if libro.disponible else "No",
+    "Popularidad": lambda libro: libro.calcular_popularidad(),
+    "Es antiguo": lambda libro: "Sí" if libro.es_antiguo() else "No",
+}
+
+
+def validar_campos(campos):
+    desconocidos = [campo for campo in campos or () if campo not in CAMPOS_INFO]
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos: {', '.join(desconocidos)}")
+
+
+def _entero(valor, campo):
+    """Convierte a int sin truncar: 2.7 se rechaza, 300.0 se acepta."""
+    if isinstance(valor, float):
+        if not valor.is_integer():
+            raise ValueError(f"{campo} debe ser un número entero: {valor!r}")
+        return int(valor)
+    try:
+        return int(valor)
+    except TypeError:
+        raise ValueError(f"{campo} debe ser un número entero: {valor!r}") from None
+
+
+def crear_libro(titulo, autor, genero, paginas, anio_publicacion, disponible=True):
+    """Valida datos en texto (como los de input()) y construye el Libro.
+
+    Lanza ValueError si el título o el autor no son texto no vacío, si páginas
+    o año no son enteros o si el género no es conocido. Así un dato inválido
+    se rechaza aquí y nunca llega a ``agregar_libros``.
+    """
+    for campo, valor in (("Título", titulo), ("Autor", autor)):
+        if not isinstance(valor, str) or not valor.strip():
+            raise ValueError(f"{campo} inválido: {valor!r}")
+    if not isinstance(genero, str):
+        raise ValueError(f"Género inválido: {genero!r}")
+    genero = genero.strip().lower()
+    if genero not in GENEROS:
+        raise ValueError(f"Género desconocido: {genero!r}")
+    return Libro(titulo, autor, genero, _entero(paginas, "Páginas"), _entero(anio_publicacion, "Año"),
+                 disponible)
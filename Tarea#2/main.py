@@ -1,5 +1,19 @@
+import argparse
+import itertools
+import os
+
+from bibliotecaColumnar import BibliotecaColumnar
+from bibliotecaMapeada import BibliotecaMapeada
 from bibliotecaRefactorizada import Biblioteca
-from libroRefactorizado import Libro
+from bibliotecaSQLite import BibliotecaSQLite
+from importador import importar_libros
+from libroRefactorizado import crear_libro
+from persistencia import abrir_catalogo, guardar_catalogo
+from reporteParalelo import generar_reporte_paralelo, reporte_por_genero_paralelo
+
+TAMANO_PAGINA = 20
+
+BACKENDS = {"refactorizada": Biblioteca, "columnar": BibliotecaColumnar, "sqlite": BibliotecaSQLite}
 
 def solicitar_datos_libro():
     while True:
@@ -7,14 +21,13 @@ def solicitar_datos_libro():
             titulo = input("Título: ")
             autor = input("Autor: ")
             genero = input("Género (novela/ciencia/historia): ").lower()
-            paginas = int(input("Número de páginas: "))
-            anio = int(input("Año de publicación: "))
-            return Libro(titulo, autor, genero, paginas, anio)
+            paginas = input("Número de páginas: ")
+            anio = input("Año de publicación: ")
+            return crear_libro(titulo, autor, genero, paginas, anio)
         except ValueError:
             print("Por favor, ingrese datos válidos.")
 
-if __name__ == "__main__":
-    biblioteca = Biblioteca()
+def menu(biblioteca):
     while True:
         print("\n1. Agregar libro\n2. Listar libros\n3. Buscar libro\n4. Eliminar libro\n5. Generar reporte\n6. Salir")
         opcion = input("Seleccione una opción: ")
@@ -22,13 +35,24 @@ if __name__ == "__main__":
             libro = solicitar_datos_libro()
             biblioteca.agregar_libro(libro)
         elif opcion == "2":
-            for info in biblioteca.listar_libros():
-                print(info)
+            registros = biblioteca.iterar_libros()
+            while pagina := list(itertools.islice(registros, TAMANO_PAGINA)):
+                for info in pagina:
+                    print(info)
+                if len(pagina) < TAMANO_PAGINA or input("Enter para ver más, 'q' para volver: ").lower() == "q":
+                    break
         elif opcion == "3":
             titulo = input("Título a buscar: ")
             resultados = biblioteca.buscar_libro(titulo)
             for libro in resultados:
                 print(libro.obtener_info())
+            buscar_aproximado = getattr(biblioteca, "buscar_aproximado", None)
+            if not resultados and buscar_aproximado is not None:
+                sugerencias = buscar_aproximado(titulo, k=5)
+                if sugerencias:
+                    print("¿Quiso decir?")
+                    for libro in sugerencias:
+                        print(f"  {libro.titulo} - {libro.autor}")
         elif opcion == "4":
             titulo = input("Título a eliminar: ")
             biblioteca.eliminar_libro(titulo)
@@ -39,3 +63,76 @@ if __name__ == "__main__":
             break
         else:
             print("Opción no válida.")
+
+def importar(biblioteca, args):
+    resumen = importar_libros(args.archivo, biblioteca, ruta_rechazos=args.rechazos, tamano_lote=args.lote)
+    print(f"Importados: {resumen['importados']}  Rechazados: {resumen['rechazados']}  "
+          f"({resumen['filas_por_segundo']:.0f} filas/s)")
+    if resumen["archivo_rechazos"]:
+        print(f"Filas rechazadas en {resumen['archivo_rechazos']}")
+    print(biblioteca.generar_reporte())
+
+def reporte(args):
+    print(generar_reporte_paralelo(args.catalogo, args.procesos))
+    if args.por_genero:
+        for genero, datos in reporte_por_genero_paralelo(args.catalogo, args.procesos).items():
+            print(f"{genero}: {datos}")
+
+def cargar_catalogo(biblioteca, ruta, tamano_lote=10_000):
+    with abrir_catalogo(ruta) as catalogo:
+        libros = iter(catalogo)
+        while lote := list(itertools.islice(libros, tamano_lote)):
+            biblioteca.agregar_libros(lote)
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Gestión de biblioteca")
+    parser.add_argument("--backend", choices=[*BACKENDS, "mapeada"],
+                        help="Por defecto 'mapeada' si --catalogo existe (arranque sin cargar el "
+                             "catálogo) y 'refactorizada' si no")
+    parser.add_argument("--catalogo", help="Archivo de catálogo a cargar al iniciar y guardar al salir")
+    subcomandos = parser.add_subparsers(dest="comando")
+    parser_importar = subcomandos.add_parser("importar", help="Importa libros desde un CSV o JSONL")
+    parser_importar.add_argument("archivo")
+    parser_importar.add_argument("--rechazos", help="Archivo donde escribir las filas inválidas")
+    parser_importar.add_argument("--lote", type=int, default=10_000, help="Filas por lote")
+    parser_reporte = subcomandos.add_parser("reporte", help="Reporte del --catalogo repartido en varios procesos")
+    parser_reporte.add_argument("--procesos", type=int, help="Procesos a usar (por defecto, uno por núcleo)")
+    parser_reporte.add_argument("--por-genero", action="store_true", help="Incluye el reporte por género")
+    return parser
+
+if __name__ == "__main__":
+    parser = crear_parser()
+    args = parser.parse_args()
+    if args.comando == "reporte":
+        # Lee el archivo directamente, sin cargar el catálogo en memoria
+        if not args.catalogo:
+            parser.error("reporte requiere --catalogo")
+        reporte(args)
+        raise SystemExit
+    existe = bool(args.catalogo) and os.path.exists(args.catalogo)
+    backend = args.backend or ("mapeada" if existe else "refactorizada")
+    if backend == "mapeada":
+        if not existe:
+            parser.error("--backend mapeada requiere un --catalogo existente")
+        # Solo mapea el archivo: cada comando decodifica lo que usa
+        biblioteca = BibliotecaMapeada(args.catalogo)
+    else:
+        biblioteca = BACKENDS[backend]()
+        if existe:
+            cargar_catalogo(biblioteca, args.catalogo)
+    try:
+        if args.comando == "importar":
+            importar(biblioteca, args)
+        else:
+            menu(biblioteca)
+        if backend == "mapeada":
+            # Un catálogo mapeado sin cambios no se reescribe; guardar() cierra
+            # el mapeo antes de reemplazar el archivo
+            if biblioteca.modificada:
+                biblioteca.guardar(args.catalogo)
+        elif args.catalogo:
+            guardar_catalogo(biblioteca, args.catalogo)
+    finally:
+        cerrar = getattr(biblioteca, "cerrar", None)
+        if cerrar is not None:
+            cerrar()
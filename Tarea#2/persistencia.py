@@ -0,0 +1,126 @@
+"""Catálogo persistente en un archivo binario de registros de ancho fijo.
+
+Formato (little endian):
+
+    cabecera  MAGIA (8 bytes) | cantidad de registros (uint64)
+    registros cantidad x REGISTRO, uno por libro
+    heap      textos UTF-8 sin separadores; cada texto distinto aparece una vez
+
+Cada registro guarda (desplazamiento, largo) en el heap de título, autor y
+género, más páginas, año y disponibilidad. Al tener ancho fijo, el libro
+``i`` se ubica sin leer los anteriores, así que ``CatalogoMapeado`` abre el
+archivo con ``mmap`` y solo decodifica los registros a los que se accede.
+"""
+import mmap
+import os
+import struct
+import tempfile
+
+from libroRefactorizado import Libro
+
+MAGIA = b"BIBLCAT1"
+CABECERA = struct.Struct("<8sQ")
+REGISTRO = struct.Struct("<QIQIQIqqB")
+
+
+def guardar_catalogo(libros, ruta, antes_de_reemplazar=None):
+    """Escribe ``libros`` en ``ruta`` de forma atómica (archivo temporal y rename).
+
+    ``antes_de_reemplazar`` se llama con el temporal ya escrito, justo antes del
+    rename: sirve para cerrar un ``CatalogoMapeado`` de ``ruta`` del que se
+    leen los ``libros`` (en Windows no se puede reemplazar un archivo mapeado).
+    """
+    heap = bytearray()
+    posiciones = {}
+
+    def ubicar(texto):
+        posicion = posiciones.get(texto)
+        if posicion is None:
+            datos = texto.encode("utf-8")
+            posicion = posiciones[texto] = (len(heap), len(datos))
+            heap.extend(datos)
+        return posicion
+
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, prefix=".catalogo-")
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            archivo.write(CABECERA.pack(MAGIA, 0))
+            cantidad = 0
+            for libro in libros:
+                archivo.write(REGISTRO.pack(*ubicar(libro.titulo), *ubicar(libro.autor), *ubicar(libro.genero),
+                                            libro.paginas, libro.anio_publicacion, 1 if libro.disponible else 0))
+                cantidad += 1
+            archivo.write(heap)
+            archivo.seek(0)
+            archivo.write(CABECERA.pack(MAGIA, cantidad))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        # mkstemp crea el archivo con permisos 0600; se conservan los del catálogo previo
+        os.chmod(temporal, os.stat(ruta).st_mode & 0o777 if os.path.exists(ruta) else 0o644)
+        if antes_de_reemplazar is not None:
+            antes_de_reemplazar()
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+class CatalogoMapeado:
+    """Catálogo de solo lectura respaldado por ``mmap``.
+
+    Se comporta como una secuencia de ``Libro``: abrirlo solo lee la cabecera
+    y cada libro se construye cuando se accede a él.
+    """
+    def __init__(self, ruta):
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.ruta = ruta
+        magia, self._cantidad = CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA:
+            self._mapa.close()
+            raise ValueError(f"{ruta} no es un catálogo de biblioteca")
+        self._inicio_heap = CABECERA.size + self._cantidad * REGISTRO.size
+
+    def __len__(self):
+        return self._cantidad
+
+    def texto(self, desplazamiento, largo):
+        """Decodifica el texto del heap que un registro ubica en (desplazamiento, largo)."""
+        inicio = self._inicio_heap + desplazamiento
+        return self._mapa[inicio:inicio + largo].decode("utf-8")
+
+    def registro(self, indice):
+        """Tupla cruda del registro ``indice``, sin decodificar los textos."""
+        return REGISTRO.unpack_from(self._mapa, CABECERA.size + indice * REGISTRO.size)
+
+    def registros(self):
+        """Genera las tuplas crudas de todos los registros, en orden y sin decodificar textos."""
+        with memoryview(self._mapa)[CABECERA.size:self._inicio_heap] as vista:
+            yield from REGISTRO.iter_unpack(vista)
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self._cantidad
+        if not 0 <= indice < self._cantidad:
+            raise IndexError("índice de libro fuera de rango")
+        (titulo, largo_titulo, autor, largo_autor, genero, largo_genero,
+         paginas, anio, disponible) = self.registro(indice)
+        return Libro(self.texto(titulo, largo_titulo), self.texto(autor, largo_autor),
+                     self.texto(genero, largo_genero), paginas, anio, bool(disponible))
+
+    def __iter__(self):
+        return (self[indice] for indice in range(self._cantidad))
+
+    def cerrar(self):
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def abrir_catalogo(ruta):
+    return CatalogoMapeado(ruta)
@@ -0,0 +1,148 @@
+"""Reporte de catálogos muy grandes repartido entre varios procesos.
+
+El catálogo se lee del archivo binario de ``persistencia``: cada proceso abre
+el archivo con ``mmap`` y recorre un rango de registros, así que entre
+procesos solo viajan la ruta, los límites del rango y los totales parciales,
+nunca objetos ``Libro``.
+
+Cada fragmento devuelve, por género, cuántos libros hay, cuántos están
+disponibles, cuántos son antiguos y cuántos tienen cada cantidad de páginas.
+Como la popularidad depende solo del género y las páginas, el proceso
+principal la suma de forma exacta (con ``Fraction``) a partir de esos
+conteos y con sus propias ``REGLAS``; el resultado es idéntico al de
+``Biblioteca.generar_reporte`` sobre los mismos libros.
+"""
+import mmap
+import os
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from fractions import Fraction
+
+from bibliotecaRefactorizada import Biblioteca
+from libroRefactorizado import ANIO_ANTIGUO
+from persistencia import CABECERA, MAGIA, REGISTRO, abrir_catalogo, guardar_catalogo
+from popularidad import REGLAS
+
+# Fragmentos por proceso: más de uno reparte mejor la carga si un proceso se atrasa
+FRAGMENTOS_POR_PROCESO = 4
+
+
+def _parcial_vacio():
+    return {"total": 0, "disponibles": 0, "antiguos": 0, "paginas": Counter()}
+
+
+def agregar_fragmento(ruta, inicio, fin, umbral_antiguo=ANIO_ANTIGUO):
+    """Totales por género de los registros ``inicio`` a ``fin`` (sin incluir) del catálogo."""
+    with open(ruta, "rb") as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magia, cantidad = CABECERA.unpack_from(mapa, 0)
+        if magia != MAGIA:
+            raise ValueError(f"{ruta} no es un catálogo de biblioteca")
+        inicio_heap = CABECERA.size + cantidad * REGISTRO.size
+        # El género se identifica por su posición en el heap: guardar_catalogo
+        # escribe cada texto una sola vez, así que no hace falta decodificarlo.
+        parciales = {}
+        primero = CABECERA.size + inicio * REGISTRO.size
+        with memoryview(mapa)[primero:primero + (fin - inicio) * REGISTRO.size] as registros:
+            for _, _, _, _, genero, largo, paginas, anio, disponible in REGISTRO.iter_unpack(registros):
+                parcial = parciales.get((genero, largo))
+                if parcial is None:
+                    parcial = parciales[(genero, largo)] = _parcial_vacio()
+                parcial["total"] += 1
+                parcial["disponibles"] += 1 if disponible else 0
+                parcial["antiguos"] += 1 if anio < umbral_antiguo else 0
+                parcial["paginas"][paginas] += 1
+        return [(mapa[inicio_heap + genero:inicio_heap + genero + largo].decode("utf-8"), parcial)
+                for (genero, largo), parcial in parciales.items()]
+    finally:
+        mapa.close()
+
+
+def _rangos(cantidad, fragmentos):
+    limites = [cantidad * i // fragmentos for i in range(fragmentos + 1)]
+    return [(inicio, fin) for inicio, fin in zip(limites, limites[1:]) if fin > inicio]
+
+
+def agregar_catalogo(ruta, procesos=None, umbral_antiguo=ANIO_ANTIGUO):
+    """Totales por género (en orden de aparición) de todo el catálogo en ``ruta``.
+
+    Con ``procesos=1`` los fragmentos se recorren en este mismo proceso.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    with abrir_catalogo(ruta) as catalogo:
+        cantidad = len(catalogo)
+    rangos = _rangos(cantidad, procesos * FRAGMENTOS_POR_PROCESO)
+    argumentos = ([ruta] * len(rangos), [inicio for inicio, _ in rangos], [fin for _, fin in rangos],
+                  [umbral_antiguo] * len(rangos))
+    if procesos == 1:
+        return _combinar(map(agregar_fragmento, *argumentos))
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        return _combinar(ejecutor.map(agregar_fragmento, *argumentos))
+
+
+def _combinar(resultados):
+    # Los fragmentos llegan en orden, así que el orden de los géneros es el de
+    # su primera aparición en el catálogo, como en Biblioteca.
+    combinados = {}
+    for resultado in resultados:
+        for genero, parcial in resultado:
+            total = combinados.setdefault(genero, _parcial_vacio())
+            total["total"] += parcial["total"]
+            total["disponibles"] += parcial["disponibles"]
+            total["antiguos"] += parcial["antiguos"]
+            total["paginas"].update(parcial["paginas"])
+    return combinados
+
+
+def _agregados(genero, parcial):
+    popularidad = sum((Fraction(REGLAS.calcular(genero, paginas)) * veces
+                       for paginas, veces in parcial["paginas"].items()), Fraction(0))
+    return {"total": parcial["total"], "disponibles": parcial["disponibles"],
+            "antiguos": parcial["antiguos"], "popularidad": popularidad}
+
+
+def _reportes(combinados):
+    total = Biblioteca._agregados_vacios()
+    por_genero = {}
+    for genero, parcial in combinados.items():
+        agregados = _agregados(genero, parcial)
+        normalizado = por_genero.setdefault(genero.casefold(), Biblioteca._agregados_vacios())
+        for destino in (total, normalizado):
+            for clave, valor in agregados.items():
+                destino[clave] += valor
+    return total, por_genero
+
+
+@contextmanager
+def _archivo_catalogo(catalogo):
+    """Ruta del catálogo; si se pasa una colección de libros se guarda en un temporal."""
+    if isinstance(catalogo, (str, os.PathLike)):
+        yield catalogo
+        return
+    descriptor, ruta = tempfile.mkstemp(prefix="catalogo-", suffix=".bin")
+    os.close(descriptor)
+    try:
+        guardar_catalogo(catalogo, ruta)
+        yield ruta
+    finally:
+        os.unlink(ruta)
+
+
+def generar_reporte_paralelo(catalogo, procesos=None, umbral_antiguo=ANIO_ANTIGUO):
+    """Igual que ``Biblioteca.generar_reporte`` pero repartido en ``procesos`` procesos.
+
+    ``catalogo`` es la ruta de un archivo de ``persistencia`` o una colección de libros.
+    """
+    with _archivo_catalogo(catalogo) as ruta:
+        total, _ = _reportes(agregar_catalogo(ruta, procesos, umbral_antiguo))
+    return Biblioteca._formatear_reporte(total)
+
+
+def reporte_por_genero_paralelo(catalogo, procesos=None, umbral_antiguo=ANIO_ANTIGUO):
+    """Igual que ``Biblioteca.reporte_por_genero`` pero repartido en ``procesos`` procesos."""
+    with _archivo_catalogo(catalogo) as ruta:
+        _, por_genero = _reportes(agregar_catalogo(ruta, procesos, umbral_antiguo))
+    return {genero: Biblioteca._formatear_reporte(agregados) for genero, agregados in por_genero.items()}
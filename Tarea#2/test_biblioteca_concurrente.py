@@ -0,0 +1,99 @@
+"""Prueba multihilo de BibliotecaConcurrente.
+
+Varios hilos prestan y devuelven libros mientras otros piden reportes y
+verifican los agregados. Ningún reporte debe ver totales a medias y, al
+terminar, los disponibles deben coincidir con los préstamos netos y
+``verificar_agregados`` debe seguir dando True.
+
+Las reglas de popularidad se cambian antes de arrancar los hilos, así los
+primeros lectores compiten por recalcularla con el lock de escritura. Un
+cambio de reglas durante una lectura no se prueba: la consulta responde con
+las reglas anteriores (ver ``BibliotecaConcurrente._lectura_preparada``).
+
+Uso:
+    python -m pytest test_biblioteca_concurrente.py
+    python test_biblioteca_concurrente.py
+"""
+import random
+import sys
+import threading
+import unittest
+
+from bibliotecaConcurrente import BibliotecaConcurrente
+from libroRefactorizado import GENEROS, Libro
+from popularidad import REGLAS
+
+LIBROS = 300
+TITULOS = 60
+OPERACIONES = 400
+PRESTAMISTAS = 4
+LECTORES = 4
+
+
+class TestBibliotecaConcurrente(unittest.TestCase):
+
+    def setUp(self):
+        # Cambios de hilo más frecuentes: más intercalados posibles
+        intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        self.addCleanup(sys.setswitchinterval, intervalo)
+        reglas, otros = REGLAS.reglas()
+        self.addCleanup(REGLAS.actualizar, reglas, otros)
+        self.biblioteca = BibliotecaConcurrente()
+        self.biblioteca.agregar_libros(
+            Libro(f"Libro {i % TITULOS}", f"Autor {i % 17}", GENEROS[i % len(GENEROS)],
+                  50 + i * 7 % 900, 1900 + i % 120) for i in range(LIBROS))
+
+    def test_prestamos_y_reportes_concurrentes(self):
+        biblioteca = self.biblioteca
+        disponibles_iniciales = biblioteca.generar_reporte()["Disponibles"]
+        prestados = [0] * PRESTAMISTAS
+        errores = []
+        inconsistencias = []
+
+        def prestamista(indice):
+            azar = random.Random(indice)
+            try:
+                for _ in range(OPERACIONES):
+                    titulo = f"libro {azar.randrange(TITULOS)}"
+                    if azar.random() < 0.5:
+                        prestados[indice] += biblioteca.prestar(titulo) is not None
+                    else:
+                        prestados[indice] -= biblioteca.devolver(titulo)
+            except Exception as e:
+                errores.append(e)
+
+        def lector():
+            try:
+                for _ in range(OPERACIONES // 4):
+                    reporte = biblioteca.generar_reporte()
+                    if reporte["Total libros"] != LIBROS or not 0 <= reporte["Disponibles"] <= LIBROS:
+                        inconsistencias.append(reporte)
+                    por_genero = biblioteca.reporte_por_genero()
+                    if sum(r["Disponibles"] for r in por_genero.values()) > LIBROS:
+                        inconsistencias.append(por_genero)
+                    if not biblioteca.verificar_agregados():
+                        inconsistencias.append("verificar_agregados")
+            except Exception as e:
+                errores.append(e)
+
+        hilos = ([threading.Thread(target=prestamista, args=(i,)) for i in range(PRESTAMISTAS)]
+                 + [threading.Thread(target=lector) for _ in range(LECTORES)])
+        REGLAS.actualizar({"novela": (50, 7), "ciencia": (70, 5)})
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        self.assertEqual(inconsistencias, [])
+        self.assertTrue(biblioteca.verificar_agregados())
+        reporte = biblioteca.generar_reporte()
+        self.assertEqual(reporte["Disponibles"], disponibles_iniciales - sum(prestados))
+        disponibles = sum(1 for info in biblioteca.iterar_libros(campos=["Disponible"])
+                          if info["Disponible"] == "Sí")
+        self.assertEqual(disponibles, reporte["Disponibles"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Pruebas de BibliotecaMapeada.
+
+Guardar sobre el propio archivo mapeado debe escribir los cambios de la
+sesión sin decodificar el catálogo en ``_decodificados`` y cerrar el mapeo
+antes de reemplazar el archivo.
+
+Uso:
+    python -m pytest test_biblioteca_mapeada.py
+    python test_biblioteca_mapeada.py
+"""
+import os
+import tempfile
+import unittest
+
+from bibliotecaMapeada import BibliotecaMapeada
+from bibliotecaRefactorizada import Biblioteca
+from libroRefactorizado import Libro
+from persistencia import abrir_catalogo, guardar_catalogo
+
+
+def _libros():
+    return [Libro(f"Título {i}", f"Autor {i % 7}", ("novela", "ciencia", "historia")[i % 3],
+                  100 + i, 1950 + i % 60, i % 4 != 0) for i in range(50)]
+
+
+class TestGuardarBibliotecaMapeada(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta = os.path.join(directorio.name, "catalogo.bin")
+        guardar_catalogo(_libros(), self.ruta)
+
+    def test_guardar_sobre_el_propio_archivo(self):
+        biblioteca = BibliotecaMapeada(self.ruta)
+        self.addCleanup(biblioteca.cerrar)
+        esperado = Biblioteca()
+        esperado.agregar_libros(_libros())
+        for destino in (biblioteca, esperado):
+            destino.eliminar_libros(["título 3", "título 10"])
+            destino.agregar_libro(Libro("Nuevo", "Autor", "novela", 300, 2001))
+            destino.buscar_libro("Título 5")[0].disponible = False
+        decodificados = len(biblioteca._decodificados)
+
+        biblioteca.guardar(self.ruta)
+        self.assertEqual(len(biblioteca._decodificados), decodificados)
+        self.assertFalse(biblioteca.modificada)
+        # El mapeo quedó cerrado
+        with self.assertRaises(ValueError):
+            biblioteca.buscar_libro("Título 1")
+        biblioteca.cerrar()
+
+        with abrir_catalogo(self.ruta) as catalogo:
+            self.assertEqual([libro.obtener_info() for libro in catalogo], esperado.listar_libros())
+
+    def test_guardar_en_otro_archivo_no_cierra(self):
+        otra = self.ruta + ".copia"
+        with BibliotecaMapeada(self.ruta) as biblioteca:
+            biblioteca.guardar(otra)
+            self.assertEqual(len(biblioteca.buscar_libro("Título 1")), 1)
+        with abrir_catalogo(otra) as catalogo:
+            self.assertEqual(len(catalogo), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Pruebas de los índices de búsqueda de ``busqueda``.
+
+Cubren altas y bajas (incluidos títulos repetidos), el orden de los ``k``
+primeros resultados y la tolerancia a errores de tipeo, también a través de
+``Biblioteca.autocompletar`` y ``Biblioteca.buscar_aproximado``.
+
+Uso:
+    python -m pytest test_busqueda.py
+    python test_busqueda.py
+"""
+import unittest
+
+from bibliotecaRefactorizada import Biblioteca
+from busqueda import IndicePrefijos, IndiceTrigramas
+from libroRefactorizado import Libro
+
+
+def _titulos(resultados):
+    return [titulo for titulo, _ in resultados]
+
+
+class TestIndicePrefijos(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndicePrefijos()
+        for titulo in ("el aleph", "el amor", "el amante japonés", "el túnel", "ficciones"):
+            self.indice.agregar(titulo)
+
+    def test_los_mas_cortos_primero(self):
+        resultados = self.indice.buscar("el a", k=10)
+        self.assertEqual(_titulos(resultados), ["el amor", "el aleph", "el amante japonés"])
+        self.assertEqual(resultados[0][1], 4 / 7)
+
+    def test_top_k(self):
+        self.assertEqual(_titulos(self.indice.buscar("el", k=2)), ["el amor", "el aleph"])
+
+    def test_coincidencia_exacta(self):
+        self.assertEqual(self.indice.buscar("ficciones"), [("ficciones", 1.0)])
+
+    def test_sin_coincidencias(self):
+        self.assertEqual(self.indice.buscar("rayuela"), [])
+
+    def test_eliminar(self):
+        self.indice.eliminar("el amor")
+        self.assertEqual(_titulos(self.indice.buscar("el a")), ["el aleph", "el amante japonés"])
+        # Eliminar lo que no está no cambia nada
+        self.indice.eliminar("el amorío")
+        self.assertEqual(len(self.indice.buscar("el")), 3)
+
+    def test_titulo_repetido_sigue_hasta_eliminar_todos(self):
+        self.indice.agregar("el túnel")
+        self.indice.eliminar("el túnel")
+        self.assertEqual(_titulos(self.indice.buscar("el t")), ["el túnel"])
+        self.indice.eliminar("el túnel")
+        self.assertEqual(self.indice.buscar("el t"), [])
+
+
+class TestIndiceTrigramas(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndiceTrigramas()
+        for titulo in ("cien años de soledad", "el amor en los tiempos del cólera",
+                       "crónica de una muerte anunciada", "la hojarasca", "rayuela"):
+            self.indice.agregar(titulo)
+
+    def test_tolera_errores_de_tipeo(self):
+        self.assertEqual(_titulos(self.indice.buscar("cien anos de soledda", k=1)), ["cien años de soledad"])
+        self.assertEqual(_titulos(self.indice.buscar("rayeula", k=1, similitud_minima=0.2)), ["rayuela"])
+
+    def test_ordenado_por_similitud(self):
+        self.indice.agregar("cien años")
+        resultados = self.indice.buscar("cien años de soledad", k=2, similitud_minima=0.1)
+        self.assertEqual(_titulos(resultados), ["cien años de soledad", "cien años"])
+        self.assertEqual(resultados[0][1], 1.0)
+        self.assertGreater(resultados[0][1], resultados[1][1])
+
+    def test_similitud_minima(self):
+        self.assertEqual(self.indice.buscar("don quijote"), [])
+
+    def test_eliminar(self):
+        self.indice.agregar("la hojarasca")
+        self.indice.eliminar("la hojarasca")
+        self.assertEqual(_titulos(self.indice.buscar("la hojarasca", k=1)), ["la hojarasca"])
+        self.indice.eliminar("la hojarasca")
+        self.assertEqual(self.indice.buscar("la hojarasca", k=1), [])
+
+    def test_palabras_comunes_no_generan_candidatos(self):
+        indice = IndiceTrigramas()
+        indice.MAXIMO_TITULOS_POR_PALABRA = 3
+        for i in range(10):
+            indice.agregar(f"historia de la ciudad {i}")
+        indice.agregar("historia de la lluvia")
+        # "historia", "de" y "la" superan el máximo: los candidatos salen de "lluvia"
+        self.assertEqual(_titulos(indice.buscar("historia de la luvia", k=1)), ["historia de la lluvia"])
+        # Si todas las palabras son comunes se usa la menos común
+        self.assertEqual(len(indice.buscar("historia de la", k=3, similitud_minima=0.1)), 3)
+
+
+class TestBusquedaEnBiblioteca(unittest.TestCase):
+
+    def test_autocompletar_y_aproximado(self):
+        biblioteca = Biblioteca()
+        biblioteca.agregar_libros([Libro("Rayuela", "Cortázar", "novela", 600, 1963),
+                                   Libro("Rayuela", "Cortázar", "novela", 600, 1963),
+                                   Libro("Ficciones", "Borges", "novela", 200, 1944)])
+        self.assertEqual([libro.titulo for libro in biblioteca.autocompletar("RAY")], ["Rayuela", "Rayuela"])
+        self.assertEqual([libro.titulo for libro in biblioteca.buscar_aproximado("ficciomes", k=1)],
+                         ["Ficciones"])
+        biblioteca.eliminar_libro("rayuela")
+        self.assertEqual(biblioteca.autocompletar("ray"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Paridad entre la Biblioteca en memoria, BibliotecaSQLite y BibliotecaColumnar.
+
+Aplica la misma secuencia de altas, bajas, cambios de disponibilidad y
+reportes a los tres backends y exige resultados idénticos a los de
+``Biblioteca``, incluido el orden de los géneros en ``reporte_por_genero`` y
+el último dígito del promedio de popularidad.
+
+Uso:
+    python -m pytest test_paridad_backends.py
+    python test_paridad_backends.py
+"""
+import random
+import unittest
+
+from bibliotecaColumnar import BibliotecaColumnar
+from bibliotecaRefactorizada import Biblioteca
+from bibliotecaSQLite import BibliotecaSQLite
+from libroRefactorizado import Libro
+
+GENEROS = ("novela", "ciencia", "historia", "Novela", "poesía")
+
+
+def _libros(azar, cantidad, desde=0):
+    return [Libro(f"Título {azar.randrange(60)}", f"Autor {azar.randrange(20)}", azar.choice(GENEROS),
+                  azar.randint(30, 1200), azar.randint(1850, 2024), azar.random() < 0.7)
+            for _ in range(desde, desde + cantidad)]
+
+
+def _copias(libros):
+    return [Libro(libro.titulo, libro.autor, libro.genero, libro.paginas, libro.anio_publicacion,
+                  libro.disponible) for libro in libros]
+
+
+def _infos(libros):
+    return [libro.obtener_info() for libro in libros]
+
+
+class TestParidadBackends(unittest.TestCase):
+
+    def setUp(self):
+        self.memoria = Biblioteca()
+        self.sqlite = BibliotecaSQLite()
+        self.addCleanup(self.sqlite.cerrar)
+        self.columnar = BibliotecaColumnar()
+        self.otros = (self.sqlite, self.columnar)
+
+    def assertParidad(self):
+        for otro in self.otros:
+            with self.subTest(backend=type(otro).__name__):
+                self.assertEqual(len(self.memoria), len(otro))
+                self.assertEqual(list(self.memoria.iterar_libros()), list(otro.iterar_libros()))
+                self.assertEqual(self.memoria.generar_reporte(), otro.generar_reporte())
+                self.assertEqual(list(self.memoria.reporte_por_genero().items()),
+                                 list(otro.reporte_por_genero().items()))
+
+    def assertMismosLibros(self, consulta, argumento):
+        esperados = _infos(getattr(self.memoria, consulta)(argumento))
+        for otro in self.otros:
+            with self.subTest(backend=type(otro).__name__, consulta=consulta):
+                self.assertEqual(esperados, _infos(getattr(otro, consulta)(argumento)))
+
+    def agregar(self, libros):
+        self.memoria.agregar_libros(libros)
+        for otro in self.otros:
+            otro.agregar_libros(_copias(libros))
+
+    def eliminar(self, titulos):
+        eliminados = self.memoria.eliminar_libros(titulos)
+        for otro in self.otros:
+            self.assertEqual(eliminados, otro.eliminar_libros(titulos))
+
+    def test_secuencia_aleatoria(self):
+        azar = random.Random(2024)
+        self.agregar(_libros(azar, 500))
+        self.assertParidad()
+        for paso in range(30):
+            accion = azar.random()
+            if accion < 0.4:
+                self.agregar(_libros(azar, azar.randint(1, 40)))
+            elif accion < 0.7:
+                self.eliminar([f"título {azar.randrange(60)}" for _ in range(azar.randint(1, 3))])
+            else:
+                titulo = f"Título {azar.randrange(60)}"
+                disponible = azar.random() < 0.5
+                for backend in (self.memoria, *self.otros):
+                    for libro in backend.buscar_libro(titulo):
+                        libro.disponible = disponible
+            with self.subTest(paso=paso):
+                self.assertParidad()
+        for titulo in ("Título 3", "título 7"):
+            self.assertMismosLibros("buscar_libro", titulo)
+        self.assertMismosLibros("buscar_por_autor", "autor 4")
+        self.assertMismosLibros("buscar_por_genero", "NOVELA")
+
+    def test_promedio_exacto_con_muchas_semillas(self):
+        # Un promedio sumado en float difiere del exacto en el último dígito
+        # en una parte de estas semillas
+        for semilla in range(100):
+            with self.subTest(semilla=semilla):
+                self.setUp()
+                self.agregar(_libros(random.Random(semilla), 300))
+                self.assertParidad()
+
+    def test_orden_de_generos_tras_borrar_el_primer_libro(self):
+        # El género conserva su lugar mientras le quede algún libro
+        self.agregar([Libro("A", "x", "novela", 100, 1990), Libro("B", "x", "ciencia", 100, 1990),
+                      Libro("C", "x", "novela", 200, 1970)])
+        self.eliminar(["A"])
+        self.assertParidad()
+        # Un género que se vacía y vuelve pasa al final
+        self.eliminar(["C"])
+        self.agregar([Libro("D", "x", "novela", 100, 1990)])
+        self.assertParidad()
+
+    def test_biblioteca_vacia(self):
+        self.assertParidad()
+        self.agregar([Libro("A", "x", "historia", 10, 2000)])
+        self.eliminar(["a"])
+        self.assertParidad()
+
+
+if __name__ == "__main__":
+    unittest.main()
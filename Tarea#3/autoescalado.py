@@ -0,0 +1,169 @@
+"""
+Módulo que implementa el autoescalado del pool de cocineros.
+
+ServicioPedidos arranca num_cocineros cocineros y ese número queda fijo:
+o sobran hilos la mayor parte del día o faltan en el pico del almuerzo.
+ControladorEscalado observa el servicio a intervalos regulares y ajusta el
+tamaño del pool entre un mínimo y un máximo.
+
+REGLAS (una decisión por intervalo):
+- SUBIR: si hay más de umbral_profundidad pedidos esperando por cocinero, o
+  si el pedido más antiguo de la cola lleva más de umbral_espera_ms
+  esperando, se suman de una vez los cocineros que faltan para volver a
+  umbral_profundidad pedidos por cocinero (al menos uno, hasta maximo)
+- BAJAR: si la cola está vacía, se retiran los cocineros que llevan al
+  menos enfriamiento segundos ociosos, empezando por el más ocioso (hasta
+  minimo), siempre que la última decisión haya sido hace al menos
+  enfriamiento segundos. Así un hueco corto entre dos ráfagas no desarma
+  el pool
+
+RETIRO DIRIGIDO: Se retira un cocinero concreto con
+ServicioPedidos.retirar_cocinero(), que usa su detener(); las poison pills
+no sirven aquí porque las toma cualquier cocinero.
+
+LOGGING: Cada decisión se registra en el Registro del servicio (origen
+"ESCALADO") y se guarda en historial.
+
+EJEMPLO DE USO:
+    with ServicioPedidos(num_cocineros=2) as servicio:
+        with ControladorEscalado(servicio, minimo=2, maximo=16):
+            futuros = [servicio.enviar(pedido) for pedido in pedidos]
+"""
+
+import math
+import threading
+import time
+from typing import List, Optional, Tuple
+from registro import crear_evento
+from servicio_pedidos import ServicioPedidos
+
+
+class ControladorEscalado:
+    """
+    Controlador que suma y retira cocineros según la carga del servicio.
+    Attributes:
+        servicio (ServicioPedidos): Servicio cuyo pool se ajusta
+        minimo (int): Cocineros mínimos
+        maximo (int): Cocineros máximos
+        umbral_profundidad (float): Pedidos esperando por cocinero a partir
+            de los cuales se suma un cocinero
+        umbral_espera (float): Segundos de espera del pedido más antiguo a
+            partir de los cuales se suma un cocinero
+        enfriamiento (float): Segundos de ociosidad (y desde la última
+            decisión) antes de retirar un cocinero
+        intervalo (float): Segundos entre evaluaciones
+        historial (List[Tuple[float, str, int]]): (instante, acción, cocineros)
+            de cada decisión
+    """
+
+    def __init__(self, servicio: ServicioPedidos, minimo: int = 1, maximo: int = 8,
+                 umbral_profundidad: float = 4, umbral_espera_ms: float = 50,
+                 enfriamiento: float = 1.0, intervalo: float = 0.05):
+        """
+        Args:
+            servicio: Servicio cuyo pool se ajusta
+            minimo: Cocineros mínimos (al menos 1)
+            maximo: Cocineros máximos
+            umbral_profundidad: Pedidos esperando por cocinero para subir
+            umbral_espera_ms: Espera del pedido más antiguo para subir
+            enfriamiento: Segundos antes de retirar un cocinero ocioso
+            intervalo: Segundos entre evaluaciones del hilo del controlador
+        Raises:
+            ValueError: Si los límites no son válidos o el servicio no usa
+                cocineros (ejecutor "en_linea")
+        """
+        if not 1 <= minimo <= maximo:
+            raise ValueError(f"Límites inválidos: minimo={minimo}, maximo={maximo}")
+        if not servicio.ejecutor.requiere_cocineros:
+            raise ValueError("El ejecutor del servicio no usa cocineros: no hay pool que escalar")
+        self.servicio = servicio
+        self.minimo = minimo
+        self.maximo = maximo
+        self.umbral_profundidad = umbral_profundidad
+        self.umbral_espera = umbral_espera_ms / 1000
+        self.enfriamiento = enfriamiento
+        self.intervalo = intervalo
+        self.historial: List[Tuple[float, str, int]] = []
+        self._ultima_decision = time.monotonic()
+        self._detenido = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.detener()
+
+    def iniciar(self):
+        """Arranca el hilo del controlador (idempotente)."""
+        if self._hilo is not None:
+            return
+        self._detenido.clear()
+        self._hilo = threading.Thread(target=self._ejecutar, name="ESCALADO", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo del controlador; el pool queda con su tamaño actual."""
+        if self._hilo is None:
+            return
+        self._detenido.set()
+        self._hilo.join()
+        self._hilo = None
+
+    def _ejecutar(self):
+        # Event.wait() en lugar de sleep(): detener() no espera un intervalo entero
+        while not self._detenido.wait(self.intervalo):
+            self.evaluar()
+
+    def evaluar(self) -> Optional[str]:
+        """
+        Evalúa la carga una vez y aplica a lo sumo una decisión.
+        Se puede llamar directamente (sin iniciar()) para escalar de forma
+        determinista, por ejemplo desde un benchmark.
+        Returns:
+            str | None: "subir", "bajar" o None si no se cambió el pool
+        """
+        cocineros = list(self.servicio.cocineros)
+        if not cocineros:
+            # Pool detenido o cerrado: nada que escalar
+            return None
+        profundidad = self.servicio.profundidad()
+        espera = self.servicio.cola_pedidos.antiguedad()
+        ahora = time.monotonic()
+
+        saturado = (profundidad > self.umbral_profundidad * len(cocineros)
+                    or espera > self.umbral_espera)
+        if saturado and len(cocineros) < self.maximo:
+            objetivo = math.ceil(profundidad / self.umbral_profundidad)
+            faltan = min(self.maximo, max(objetivo, len(cocineros) + 1)) - len(cocineros)
+            agregados = 0
+            while agregados < faltan and self.servicio.agregar_cocinero() is not None:
+                agregados += 1
+            if not agregados:
+                return None
+            return self._registrar(ahora, "subir", agregados, len(self.servicio.cocineros),
+                                   f"profundidad {profundidad}, espera {espera * 1000:.0f} ms")
+
+        if (profundidad == 0 and len(cocineros) > self.minimo
+                and ahora - self._ultima_decision >= self.enfriamiento):
+            ociosos = [(desde, cocinero) for cocinero, desde in
+                       ((cocinero, cocinero.ocioso_desde) for cocinero in cocineros)
+                       if desde is not None and ahora - desde >= self.enfriamiento]
+            ociosos.sort(key=lambda par: par[0])
+            retirados = [cocinero for _, cocinero in ociosos[:len(cocineros) - self.minimo]
+                         if self.servicio.retirar_cocinero(cocinero)]
+            if retirados:
+                nombres = ", ".join(cocinero.nombre for cocinero in retirados)
+                return self._registrar(ahora, "bajar", len(retirados), len(self.servicio.cocineros),
+                                       f"ociosos: {nombres}")
+        return None
+
+    def _registrar(self, ahora: float, accion: str, cambio: int, cocineros: int, motivo: str) -> str:
+        """Guarda la decisión en el historial y la registra."""
+        self._ultima_decision = ahora
+        self.historial.append((ahora, accion, cocineros))
+        signo = "+" if accion == "subir" else "-"
+        self.servicio.registro.registrar(crear_evento(
+            "ESCALADO", "mensaje", detalle=f"{signo}{cambio} cocinero(s) ({motivo}) -> {cocineros} cocineros"))
+        return accion
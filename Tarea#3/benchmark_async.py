@@ -0,0 +1,114 @@
+"""
+Benchmark del servicio asyncio frente al servicio con hilos.
+
+Envía la misma cantidad de pedidos (creados con las factories) y mide
+pedidos por segundo y latencia p50/p99 (desde enviar hasta el resultado) en:
+1. ServicioPedidos con hilos, cliente síncrono (enviar + Future.result)
+2. ServicioPedidos con hilos desde asyncio (asyncio.wrap_future): el puente
+   que usa hoy un front end asyncio, con un cambio de hilo por pedido
+3. ServicioPedidosAsync con preparar() en el ejecutor (por defecto)
+4. ServicioPedidosAsync con preparar() en el loop (preparar_en_hilo=False)
+
+Uso:
+    python benchmark_async.py [--pedidos 20000] [--cocineros 4]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from factory import CreadorHamburguesas, CreadorPizzas
+from servicio_pedidos import ServicioPedidos
+from servicio_pedidos_async import ServicioPedidosAsync
+
+
+class _SalidaNula(io.TextIOBase):
+    """Descarta los mensajes de los cocineros para no medir la consola."""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def crear_pedidos(cantidad: int) -> list:
+    creadores = (CreadorHamburguesas(), CreadorPizzas())
+    return [creadores[i % 2].crear_pedido(i) for i in range(cantidad)]
+
+
+def percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def con_hilos(pedidos: list, cocineros: int):
+    """Segundos totales y latencias con el servicio de hilos y un cliente síncrono."""
+    latencias = []
+    with ServicioPedidos(num_cocineros=cocineros) as servicio:
+        inicio = time.perf_counter()
+        futuros = []
+        for pedido in pedidos:
+            enviado = time.perf_counter()
+            futuro = servicio.enviar(pedido)
+            futuro.add_done_callback(lambda _, t=enviado: latencias.append(time.perf_counter() - t))
+            futuros.append(futuro)
+        for futuro in futuros:
+            futuro.result()
+        total = time.perf_counter() - inicio
+    return total, latencias
+
+
+async def puente_asyncio(pedidos: list, cocineros: int):
+    """El servicio de hilos usado desde asyncio con asyncio.wrap_future()."""
+    latencias = []
+
+    async def enviar(servicio, pedido):
+        enviado = time.perf_counter()
+        await asyncio.wrap_future(servicio.enviar(pedido))
+        latencias.append(time.perf_counter() - enviado)
+
+    with ServicioPedidos(num_cocineros=cocineros) as servicio:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(enviar(servicio, pedido) for pedido in pedidos))
+        total = time.perf_counter() - inicio
+    return total, latencias
+
+
+async def nativo_asyncio(pedidos: list, cocineros: int, preparar_en_hilo: bool):
+    """El servicio asyncio, con o sin ejecutor para los preparar() síncronos."""
+    latencias = []
+
+    async def enviar(servicio, pedido):
+        enviado = time.perf_counter()
+        await servicio.enviar(pedido)
+        latencias.append(time.perf_counter() - enviado)
+
+    async with ServicioPedidosAsync(num_cocineros=cocineros, preparar_en_hilo=preparar_en_hilo) as servicio:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(enviar(servicio, pedido) for pedido in pedidos))
+        total = time.perf_counter() - inicio
+    return total, latencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del servicio asyncio frente al de hilos")
+    parser.add_argument("--pedidos", type=int, default=20_000)
+    parser.add_argument("--cocineros", type=int, default=4)
+    args = parser.parse_args()
+
+    pedidos = crear_pedidos(args.pedidos)
+    variantes = [
+        ("Hilos, cliente síncrono", lambda: con_hilos(pedidos, args.cocineros)),
+        ("Hilos vía wrap_future", lambda: asyncio.run(puente_asyncio(pedidos, args.cocineros))),
+        ("asyncio, preparar en ejecutor", lambda: asyncio.run(nativo_asyncio(pedidos, args.cocineros, True))),
+        ("asyncio, preparar en el loop", lambda: asyncio.run(nativo_asyncio(pedidos, args.cocineros, False))),
+    ]
+    print(f"{'Variante':<32}{'Pedidos/s':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}")
+    for nombre, variante in variantes:
+        with contextlib.redirect_stdout(_SalidaNula()):
+            total, latencias = variante()
+        print(f"{nombre:<32}{len(pedidos) / total:>12.0f}"
+              f"{percentil(latencias, 0.50) * 1000:>11.2f}{percentil(latencias, 0.99) * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark del cierre del pool de cocineros.
+
+Mide, con un pool grande (100 cocineros por defecto):
+1. CPU consumida por el pool ocioso: con espera sin sondeo debe ser ~0
+   (antes cada cocinero se despertaba una vez por segundo con get(timeout=1))
+2. Tiempo de cierre ordenado con el pool ocioso
+3. Tiempo de cierre ordenado con pedidos pendientes (los prepara todos)
+4. Tiempo de cierre inmediato con pedidos pendientes (los cancela)
+
+Uso:
+    python benchmark_cierre.py [--cocineros 100] [--pendientes 2000] [--preparacion-ms 5]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from pedido import Pedido
+from servicio_pedidos import ServicioPedidos
+
+
+class PedidoLento(Pedido):
+    """Pedido cuya preparación tarda un tiempo fijo (simula cocinar)."""
+
+    def __init__(self, numero_pedido: int, segundos: float):
+        super().__init__(numero_pedido)
+        self.segundos = segundos
+
+    def preparar(self) -> str:
+        time.sleep(self.segundos)
+        return f"Pedido lento {self.numero_pedido} preparado"
+
+    def get_tipo(self) -> str:
+        return "Lento"
+
+
+class _SalidaNula(io.TextIOBase):
+    """Descarta los mensajes de los cocineros para no medir la consola."""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def medir_cierre(cocineros: int, pendientes: int, segundos: float, cancelar: bool):
+    """Milisegundos que tarda cerrar(), y cuántos pedidos se cancelaron."""
+    servicio = ServicioPedidos(num_cocineros=cocineros)
+    servicio.iniciar()
+    futuros = [servicio.enviar(PedidoLento(i, segundos)) for i in range(pendientes)]
+    inicio = time.perf_counter()
+    servicio.cerrar(esperar=True, cancelar_pendientes=cancelar)
+    milisegundos = (time.perf_counter() - inicio) * 1000
+    return milisegundos, sum(1 for futuro in futuros if futuro.cancelled())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del cierre del pool de cocineros")
+    parser.add_argument("--cocineros", type=int, default=100)
+    parser.add_argument("--pendientes", type=int, default=2000)
+    parser.add_argument("--preparacion-ms", type=float, default=5.0)
+    parser.add_argument("--ocioso-s", type=float, default=2.0,
+                        help="Segundos que se mide la CPU del pool ocioso")
+    args = parser.parse_args()
+    segundos = args.preparacion_ms / 1000
+
+    with contextlib.redirect_stdout(_SalidaNula()):
+        servicio = ServicioPedidos(num_cocineros=args.cocineros)
+        servicio.iniciar()
+        cpu_inicio = time.process_time()
+        time.sleep(args.ocioso_s)
+        cpu_ocioso = time.process_time() - cpu_inicio
+        inicio = time.perf_counter()
+        servicio.cerrar()
+        cierre_ocioso = (time.perf_counter() - inicio) * 1000
+
+        ordenado, _ = medir_cierre(args.cocineros, args.pendientes, segundos, cancelar=False)
+        inmediato, cancelados = medir_cierre(args.cocineros, args.pendientes, segundos, cancelar=True)
+
+    print(f"Cocineros: {args.cocineros}")
+    print(f"CPU del pool ocioso durante {args.ocioso_s:.1f} s: {cpu_ocioso * 1000:.1f} ms")
+    print(f"{'Cierre ordenado, pool ocioso:':<42}{cierre_ocioso:8.1f} ms")
+    print(f"{f'Cierre ordenado, {args.pendientes} pendientes:':<42}{ordenado:8.1f} ms")
+    print(f"{f'Cierre inmediato, {args.pendientes} pendientes:':<42}{inmediato:8.1f} ms "
+          f"({cancelados} pedidos cancelados)")
+
+
+if __name__ == "__main__":
+    main()
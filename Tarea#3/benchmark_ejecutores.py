@@ -0,0 +1,86 @@
+"""
+Benchmark de los ejecutores de pedidos con preparar() que consume CPU.
+
+PedidoCalculo simula una cocina con trabajo de CPU en Python puro (un bucle
+que mantiene el GIL). Se mide pedidos por segundo con:
+1. "en_linea": todo en el hilo del cliente (referencia sin concurrencia)
+2. "hilos": los cocineros se turnan el GIL, no escala con más núcleos
+3. "procesos" con 1..N procesos: escala hasta la cantidad de núcleos
+
+Uso:
+    python benchmark_ejecutores.py [--pedidos 400] [--trabajo 200000] [--procesos 4]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+from ejecutores import EjecutorProcesos
+from pedido import Pedido
+from servicio_pedidos import ServicioPedidos
+
+# Iteraciones del bucle de preparar(); se fija desde main() antes de crear
+# el pool, así los procesos creados con fork heredan el valor
+TRABAJO = 200_000
+
+
+class PedidoCalculo(Pedido):
+    """Pedido cuyo preparar() es puro cálculo. Su único estado es numero_pedido."""
+
+    def preparar(self) -> str:
+        acumulado = 0
+        for i in range(TRABAJO):
+            acumulado = (acumulado + i * self.numero_pedido) % 1_000_003
+        return f"Cálculo #{self.numero_pedido}: {acumulado}"
+
+    def get_tipo(self) -> str:
+        return "Cálculo"
+
+
+class _SalidaNula(io.TextIOBase):
+    """Descarta los mensajes de los cocineros para no medir la consola."""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def medir(pedidos: int, cocineros: int, ejecutor) -> float:
+    """Pedidos por segundo preparando ``pedidos`` pedidos con el ejecutor dado."""
+    with contextlib.redirect_stdout(_SalidaNula()):
+        with ServicioPedidos(num_cocineros=cocineros, ejecutor=ejecutor) as servicio:
+            inicio = time.perf_counter()
+            futuros = [servicio.enviar(PedidoCalculo(i)) for i in range(pedidos)]
+            for futuro in futuros:
+                futuro.result()
+            total = time.perf_counter() - inicio
+    return pedidos / total
+
+
+def main():
+    global TRABAJO
+    parser = argparse.ArgumentParser(description="Benchmark de ejecutores con pedidos de CPU")
+    parser.add_argument("--pedidos", type=int, default=400)
+    parser.add_argument("--trabajo", type=int, default=TRABAJO,
+                        help="Iteraciones de cálculo por pedido")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1,
+                        help="Máximo de procesos a probar")
+    args = parser.parse_args()
+    TRABAJO = args.trabajo
+
+    variantes = [("en_linea", 1, "en_linea"), ("hilos", args.procesos, "hilos")]
+    for procesos in range(1, args.procesos + 1):
+        # Un cocinero por proceso más uno, para que el pool nunca espere lotes
+        variantes.append((f"procesos x{procesos}", procesos + 1, EjecutorProcesos(procesos=procesos)))
+
+    print(f"Núcleos disponibles: {os.cpu_count()}")
+    print(f"{'Ejecutor':<16}{'Cocineros':>10}{'Pedidos/s':>12}{'Aceleración':>13}")
+    base = None
+    for nombre, cocineros, ejecutor in variantes:
+        velocidad = medir(args.pedidos, cocineros, ejecutor)
+        base = base or velocidad
+        print(f"{nombre:<16}{cocineros:>10}{velocidad:>12.1f}{velocidad / base:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark del autoescalado con carga en ráfagas.
+
+Simula varios "picos de almuerzo": ráfagas de pedidos que esperan I/O
+(preparar() duerme unos milisegundos) separadas por pausas sin pedidos.
+Compara la latencia (desde enviar hasta el resultado) y los hilos de
+cocineros usados en promedio con:
+1. Pool fijo chico (el mínimo del autoescalado)
+2. Pool fijo grande (el máximo del autoescalado: sobreaprovisionado)
+3. Autoescalado entre ambos
+
+Uso:
+    python benchmark_escalado.py [--rafagas 4] [--pedidos 300] [--pausa 1.5]
+"""
+
+import argparse
+import contextlib
+import io
+import threading
+import time
+from autoescalado import ControladorEscalado
+from pedido import PedidoHamburguesa
+from servicio_pedidos import ServicioPedidos
+
+# Segundos de preparación simulada de cada pedido (espera de I/O)
+PREPARACION = 0.005
+
+
+class HamburguesaPlancha(PedidoHamburguesa):
+    def preparar(self) -> str:
+        time.sleep(PREPARACION)
+        return super().preparar()
+
+
+class _SalidaNula(io.TextIOBase):
+    """Descarta los mensajes de los cocineros para no medir la consola."""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def correr(args, cocineros: int, escalar: bool):
+    """Latencias de todos los pedidos y promedio de cocineros en marcha."""
+    latencias = []
+    muestras = []
+    terminado = threading.Event()
+    with contextlib.redirect_stdout(_SalidaNula()):
+        with ServicioPedidos(num_cocineros=cocineros) as servicio:
+            def muestrear():
+                while not terminado.wait(0.01):
+                    muestras.append(len(servicio.cocineros))
+
+            muestreo = threading.Thread(target=muestrear, daemon=True)
+            muestreo.start()
+            controlador = ControladorEscalado(servicio, minimo=args.minimo, maximo=args.maximo,
+                                              enfriamiento=args.pausa / 3)
+            with controlador if escalar else contextlib.nullcontext():
+                numero = 0
+                for rafaga in range(args.rafagas):
+                    futuros = []
+                    for _ in range(args.pedidos):
+                        enviado = time.perf_counter()
+                        futuro = servicio.enviar(HamburguesaPlancha(numero))
+                        futuro.add_done_callback(
+                            lambda _, t=enviado: latencias.append(time.perf_counter() - t))
+                        futuros.append(futuro)
+                        numero += 1
+                    for futuro in futuros:
+                        futuro.result()
+                    if rafaga < args.rafagas - 1:
+                        time.sleep(args.pausa)
+            terminado.set()
+            muestreo.join()
+    return latencias, sum(muestras) / max(1, len(muestras)), controlador.historial
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de autoescalado con ráfagas")
+    parser.add_argument("--rafagas", type=int, default=4)
+    parser.add_argument("--pedidos", type=int, default=300, help="Pedidos por ráfaga")
+    parser.add_argument("--pausa", type=float, default=1.5, help="Segundos entre ráfagas")
+    parser.add_argument("--minimo", type=int, default=2)
+    parser.add_argument("--maximo", type=int, default=16)
+    args = parser.parse_args()
+
+    variantes = [
+        (f"Fijo {args.minimo} cocineros", args.minimo, False),
+        (f"Fijo {args.maximo} cocineros", args.maximo, False),
+        (f"Autoescalado {args.minimo}-{args.maximo}", args.minimo, True),
+    ]
+    print(f"{'Pool':<24}{'p50 (ms)':>10}{'p99 (ms)':>10}{'Cocineros prom.':>17}{'Decisiones':>12}")
+    for nombre, cocineros, escalar in variantes:
+        latencias, promedio, historial = correr(args, cocineros, escalar)
+        print(f"{nombre:<24}{percentil(latencias, 0.5) * 1000:>10.1f}"
+              f"{percentil(latencias, 0.99) * 1000:>10.1f}{promedio:>17.1f}{len(historial):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark de la preparación por lotes de los cocineros.
+
+Mide pedidos por segundo según tamano_lote con dos cargas:
+1. Pedidos de las factories (hamburguesas y pizzas intercaladas): preparar()
+   es instantáneo y domina el costo fijo por pedido (cola, lock, print)
+2. PizzaHorno, que redefine el hook preparar_lote(): cada llamada al horno
+   tiene un costo fijo de precalentado que el lote reparte entre sus pizzas
+
+Uso:
+    python benchmark_lotes.py [--pedidos 20000] [--cocineros 2] [--espera-ms 0]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from factory import CreadorHamburguesas, CreadorPizzas
+from pedido import PedidoPizza
+from servicio_pedidos import ServicioPedidos
+
+TAMANOS = (1, 2, 4, 8, 16, 32, 64)
+# Iteraciones de "precalentado" por llamada al horno
+PRECALENTADO = 2_000
+
+
+def _precalentar():
+    acumulado = 0
+    for i in range(PRECALENTADO):
+        acumulado += i
+    return acumulado
+
+
+class PizzaHorno(PedidoPizza):
+    """Pizza con un costo fijo por horneada; el hook hornea el lote entero de una vez."""
+
+    def preparar(self) -> str:
+        _precalentar()
+        return super().preparar()
+
+    @classmethod
+    def preparar_lote(cls, pedidos):
+        _precalentar()
+        return [PedidoPizza.preparar(pedido) for pedido in pedidos]
+
+
+class _SalidaNula(io.TextIOBase):
+    """Descarta los mensajes de los cocineros para no medir la consola."""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def medir(pedidos: list, cocineros: int, tamano_lote: int, espera_ms: float) -> float:
+    """Pedidos por segundo enviando ``pedidos`` al servicio y esperando todos los resultados."""
+    with contextlib.redirect_stdout(_SalidaNula()):
+        with ServicioPedidos(num_cocineros=cocineros, tamano_lote=tamano_lote,
+                             espera_lote_ms=espera_ms) as servicio:
+            inicio = time.perf_counter()
+            futuros = [servicio.enviar(pedido) for pedido in pedidos]
+            for futuro in futuros:
+                futuro.result()
+            total = time.perf_counter() - inicio
+    return len(pedidos) / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de preparación por lotes")
+    parser.add_argument("--pedidos", type=int, default=20_000)
+    parser.add_argument("--cocineros", type=int, default=2)
+    parser.add_argument("--espera-ms", type=float, default=0,
+                        help="Espera máxima para llenar cada lote")
+    args = parser.parse_args()
+
+    creadores = (CreadorHamburguesas(), CreadorPizzas())
+    cargas = {
+        "Factories": [creadores[i % 2].crear_pedido(i) for i in range(args.pedidos)],
+        "PizzaHorno (hook)": [PizzaHorno(i) for i in range(args.pedidos)],
+    }
+    print(f"{'Lote':>6}" + "".join(f"{nombre:>20}" for nombre in cargas) + "   (pedidos/s)")
+    for tamano in TAMANOS:
+        columnas = [medir(pedidos, args.cocineros, tamano, args.espera_ms) for pedidos in cargas.values()]
+        print(f"{tamano:>6}" + "".join(f"{velocidad:>20.0f}" for velocidad in columnas))
+
+
+if __name__ == "__main__":
+    main()
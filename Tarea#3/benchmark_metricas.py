@@ -0,0 +1,77 @@
+"""
+Benchmark del costo de las métricas por pedido.
+
+Mide pedidos por segundo con pedidos instantáneos de las factories (el peor
+caso: el costo de medir no se diluye en la preparación) con:
+1. medir=False
+2. medir=True (por defecto)
+3. medir=True y un VolcadorMetricas escribiendo cada 0.1 s
+
+Al final muestra la foto de metricas() de la última corrida.
+
+Uso:
+    python benchmark_metricas.py [--pedidos 50000] [--cocineros 4] [--repeticiones 3]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from factory import CreadorHamburguesas, CreadorPizzas
+from metricas import VolcadorMetricas
+from servicio_pedidos import ServicioPedidos
+
+
+class _SalidaNula(io.TextIOBase):
+    """Descarta los mensajes de los cocineros para no medir la consola."""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def medir(pedidos: list, cocineros: int, medir_metricas: bool, volcado: str = None):
+    """Pedidos por segundo y la foto final de metricas()."""
+    with contextlib.redirect_stdout(_SalidaNula()):
+        with ServicioPedidos(num_cocineros=cocineros, medir=medir_metricas) as servicio:
+            volcador = VolcadorMetricas(servicio, volcado, 0.1) if volcado else contextlib.nullcontext()
+            with volcador:
+                inicio = time.perf_counter()
+                futuros = [servicio.enviar(pedido) for pedido in pedidos]
+                for futuro in futuros:
+                    futuro.result()
+                total = time.perf_counter() - inicio
+            foto = servicio.metricas()
+    return len(pedidos) / total, foto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del costo de las métricas")
+    parser.add_argument("--pedidos", type=int, default=50_000)
+    parser.add_argument("--cocineros", type=int, default=4)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    creadores = (CreadorHamburguesas(), CreadorPizzas())
+    pedidos = [creadores[i % 2].crear_pedido(i) for i in range(args.pedidos)]
+    with tempfile.TemporaryDirectory() as directorio:
+        volcado = os.path.join(directorio, "metricas.jsonl")
+        variantes = [
+            ("Sin métricas", False, None),
+            ("Con métricas", True, None),
+            ("Con métricas y volcado", True, volcado),
+        ]
+        print(f"{'Variante':<26}{'Pedidos/s':>12}")
+        for nombre, medir_metricas, destino in variantes:
+            # La mejor de varias repeticiones, para que el ruido no tape la diferencia
+            corridas = [medir(pedidos, args.cocineros, medir_metricas, destino)
+                        for _ in range(args.repeticiones)]
+            velocidad, foto = max(corridas, key=lambda corrida: corrida[0])
+            print(f"{nombre:<26}{velocidad:>12.0f}")
+    print(json.dumps(foto["por_tipo"], indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark de las políticas de planificación de ColaPlanificada.
+
+Simula un burst de pizzas lentas seguido de hamburguesas rápidas, todas con
+plazo, y los prepara con pocos cocineros. Para cada política (la cola FIFO
+original, y ColaPlanificada con "fifo", "sjf" y "edf") muestra la latencia
+p50/p99 por tipo (desde enviar hasta el resultado) y los plazos cumplidos.
+
+Uso:
+    python benchmark_planificacion.py [--pizzas 40] [--hamburguesas 40] [--cocineros 2]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from cola_pedidos import ColaPedidos
+from cola_planificada import ColaPlanificada
+from pedido import PedidoHamburguesa, PedidoPizza
+from servicio_pedidos import ServicioPedidos
+
+# Tiempo de preparación simulado (segundos) y plazo de cada tipo
+COSTOS = {"Pizza": 0.004, "Hamburguesa": 0.0005}
+PLAZOS = {"Pizza": 0.5, "Hamburguesa": 0.05}
+
+
+class PizzaLenta(PedidoPizza):
+    def preparar(self) -> str:
+        time.sleep(COSTOS["Pizza"])
+        return super().preparar()
+
+
+class HamburguesaRapida(PedidoHamburguesa):
+    def preparar(self) -> str:
+        time.sleep(COSTOS["Hamburguesa"])
+        return super().preparar()
+
+
+class _SalidaNula(io.TextIOBase):
+    """Descarta los mensajes de los cocineros para no medir la consola."""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def correr(cola, pizzas: int, hamburguesas: int, cocineros: int):
+    """Latencias por tipo y plazos (cumplidos, incumplidos) con la cola dada."""
+    pedidos = [PizzaLenta(i) for i in range(pizzas)]
+    pedidos += [HamburguesaRapida(pizzas + i) for i in range(hamburguesas)]
+    latencias = {tipo: [] for tipo in COSTOS}
+    plazos = [0, 0]
+    with contextlib.redirect_stdout(_SalidaNula()):
+        with ServicioPedidos(num_cocineros=cocineros, cola_pedidos=cola) as servicio:
+            futuros = []
+            for pedido in pedidos:
+                tipo, enviado = pedido.get_tipo(), time.perf_counter()
+                futuro = servicio.enviar(pedido, plazo=PLAZOS[tipo])
+
+                def registrar(_, tipo=tipo, enviado=enviado):
+                    latencia = time.perf_counter() - enviado
+                    latencias[tipo].append(latencia)
+                    plazos[latencia > PLAZOS[tipo]] += 1
+
+                futuro.add_done_callback(registrar)
+                futuros.append(futuro)
+            for futuro in futuros:
+                futuro.result()
+    return latencias, plazos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de políticas de planificación")
+    parser.add_argument("--pizzas", type=int, default=40)
+    parser.add_argument("--hamburguesas", type=int, default=40)
+    parser.add_argument("--cocineros", type=int, default=2)
+    args = parser.parse_args()
+
+    variantes = [
+        ("ColaPedidos (FIFO)", lambda: ColaPedidos()),
+        ("Planificada fifo", lambda: ColaPlanificada("fifo")),
+        ("Planificada sjf", lambda: ColaPlanificada("sjf", costos=COSTOS)),
+        ("Planificada edf", lambda: ColaPlanificada("edf")),
+    ]
+    print(f"{'Cola':<22}{'Pizza p50/p99 (ms)':>22}{'Hamb. p50/p99 (ms)':>22}{'Plazos ok/vencidos':>21}")
+    for nombre, crear_cola in variantes:
+        latencias, (cumplidos, incumplidos) = correr(crear_cola(), args.pizzas, args.hamburguesas,
+                                                     args.cocineros)
+        columnas = [f"{percentil(latencias[tipo], 0.5) * 1000:.1f}/{percentil(latencias[tipo], 0.99) * 1000:.1f}"
+                    for tipo in ("Pizza", "Hamburguesa")]
+        print(f"{nombre:<22}{columnas[0]:>22}{columnas[1]:>22}{f'{cumplidos}/{incumplidos}':>21}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark del registro síncrono (lock de consola) frente al asíncrono.
+
+Envía la misma cantidad de pedidos con varios cocineros y mide pedidos por
+segundo hasta que todo el log está escrito, con:
+1. RegistroSincrono: cada cocinero escribe con el lock compartido
+2. RegistroAsincrono: los cocineros encolan eventos y un hilo escritor los
+   escribe por lotes
+
+El log va a un archivo temporal (o a --salida), para medir una escritura
+real sin llenar la terminal.
+
+Uso:
+    python benchmark_registro.py [--pedidos 20000] [--cocineros 4] [--salida ruta]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from factory import CreadorHamburguesas, CreadorPizzas
+from registro import RegistroAsincrono, RegistroSincrono
+from servicio_pedidos import ServicioPedidos
+
+
+def medir(pedidos: list, cocineros: int, registro) -> float:
+    """Pedidos por segundo, contando hasta que el registro quedó vacío."""
+    with registro:
+        with ServicioPedidos(num_cocineros=cocineros, registro=registro) as servicio:
+            inicio = time.perf_counter()
+            futuros = [servicio.enviar(pedido) for pedido in pedidos]
+            for futuro in futuros:
+                futuro.result()
+            registro.vaciar()
+            total = time.perf_counter() - inicio
+    return len(pedidos) / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de registro síncrono y asíncrono")
+    parser.add_argument("--pedidos", type=int, default=20_000)
+    parser.add_argument("--cocineros", type=int, default=4)
+    parser.add_argument("--salida", help="Archivo de log (por defecto, uno temporal)")
+    args = parser.parse_args()
+
+    creadores = (CreadorHamburguesas(), CreadorPizzas())
+    pedidos = [creadores[i % 2].crear_pedido(i) for i in range(args.pedidos)]
+    with tempfile.TemporaryDirectory() as directorio:
+        salida = args.salida or os.path.join(directorio, "pedidos.log")
+        variantes = [
+            ("Síncrono (lock + write)", lambda: RegistroSincrono(destino=salida)),
+            ("Asíncrono (hilo escritor)", lambda: RegistroAsincrono(destino=salida)),
+            ("Asíncrono, formato json", lambda: RegistroAsincrono(destino=salida, formato="json")),
+        ]
+        print(f"{'Registro':<28}{'Pedidos/s':>12}")
+        for nombre, crear_registro in variantes:
+            print(f"{nombre:<28}{medir(pedidos, args.cocineros, crear_registro()):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
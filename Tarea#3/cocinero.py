@@ -13,129 +13,298 @@ VENTAJAS DE ESTA ARQUITECTURA:
    por cada pedido
 
 SINCRONIZACIÓN:
-- Queue: Cola thread-safe de Python (usa locks internamente)
-- Lock: Para sincronizar salidas a consola y evitar texto entremezclado
+- ColaPedidos: Queue thread-safe de Python con espera interrumpible
+- Registro (registro.py): Recibe los eventos de log del cocinero; el
+  RegistroSincrono por defecto escribe con el lock de consola, el
+  RegistroAsincrono los encola para un hilo escritor
 - task_done(): Notifica cuando un pedido ha sido procesado completamente
+  (siempre, incluso si preparar() lanzó una excepción)
+- Future: Cada pedido llega envuelto en un TrabajoPedido; el cocinero publica
+  en su Future el resultado o la excepción de preparar()
+
+EJECUCIÓN DE preparar():
+- El cocinero delega la preparación en un EjecutorPedidos (ejecutores.py):
+  en su propio hilo, o en un pool de procesos para pedidos que usan CPU
+- Toma de la cola hasta tamano_lote pedidos por vez (por defecto
+  ejecutor.tamano_lote), esperando hasta espera_lote_ms a que el lote se
+  llene, y los entrega juntos; el log de inicio y fin de cada pedido mantiene
+  el orden de la cola
+
+LOTES:
+- El costo fijo por pedido (sacarlo de la cola, dos registros de log y
+  task_done()) se paga una vez por lote: un registro de inicio y uno de fin
+  con un evento por pedido, y un solo terminar_tareas()
+- preparar_lote() (ejecutores.py) agrupa los pedidos por get_tipo() y usa
+  el hook Pedido.preparar_lote() de la clase si lo redefine
+
+MÉTRICAS:
+- Cada trabajo se marca con inicio y fin de su propia preparación, según
+  los tiempos que informa el ejecutor (preparar_medido()); con
+  ServicioPedidos.metricas() activas, el lote se registra en Metricas
+  (metricas.py) con una sola toma de su lock
+- tiempo_ocupado acumula el tiempo preparando, para calcular la utilización
 
 MANEJO DE PARADA:
 - Señal None: Usado como "poison pill" para detener threads de forma limpia
+  después de terminar los pedidos encolados antes que ella (cierre ordenado)
+- detener(): Activa un threading.Event propio del cocinero y lo despierta;
+  deja de tomar pedidos de inmediato, aunque queden en la cola (cierre
+  inmediato). El pedido que se está preparando se termina igual
 - daemon=True: Asegura que los threads no bloqueen el cierre del programa
-- timeout en get(): Permite verificar periódicamente si debe detenerse
+- Sin timeout: El cocinero ocioso bloquea en la cola sin despertarse
+  periódicamente; solo lo despiertan un pedido nuevo o una orden de parada
 """
 
 import threading
 import time
-from queue import Empty, Queue
-from pedido import Pedido
+from typing import List, Optional
+from cola_pedidos import DETENIDO, ColaPedidos
+from ejecutores import EjecutorHilos, EjecutorPedidos
+from metricas import Metricas
+from registro import Registro, RegistroSincrono, crear_evento
+from trabajo_pedido import TrabajoPedido
 
 
 class Cocinero(threading.Thread):
     """
     Clase que representa un cocinero como un hilo de trabajo (worker thread).
     Cada cocinero es un hilo independiente que:
-    1. Consume pedidos de una cola compartida thread-safe
+    1. Consume trabajos (TrabajoPedido) de una cola compartida thread-safe
     2. Procesa cada pedido (simula preparación)
-    3. Registra el progreso de forma sincronizada
+    3. Publica el resultado en el Future del trabajo
+    4. Registra el progreso de forma sincronizada
     La clase hereda de threading.Thread para implementar el comportamiento
     de un worker en un pool de threads.
     Attributes:
         nombre (str): Identificador del cocinero para logging
-        cola_pedidos (Queue): Cola compartida thread-safe de pedidos
+        cola_pedidos (ColaPedidos): Cola compartida thread-safe de TrabajoPedido
         lock (threading.Lock): Lock para sincronizar salidas a consola
-        activo (bool): Flag para controlar el ciclo de vida del thread
-        pedidos_procesados (int): Contador de pedidos completados
+        registro (Registro): Destino de los eventos de log del cocinero
+        activo (bool): False desde que se llamó a detener()
+        ejecutor (EjecutorPedidos): Dónde se ejecuta pedido.preparar()
+        tamano_lote (int): Máximo de pedidos que toma de la cola por vez
+        espera_lote (float): Segundos que espera, como máximo, a llenar un lote
+        pedidos_procesados (int): Contador de pedidos completados sin error
+        tiempo_ocupado (float): Segundos dedicados a preparar lotes
+        arranque (float): Instante (time.monotonic()) en que empezó a trabajar
+        metricas (Metricas | None): Dónde se registran espera y servicio
+        ocioso_desde (float | None): Instante (time.monotonic()) desde el que
+            espera pedidos, o None mientras prepara un lote
     """
     
-    def __init__(self, nombre: str, cola_pedidos: Queue, lock: threading.Lock):
+    def __init__(self, nombre: str, cola_pedidos: ColaPedidos, lock: threading.Lock,
+                 ejecutor: Optional[EjecutorPedidos] = None,
+                 tamano_lote: Optional[int] = None, espera_lote_ms: float = 0,
+                 registro: Optional[Registro] = None, metricas: Optional[Metricas] = None):
         """
         Inicializa un cocinero (worker thread).
         Args:
             nombre: Identificador del cocinero (ej: "COCINERO 1")
             cola_pedidos: Cola thread-safe compartida de donde se obtienen los pedidos
             lock: Lock para sincronizar la salida en consola y evitar race conditions
+            ejecutor: Dónde se ejecuta preparar() (por defecto, en este hilo)
+            tamano_lote: Pedidos por lote (por defecto, el del ejecutor)
+            espera_lote_ms: Milisegundos que se espera a que el lote se llene;
+                0 toma solo lo que ya está en la cola
+            registro: Dónde se registran los eventos (por defecto, un
+                RegistroSincrono con ``lock``)
+            metricas: Dónde se registran los tiempos de cada pedido (None:
+                no se registran)
         """
         super().__init__()
         self.nombre = nombre
         self.cola_pedidos = cola_pedidos
         self.lock = lock
-        self.activo = True
+        self.registro = RegistroSincrono(lock) if registro is None else registro
+        self.ejecutor = EjecutorHilos() if ejecutor is None else ejecutor
+        self.tamano_lote = self.ejecutor.tamano_lote if tamano_lote is None else tamano_lote
+        self.espera_lote = espera_lote_ms / 1000
+        # Event en lugar de un bool: la cola lo revisa con su propio lock
+        # antes de dormir, así que una parada nunca se pierde
+        self._detenido = threading.Event()
         self.pedidos_procesados = 0
+        self.metricas = metricas
+        self.tiempo_ocupado = 0.0
+        self.arranque = time.monotonic()
+        # Lo lee el ControladorEscalado (autoescalado.py) para elegir a quién
+        # retirar; asignar un float es atómico, no hace falta lock
+        self.ocioso_desde: Optional[float] = time.monotonic()
         # daemon=True: El hilo se cerrará automáticamente cuando el programa
         # principal termine, evitando que threads huérfanos bloqueen el cierre
         self.daemon = True
+
+    @property
+    def activo(self) -> bool:
+        return not self._detenido.is_set()
     
     def run(self):
         """
         Método principal del hilo que procesa pedidos continuamente.
         Este método se ejecuta en un hilo separado cuando se llama a start().
         Implementa el patrón Consumer, consumiendo pedidos de la cola hasta
-        recibir una señal de parada (None).
+        recibir una señal de parada (None) o hasta que se llame a detener().
         SINCRONIZACIÓN:
-        - get(timeout=1): Timeout para evitar bloqueo indefinido y permitir
-          verificaciones periódicas del estado
+        - obtener_varios(): Bloquea sin timeout hasta que llegue un pedido o
+          se active el evento de parada de este cocinero
         - task_done(): Notifica a la cola que el pedido ha sido procesado,
           necesario para join() en ServicioPedidos
         """
-        while self.activo:
+        while True:
+            self.ocioso_desde = time.monotonic()
+            lote = self.cola_pedidos.obtener_varios(self._detenido, self.tamano_lote,
+                                                    espera=self.espera_lote)
+            self.ocioso_desde = None
+            if lote is DETENIDO:
+                # Parada inmediata: no se sacó nada de la cola, no hay task_done()
+                break
+            if not self._atender(lote):
+                break
+
+    def atender_pendientes(self):
+        """
+        Procesa en el hilo que llama todo lo que haya en la cola, sin esperar.
+        Lo usa ServicioPedidos con el ejecutor "en_linea", donde no se
+        arrancan hilos de cocineros.
+        """
+        while True:
+            lote = self.cola_pedidos.obtener_varios(self._detenido, self.tamano_lote, bloquear=False)
+            if lote is DETENIDO or not lote or not self._atender(lote):
+                break
+
+    def _atender(self, lote: list) -> bool:
+        """
+        Procesa un lote sacado de la cola y da por terminado cada elemento.
+        Returns:
+            bool: False si el lote era una poison pill (el cocinero debe terminar)
+        """
+        try:
+            # None es la "poison pill" - señal para terminar el hilo
+            if lote[0] is None:
+                return False
+            self._procesar_trabajos(lote)
+            return True
+        finally:
+            # Notificar a la cola que cada elemento ha sido procesado, incluso
+            # si falló: sin esto queue.join() en ServicioPedidos no
+            # terminaría nunca después de un error. Un solo paso por el lock
+            # de la cola para todo el lote (equivale a un task_done() por elemento)
+            self.cola_pedidos.terminar_tareas(len(lote))
+
+    def _procesar_trabajos(self, trabajos: List[TrabajoPedido]):
+        """
+        Prepara los pedidos de un lote de trabajos y publica cada resultado.
+        Etapas:
+        1. Descartar los trabajos cuyo Future canceló el cliente
+        2. Log de inicio de preparación de cada pedido (sincronizado)
+        3. Preparar el lote en el ejecutor
+        4. Log de finalización de cada pedido, en el mismo orden (sincronizado)
+        5. Publicar cada resultado o excepción en su Future
+        Args:
+            trabajos: Los trabajos obtenidos de la cola, en orden
+        DECISIÓN: Los eventos de un lote se registran juntos, así las líneas
+        de un cocinero no se entremezclan con las de otro; cómo se escriben
+        (lock de consola o hilo escritor) lo decide el Registro.
+        MANEJO DE ERRORES: Una excepción de preparar() se registra en consola
+        y se entrega al cliente a través del Future; el resto del lote y el
+        cocinero siguen adelante. Lo mismo con una excepción fuera de
+        preparar() (get_tipo() del pedido, el registro o las métricas): se
+        entrega en los Futures que sigan pendientes y el cocinero sigue vivo.
+        Sin esto el hilo moría con esos Futures en RUNNING para siempre.
+        """
+        trabajos = [trabajo for trabajo in trabajos if trabajo.futuro.set_running_or_notify_cancel()]
+        if not trabajos:
+            return
+        try:
+            self._preparar_trabajos(trabajos)
+        except Exception as e:
+            # Solo este hilo resuelve estos Futures (ya están en RUNNING, no
+            # se pueden cancelar), así que done() no cambia entre medio
+            for trabajo in trabajos:
+                if not trabajo.futuro.done():
+                    trabajo.futuro.set_exception(e)
+            try:
+                self.registro.registrar(crear_evento(self.nombre, "error", detalle=str(e)))
+            except Exception:
+                # El registro puede ser justamente lo que falló
+                pass
+
+    def _preparar_trabajos(self, trabajos: List[TrabajoPedido]):
+        """Etapas 2 a 5 de _procesar_trabajos(), con los Futures ya en RUNNING."""
+        # get_tipo() una vez por pedido: si falla, solo ese pedido falla
+        tipos = []
+        preparables = []
+        fallidos = []
+        for trabajo in trabajos:
             try:
-                # Intentar obtener un pedido con timeout de 1 segundo
-                # Esto evita bloqueo indefinido y permite verificar self.activo
-                pedido = self.cola_pedidos.get(timeout=1)
-                
-                # None es la "poison pill" - señal para terminar el hilo
-                if pedido is None:
-                    self.cola_pedidos.task_done()
-                    break
-                
-                # Procesar el pedido
-                self._procesar_pedido(pedido)
-                
-                # Notificar a la cola que el pedido ha sido procesado
-                # Esto es crucial para queue.join() en ServicioPedidos
-                self.cola_pedidos.task_done()
-                
-            except Empty:
-                # Timeout alcanzado sin obtener pedido - la cola está vacía
-                # Continuar esperando por más pedidos
-                continue
+                tipos.append(trabajo.pedido.get_tipo())
+                preparables.append(trabajo)
             except Exception as e:
-                # Manejo de errores inesperados
-                with self.lock:
-                    print(f"[{self.nombre}] Error procesando pedido: {e}")
-                continue
+                fallidos.append((trabajo, e))
+        if fallidos:
+            self.registro.registrar_varios(
+                crear_evento(self.nombre, "error", trabajo.pedido.numero_pedido, detalle=str(e))
+                for trabajo, e in fallidos)
+            for trabajo, e in fallidos:
+                trabajo.futuro.set_exception(e)
+        trabajos = preparables
+        if not trabajos:
+            return
+
+        # Log de inicio de preparación: todo el lote en un solo registro
+        self.registro.registrar_varios(
+            crear_evento(self.nombre, "preparando", trabajo.pedido.numero_pedido, tipo)
+            for trabajo, tipo in zip(trabajos, tipos))
+
+        inicio = time.monotonic()
+        try:
+            resultados, tiempos = self.ejecutor.preparar_medido([trabajo.pedido for trabajo in trabajos])
+        except Exception as e:
+            # Falla del ejecutor (por ejemplo, un proceso del pool murió)
+            resultados, tiempos = [(False, e)] * len(trabajos), None
+        fin = time.monotonic()
+        self.tiempo_ocupado += fin - inicio
+        if tiempos is None:
+            # Sin tiempos por pedido: el lote entero, repartido en partes iguales
+            parte = (fin - inicio) / len(trabajos)
+            tiempos = [(i * parte, parte) for i in range(len(trabajos))]
+
+        # Cada pedido espera hasta que empieza su propia preparación, no la del lote
+        for trabajo, (desplazamiento, duracion) in zip(trabajos, tiempos):
+            trabajo.inicio = inicio + desplazamiento
+            trabajo.fin = trabajo.inicio + duracion
+        self.pedidos_procesados += sum(1 for exito, _ in resultados if exito)
+        if self.metricas is not None:
+            self.metricas.registrar((tipo, trabajo.inicio - trabajo.llegada, trabajo.fin - trabajo.inicio)
+                                    for trabajo, tipo in zip(trabajos, tipos))
+
+        # Log de resultados: todo el lote en un solo registro
+        self.registro.registrar_varios(
+            crear_evento(self.nombre, "listo" if exito else "error", trabajo.pedido.numero_pedido,
+                         tipo, str(valor))
+            for trabajo, tipo, (exito, valor) in zip(trabajos, tipos, resultados))
+
+        # Los Futures se resuelven después del log: sus callbacks son del cliente
+        for trabajo, (exito, valor) in zip(trabajos, resultados):
+            if exito:
+                trabajo.futuro.set_result(valor)
+            else:
+                trabajo.futuro.set_exception(valor)
     
-    def _procesar_pedido(self, pedido: Pedido):
+    def utilizacion(self) -> float:
         """
-        Procesa un pedido individual de forma sincronizada.
-        Este método simula la preparación de un pedido con las siguientes etapas:
-        1. Cambiar estado del pedido a "en_preparacion"
-        2. Log de inicio de preparación (sincronizado)
-        3. Simular tiempo de preparación (sleep)
-        4. Preparar el pedido (llamar al método del pedido)
-        5. Cambiar estado a "completado"
-        6. Log de finalización (sincronizado)
-        Args:
-            pedido: El pedido a procesar
-        DECISIÓN: Usar lock para las salidas a consola previene que múltiples
-        threads escriban simultáneamente, lo que causaría texto entremezclado
-        e ilegible. El lock asegura salidas atómicas.
-        """        
-        # SECCIÓN CRÍTICA: Imprimir inicio de preparación
-        # El lock asegura que solo un thread escriba a la vez
-        with self.lock:
-            print(f"[{self.nombre}] Preparando pedido {pedido.numero_pedido} ({pedido.get_tipo()})")
-        
-        # Preparar el pedido (obtener resultado)
-        resultado = pedido.preparar()
-        
-        # SECCIÓN CRÍTICA: Imprimir resultado
-        with self.lock:
-            print(f"[{self.nombre}] Pedido {pedido.numero_pedido} listo: {resultado}")
-    
+        Fracción del tiempo desde el arranque que el cocinero pasó preparando.
+        Returns:
+            float: Entre 0.0 y 1.0
+        """
+        transcurrido = time.monotonic() - self.arranque
+        return min(1.0, self.tiempo_ocupado / transcurrido) if transcurrido > 0 else 0.0
+
     def detener(self):
         """
-        Marca el cocinero para que deje de procesar pedidos.
-        Este método cambia el flag 'activo' a False, lo que causará que
-        el hilo termine su ejecución en la próxima iteración del loop.
+        Detiene el cocinero sin esperar a que se vacíe la cola.
+        Activa el evento de parada y despierta a los cocineros que esperan en
+        la cola: si este estaba ocioso termina enseguida; si estaba preparando
+        un pedido, termina al completarlo sin tomar otro.
         """
-        self.activo = False
+        self._detenido.set()
+        self.cola_pedidos.despertar()
@@ -0,0 +1,264 @@
+"""
+Módulo que implementa la cola de pedidos con espera sin sondeo.
+
+ColaPedidos extiende queue.Queue (igual que PriorityQueue o LifoQueue, a
+través de los métodos _qsize/_get) con una operación obtener() que bloquea
+hasta que haya un pedido O hasta que el cocinero que espera reciba la orden
+de detenerse. Así un cocinero ocioso duerme sin despertarse periódicamente y
+reacciona a detener() de inmediato.
+
+SINCRONIZACIÓN:
+- not_empty (Condition de Queue): obtener() espera en ella; put() la notifica
+  al llegar un pedido y despertar() la notifica al pedir una parada
+- threading.Event por cocinero: indica que ESE cocinero debe detenerse; se
+  revisa con el mutex de la cola tomado, por lo que no hay señales perdidas
+  entre la revisión y el wait()
+
+CAPACIDAD (maxsize, como en queue.Queue): agregar() decide qué pasa cuando
+la cola está llena según una política de desbordamiento:
+- "bloquear": espera lugar (con timeout opcional) y lanza queue.Full al vencer
+- "rechazar": lanza queue.Full de inmediato
+- "descartar_antiguo": saca el pedido más antiguo para hacerle lugar
+- "descartar_menor_prioridad": saca el de menor prioridad (el más reciente
+  entre iguales); si el nuevo no es más urgente que ninguno, lo descarta a él
+Las poison pills (None) nunca se descartan, y encolar_paradas() las agrega
+sin respetar maxsize: cerrar el servicio nunca espera lugar en la cola.
+
+POR QUÉ NO timeout EN get():
+- Con get(timeout=1) cada cocinero ocioso se despierta una vez por segundo
+  solo para revisar un flag: con muchos cocineros es CPU desperdiciada
+- detener() podía tardar hasta un segundo en surtir efecto
+"""
+
+import threading
+import time
+from queue import Full, Queue
+
+# Valor que devuelve obtener() cuando el cocinero debe detenerse. Es distinto
+# de None (la poison pill): no sale de la cola y no lleva task_done()
+DETENIDO = object()
+
+DESBORDAMIENTOS = ("bloquear", "rechazar", "descartar_antiguo", "descartar_menor_prioridad")
+
+
+class ColaPedidos(Queue):
+    """
+    Cola FIFO thread-safe de pedidos con espera interrumpible.
+    Es una queue.Queue completa (put, get, join, task_done siguen igual) con
+    operaciones extra para el ciclo de vida del pool de cocineros y para
+    agregar con una política de desbordamiento.
+    """
+
+    def agregar(self, elemento, desbordamiento: str = "bloquear", timeout=None):
+        """
+        Agrega un elemento respetando la capacidad según la política dada.
+        Args:
+            elemento: TrabajoPedido a encolar
+            desbordamiento: Una de DESBORDAMIENTOS
+            timeout: Segundos de espera máxima con "bloquear" (None: sin límite)
+        Returns:
+            El elemento descartado para hacer lugar (puede ser el propio
+            ``elemento``), o None si no se descartó nada
+        Raises:
+            queue.Full: Con "bloquear" al vencer el timeout, o con "rechazar"
+        SINCRONIZACIÓN: Elegir la víctima, sacarla y encolar el nuevo ocurre
+        con el mutex tomado: ningún otro productor ve la cola a medias.
+        """
+        if desbordamiento == "bloquear":
+            self.put(elemento, timeout=timeout)
+            return None
+        if desbordamiento == "rechazar":
+            self.put(elemento, block=False)
+            return None
+        with self.not_full:
+            victima = None
+            if 0 < self.maxsize <= self._qsize():
+                posicion = self._elegir_victima(elemento, desbordamiento)
+                if posicion is None:
+                    return elemento
+                victima = self._quitar_en(posicion)
+                # La víctima se da por terminada; el nuevo elemento ocupa su lugar
+                self.unfinished_tasks -= 1
+            self._put(elemento)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+            return victima
+
+    def encolar_paradas(self, cantidad: int):
+        """
+        Encola ``cantidad`` poison pills (None) sin respetar maxsize.
+        Con una cola acotada y llena, put(None) bloquearía a quien cierra el
+        servicio hasta que los cocineros hagan lugar, o para siempre si
+        ninguno lo hace. Las pills no ocupan lugar de pedidos: el exceso
+        sobre maxsize dura hasta que los cocineros las toman.
+        """
+        if cantidad <= 0:
+            return
+        with self.mutex:
+            for _ in range(cantidad):
+                self._put(None)
+            self.unfinished_tasks += cantidad
+            self.not_empty.notify(cantidad)
+
+    def _elegir_victima(self, elemento, desbordamiento: str):
+        """
+        Posición del elemento a descartar, o None para descartar el nuevo.
+        Se llama con el mutex tomado y la cola llena.
+        """
+        candidatos = [(posicion, actual) for posicion, actual in self._en_orden_de_llegada()
+                      if actual is not None]
+        if not candidatos:
+            return None
+        if desbordamiento == "descartar_antiguo":
+            return candidatos[0][0]
+        # max() devuelve el primero de los empatados: recorriendo desde el
+        # final, entre iguales se elige el más reciente
+        posicion, victima = max(reversed(candidatos), key=lambda candidato: candidato[1].prioridad)
+        if elemento.prioridad >= victima.prioridad:
+            return None
+        return posicion
+
+    def _en_orden_de_llegada(self):
+        """Pares (posición, elemento) en orden de llegada (cola FIFO: el deque)."""
+        return enumerate(self.queue)
+
+    def _quitar_en(self, posicion: int):
+        """Saca el elemento en ``posicion`` (una de _en_orden_de_llegada())."""
+        elemento = self.queue[posicion]
+        del self.queue[posicion]
+        return elemento
+
+    def obtener(self, detenido: threading.Event):
+        """
+        Saca el próximo elemento bloqueando sin timeout.
+        Args:
+            detenido: Evento del cocinero que espera; si se activa, la espera
+                termina aunque la cola tenga elementos
+        Returns:
+            El elemento obtenido, o DETENIDO si el evento se activó
+        SINCRONIZACIÓN: El evento se revisa con not_empty tomado y despertar()
+        notifica con el mismo lock, así que una parada pedida justo antes del
+        wait() no se pierde.
+        """
+        with self.not_empty:
+            while True:
+                if detenido.is_set():
+                    return DETENIDO
+                if self._qsize():
+                    break
+                self.not_empty.wait()
+            elemento = self._get()
+            self.not_full.notify()
+            return elemento
+
+    def obtener_varios(self, detenido: threading.Event, maximo: int, bloquear: bool = True,
+                       espera: float = 0):
+        """
+        Saca hasta ``maximo`` elementos de una vez (un lote).
+        Espera como obtener() por el primero; después completa el lote con los
+        elementos que ya están en la cola y, si ``espera`` es mayor que cero,
+        con los que lleguen durante ese tiempo. Una poison pill (None) nunca
+        se mezcla con pedidos: si es la primera se devuelve sola, y si aparece
+        después el lote se corta antes de ella y queda en la cola.
+        Args:
+            detenido: Evento de parada del cocinero que espera
+            maximo: Tamaño máximo del lote
+            bloquear: Si es False y la cola está vacía, devuelve [] sin esperar
+            espera: Segundos que se espera, como máximo, a que el lote se llene
+        Returns:
+            list: Los elementos obtenidos, o DETENIDO si el evento se activó
+            antes del primero
+        SINCRONIZACIÓN: La espera del lote es el único wait() con timeout y
+        está acotada; si el cocinero se detiene durante ella, el lote ya
+        obtenido se devuelve igual para no perder esos pedidos.
+        """
+        with self.not_empty:
+            while True:
+                if detenido.is_set():
+                    return DETENIDO
+                if self._qsize():
+                    break
+                if not bloquear:
+                    return []
+                self.not_empty.wait()
+            lote = [self._get()]
+            limite = time.monotonic() + espera
+            while lote[0] is not None and len(lote) < maximo:
+                if not self._qsize():
+                    restante = limite - time.monotonic()
+                    if restante <= 0 or detenido.is_set():
+                        break
+                    self.not_empty.wait(restante)
+                    continue
+                elemento = self._get()
+                if elemento is None:
+                    # Se devuelve la pill al frente para el próximo que la tome
+                    self._devolver_al_frente(elemento)
+                    break
+                lote.append(elemento)
+            self.not_full.notify(len(lote))
+            return lote
+
+    def _devolver_al_frente(self, elemento):
+        """Vuelve a poner al frente un elemento recién sacado (cola FIFO: deque)."""
+        self.queue.appendleft(elemento)
+
+    def terminar_tareas(self, cantidad: int):
+        """
+        Equivale a llamar task_done() ``cantidad`` veces tomando el lock una sola vez.
+        Raises:
+            ValueError: Si se terminan más tareas de las pendientes
+        """
+        with self.all_tasks_done:
+            pendientes = self.unfinished_tasks - cantidad
+            if pendientes < 0:
+                raise ValueError('task_done() called too many times')
+            self.unfinished_tasks = pendientes
+            if not pendientes:
+                self.all_tasks_done.notify_all()
+
+    def despertar(self):
+        """
+        Despierta a todos los cocineros que esperan en obtener() para que
+        revisen su evento de parada. Los que no deben detenerse vuelven a esperar.
+        """
+        with self.not_empty:
+            self.not_empty.notify_all()
+
+    def antiguedad(self) -> float:
+        """
+        Segundos que lleva esperando el pedido más antiguo de la cola.
+        Returns:
+            float: 0.0 si no hay pedidos esperando
+        """
+        with self.mutex:
+            for _, elemento in self._en_orden_de_llegada():
+                if elemento is not None:
+                    return time.monotonic() - elemento.llegada
+            return 0.0
+
+    def estadisticas(self) -> dict:
+        """
+        Returns:
+            dict: {"pendientes"}: elementos en la cola (profundidad actual)
+        """
+        return {"pendientes": self.qsize()}
+
+    def vaciar(self) -> list:
+        """
+        Saca todos los elementos pendientes de una vez, sin prepararlos.
+        Los elementos retirados se dan por terminados (como si se hubiera
+        llamado a task_done() por cada uno), así que join() no los espera.
+        Returns:
+            list: Los elementos que había en la cola, en orden de salida
+        """
+        with self.mutex:
+            elementos = []
+            while self._qsize():
+                elementos.append(self._get())
+            if elementos:
+                self.unfinished_tasks -= len(elementos)
+                if not self.unfinished_tasks:
+                    self.all_tasks_done.notify_all()
+                self.not_full.notify_all()
+            return elementos
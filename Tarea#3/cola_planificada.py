@@ -0,0 +1,195 @@
+"""
+Módulo que implementa una cola de pedidos con planificación por prioridad y plazos.
+
+ColaPlanificada reemplaza el orden FIFO de ColaPedidos por un heap (igual que
+queue.PriorityQueue, a través de _init/_put/_get/_qsize), de modo que un
+burst de pedidos lentos no retrase a todos los pedidos rápidos que llegan
+detrás. Conserva obtener(), obtener_varios(), despertar() y vaciar().
+
+POLÍTICAS (se eligen al construir la cola):
+- "fifo": orden de llegada (como ColaPedidos, más la prioridad)
+- "sjf" (shortest job first): primero el pedido de menor costo estimado,
+  según su get_tipo() en el diccionario de costos
+- "edf" (earliest deadline first): primero el pedido con el plazo más
+  próximo; los que no tienen plazo reciben llegada + plazo_por_defecto
+
+PRIORIDAD: Cada trabajo tiene una prioridad entera (0 por defecto, menor es
+más urgente). Cada nivel equivale a peso_prioridad segundos de espera.
+
+PROTECCIÓN CONTRA INANICIÓN (aging):
+- Con "sjf", un pedido caro podría esperar para siempre si siguen llegando
+  pedidos baratos. La clave es costo + envejecimiento * llegada: ordenar por
+  ella es lo mismo que ordenar por costo - envejecimiento * espera en
+  cualquier instante, así que la clave no cambia mientras el pedido espera
+  y el heap sigue siendo válido
+- Lo mismo vale para la prioridad: un pedido de prioridad baja termina
+  adelantando a los nuevos de prioridad alta
+- Con "edf" el plazo por defecto cumple ese rol para los pedidos sin plazo
+
+PLAZOS: Al completarse el Future de un trabajo con plazo se cuenta como
+cumplido o incumplido; los cancelados, descartados o fallidos no cuentan
+(ver estadisticas()).
+
+SINCRONIZACIÓN:
+- _put/_get corren con el mutex de la Queue tomado (lo hace Queue); la
+  clave de cada trabajo se calcula antes, en put()/agregar(), porque puede
+  llamar a get_tipo() del pedido
+- Los contadores de plazos se actualizan desde los hilos de los cocineros
+  (callbacks de los Futures) con un Lock propio
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Dict, Optional
+from cola_pedidos import ColaPedidos
+
+POLITICAS = ("fifo", "sjf", "edf")
+# Costo estimado (segundos) de un tipo de pedido que no está en el diccionario
+COSTO_POR_DEFECTO = 0.001
+
+
+class ColaPlanificada(ColaPedidos):
+    """
+    Cola de pedidos ordenada por prioridad, costo estimado o plazo.
+    Los elementos son TrabajoPedido (usa sus atributos prioridad y limite) o
+    la poison pill None, que siempre sale después de todos los pedidos.
+    Attributes:
+        politica (str): "fifo", "sjf" o "edf"
+        costos (Dict[str, float]): Costo estimado en segundos por get_tipo()
+        envejecimiento (float): Segundos de costo que compensa cada segundo
+            de espera (0 desactiva la protección contra inanición)
+        peso_prioridad (float): Segundos que equivale un nivel de prioridad
+        plazo_por_defecto (float): Plazo en segundos de los pedidos sin plazo
+            con la política "edf"
+    """
+
+    def __init__(self, politica: str = "fifo", costos: Optional[Dict[str, float]] = None,
+                 envejecimiento: float = 1.0, peso_prioridad: float = 1.0,
+                 plazo_por_defecto: float = 1.0, maxsize: int = 0):
+        """
+        Args:
+            politica: "fifo", "sjf" o "edf"
+            costos: Costo estimado en segundos de cada tipo de pedido
+            envejecimiento: Peso de la espera frente al costo (política "sjf")
+            peso_prioridad: Segundos de espera que equivale un nivel de prioridad
+            plazo_por_defecto: Plazo de los pedidos sin plazo (política "edf")
+            maxsize: Como en queue.Queue
+        Raises:
+            ValueError: Si la política no existe
+        """
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconocida: {politica!r} (opciones: {', '.join(POLITICAS)})")
+        self.politica = politica
+        self.costos = dict(costos or {})
+        self.envejecimiento = envejecimiento
+        self.peso_prioridad = peso_prioridad
+        self.plazo_por_defecto = plazo_por_defecto
+        self._secuencia = itertools.count()
+        self._lock_plazos = threading.Lock()
+        self._cumplidos = 0
+        self._incumplidos = 0
+        super().__init__(maxsize)
+
+    # Los cuatro métodos que queue.Queue usa para guardar los elementos
+
+    def _init(self, maxsize):
+        self.queue = []
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, trabajo):
+        if trabajo is not None and trabajo.limite is not None:
+            trabajo.futuro.add_done_callback(
+                lambda futuro, limite=trabajo.limite: self._registrar_plazo(futuro, limite))
+        self._apilar(trabajo)
+
+    def _get(self):
+        return heapq.heappop(self.queue)[2]
+
+    def _apilar(self, trabajo):
+        # La clave ya viene calculada (ver _asignar_clave)
+        clave = math.inf if trabajo is None else trabajo.clave
+        heapq.heappush(self.queue, (clave, next(self._secuencia), trabajo))
+
+    def _devolver_al_frente(self, elemento):
+        """En un heap "al frente" es volver a su lugar según su clave."""
+        # Sin _put(): el callback de plazo ya se registró al encolarlo
+        self._apilar(elemento)
+
+    def put(self, elemento, block=True, timeout=None):
+        self._asignar_clave(elemento)
+        super().put(elemento, block, timeout)
+
+    def agregar(self, elemento, desbordamiento: str = "bloquear", timeout=None):
+        self._asignar_clave(elemento)
+        return super().agregar(elemento, desbordamiento, timeout)
+
+    def _asignar_clave(self, trabajo):
+        """
+        Calcula la clave del trabajo ANTES de tomar el mutex de la cola.
+        SINCRONIZACIÓN: _clave() llama a pedido.get_tipo(), que es código
+        del usuario: si se ejecutara dentro de _put(), un get_tipo() lento
+        frenaría a todos los productores y cocineros que esperan el mutex.
+        MANEJO DE ERRORES: Si get_tipo() falla, la excepción sale de put() o
+        agregar() sin haber tocado la cola.
+        """
+        if trabajo is not None and trabajo.clave is None:
+            trabajo.clave = self._clave(trabajo)
+
+    def _en_orden_de_llegada(self):
+        # El número de secuencia de cada entrada es su orden de llegada
+        orden = sorted(range(len(self.queue)), key=lambda posicion: self.queue[posicion][1])
+        return [(posicion, self.queue[posicion][2]) for posicion in orden]
+
+    def _quitar_en(self, posicion: int):
+        elemento = self.queue[posicion][2]
+        self.queue[posicion] = self.queue[-1]
+        self.queue.pop()
+        heapq.heapify(self.queue)
+        return elemento
+
+    def _clave(self, trabajo) -> float:
+        """
+        Clave de orden del trabajo (menor sale primero), fija desde que entra.
+        Returns:
+            float: Segundos (en la escala de time.monotonic()) según la política
+        """
+        llegada = trabajo.llegada
+        if self.politica == "sjf":
+            costo = self.costos.get(trabajo.pedido.get_tipo(), COSTO_POR_DEFECTO)
+            clave = costo + self.envejecimiento * llegada
+        elif self.politica == "edf":
+            clave = trabajo.limite if trabajo.limite is not None else llegada + self.plazo_por_defecto
+        else:
+            clave = llegada
+        return clave + trabajo.prioridad * self.peso_prioridad
+
+    def _registrar_plazo(self, futuro, limite: float):
+        # Solo cuentan los pedidos preparados: uno cancelado, descartado
+        # (PedidoDescartado) o cuyo preparar() falló no cumplió ni incumplió
+        if futuro.cancelled() or futuro.exception() is not None:
+            return
+        cumplido = time.monotonic() <= limite
+        with self._lock_plazos:
+            if cumplido:
+                self._cumplidos += 1
+            else:
+                self._incumplidos += 1
+
+    def estadisticas(self) -> dict:
+        """
+        Plazos cumplidos e incumplidos de los pedidos preparados sin error.
+        Returns:
+            dict: {"pendientes", "plazos_cumplidos", "plazos_incumplidos"}
+        """
+        # super() (qsize()) fuera de _lock_plazos: _put() toma los locks en
+        # el otro orden
+        estadisticas = super().estadisticas()
+        with self._lock_plazos:
+            estadisticas["plazos_cumplidos"] = self._cumplidos
+            estadisticas["plazos_incumplidos"] = self._incumplidos
+        return estadisticas
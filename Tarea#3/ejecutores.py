@@ -0,0 +1,288 @@
+"""
+Módulo que define dónde se ejecuta pedido.preparar().
+
+Se implementa el patrón Strategy: ServicioPedidos y Cocinero se encargan de
+la cola, los Futures y el logging, y delegan la preparación en un
+EjecutorPedidos elegido al construir el servicio:
+
+- EjecutorHilos ("hilos"): preparar() corre en el hilo del cocinero. Es el
+  comportamiento original; ideal cuando preparar() espera I/O
+- EjecutorProcesos ("procesos"): preparar() corre en un ProcessPoolExecutor,
+  fuera del GIL; los cocineros siguen siendo hilos que alimentan el pool
+- EjecutorEnLinea ("en_linea"): sin hilos de cocineros; los pedidos se
+  preparan en el hilo que llama a enviar() o procesar_pedidos(). Útil para
+  depurar y para pruebas deterministas
+
+ENVÍO EFICIENTE A PROCESOS:
+- Un pedido cuyo único estado es numero_pedido (como PedidoHamburguesa y
+  PedidoPizza) viaja como (módulo, nombre de clase, número) y el proceso lo
+  reconstruye; los demás se serializan completos con pickle
+- Cada viaje al pool lleva un lote de hasta tamano_lote pedidos: un solo
+  round trip de IPC para varios pedidos
+- Una excepción de preparar() vuelve como resultado del lote y se entrega en
+  el Future del pedido correspondiente, sin afectar a los demás del lote
+
+TIEMPOS POR PEDIDO:
+- preparar_medido() devuelve, junto con los resultados, cuándo empezó y
+  cuánto duró la preparación de cada pedido dentro del lote; el cocinero lo
+  usa para las métricas de espera y servicio (metricas.py)
+- preparar_lote() mide cada preparar() por separado, también dentro del
+  proceso trabajador. Un grupo preparado con el hook Pedido.preparar_lote()
+  solo se puede medir entero: su duración se reparte en partes iguales
+"""
+
+import importlib
+import inspect
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from pedido import Pedido
+
+# (True, resultado) si preparar() terminó bien, (False, excepción) si falló
+Resultado = Tuple[bool, object]
+# (desplazamiento, duración) de la preparación de un pedido, en segundos desde
+# que empezó el lote
+Tiempo = Tuple[float, float]
+
+
+def preparar_lote(pedidos: List[Pedido], tiempos: Optional[List[Tiempo]] = None) -> List[Resultado]:
+    """
+    Prepara un lote agrupando los pedidos por get_tipo() (y clase).
+    Si la clase redefine el hook Pedido.preparar_lote(), el grupo entero se
+    prepara con una sola llamada; si no, cada pedido con su preparar(). Un
+    lote de un solo pedido usa siempre preparar().
+    Args:
+        pedidos: Pedidos a preparar
+        tiempos: Si se pasa una lista, se le agrega el Tiempo de cada pedido,
+            en el mismo orden que los pedidos
+    Returns:
+        List[Resultado]: Un resultado por pedido, en el mismo orden
+    MANEJO DE ERRORES: Con preparar() cada pedido recibe su propia excepción,
+    igual que un pedido cuyo get_tipo() falla. Si el hook falla (o no
+    devuelve un resultado por pedido), la excepción se entrega a todos los
+    pedidos de ese grupo.
+    """
+    comienzo = time.monotonic()
+    if len(pedidos) == 1:
+        resultado, tiempo = _preparar_uno(pedidos[0], comienzo)
+        if tiempos is not None:
+            tiempos.append(tiempo)
+        return [resultado]
+    grupos = {}
+    resultados: List[Resultado] = [None] * len(pedidos)
+    medidos: List[Tiempo] = [(0.0, 0.0)] * len(pedidos)
+    for posicion, pedido in enumerate(pedidos):
+        try:
+            clave = (pedido.get_tipo(), type(pedido))
+        except Exception as e:
+            # Sin tipo no hay grupo: falla solo este pedido
+            resultados[posicion] = (False, e)
+            continue
+        grupos.setdefault(clave, []).append(posicion)
+    for (_, clase), posiciones in grupos.items():
+        grupo = [pedidos[posicion] for posicion in posiciones]
+        inicio = time.monotonic()
+        try:
+            if not _redefine_hook(clase):
+                parciales = [_preparar_uno(pedido, comienzo) for pedido in grupo]
+            else:
+                valores = list(clase.preparar_lote(grupo))
+                if len(valores) != len(grupo):
+                    raise ValueError(f"{clase.__name__}.preparar_lote() devolvió {len(valores)} "
+                                     f"resultados para {len(grupo)} pedidos")
+                parciales = _repartir([(True, valor) for valor in valores], inicio, comienzo)
+        except Exception as e:
+            # Solo falla este grupo; los demás pedidos del lote siguen adelante
+            parciales = _repartir([(False, e)] * len(grupo), inicio, comienzo)
+        for posicion, (resultado, tiempo) in zip(posiciones, parciales):
+            resultados[posicion] = resultado
+            medidos[posicion] = tiempo
+    if tiempos is not None:
+        tiempos.extend(medidos)
+    return resultados
+
+
+def _redefine_hook(clase: type) -> bool:
+    """Si la clase redefine Pedido.preparar_lote(), como classmethod, staticmethod o método."""
+    # getattr_static devuelve el descriptor sin enlazarlo: se compara con el
+    # classmethod de Pedido aunque la subclase lo redefina de otra forma
+    return inspect.getattr_static(clase, "preparar_lote") is not Pedido.__dict__["preparar_lote"]
+
+
+def _repartir(resultados: List[Resultado], inicio: float, comienzo: float) -> List[Tuple[Resultado, Tiempo]]:
+    """Tiempos de un grupo preparado con el hook desde ``inicio``, que solo se mide entero."""
+    # Cada pedido se lleva una parte igual de la duración, uno detrás de otro
+    parte = (time.monotonic() - inicio) / len(resultados)
+    desde = inicio - comienzo
+    return [(resultado, (desde + i * parte, parte)) for i, resultado in enumerate(resultados)]
+
+
+def _preparar_uno(pedido: Pedido, comienzo: float) -> Tuple[Resultado, Tiempo]:
+    """Prepara un pedido y mide su preparación desde ``comienzo`` (el inicio del lote)."""
+    inicio = time.monotonic()
+    try:
+        resultado = (True, pedido.preparar())
+    except Exception as e:
+        resultado = (False, e)
+    return resultado, (inicio - comienzo, time.monotonic() - inicio)
+
+
+def _describir(pedido: Pedido):
+    """Descripción compacta del pedido si alcanza con su tipo y número; si no, el pedido."""
+    estado = getattr(pedido, "__dict__", None)
+    if estado is not None and estado.keys() == {"numero_pedido"}:
+        clase = type(pedido)
+        return (clase.__module__, clase.__qualname__, pedido.numero_pedido)
+    return pedido
+
+
+def _reconstruir(descripcion) -> Pedido:
+    if isinstance(descripcion, Pedido):
+        return descripcion
+    modulo, nombre, numero = descripcion
+    clase = importlib.import_module(modulo)
+    for parte in nombre.split("."):
+        clase = getattr(clase, parte)
+    return clase(numero)
+
+
+def _preparar_en_proceso(descripciones: list) -> Tuple[List[Resultado], List[Tiempo]]:
+    """Punto de entrada en el proceso trabajador: reconstruye, prepara y mide el lote."""
+    tiempos: List[Tiempo] = []
+    resultados = preparar_lote([_reconstruir(descripcion) for descripcion in descripciones], tiempos)
+    for posicion, (exito, valor) in enumerate(resultados):
+        if not exito:
+            # Una excepción que no se puede serializar rompería el lote entero
+            try:
+                pickle.dumps(valor)
+            except Exception:
+                resultados[posicion] = (False, RuntimeError(repr(valor)))
+    return resultados, tiempos
+
+
+class EjecutorPedidos(ABC):
+    """
+    Interfaz de los ejecutores de pedidos (Strategy).
+    Attributes:
+        tamano_lote (int): Máximo de pedidos que un cocinero toma de la cola
+            y entrega juntos a preparar()
+        requiere_cocineros (bool): Si el servicio debe arrancar hilos de
+            cocineros; False para preparar en el hilo del cliente
+    """
+    tamano_lote = 1
+    requiere_cocineros = True
+
+    def iniciar(self):
+        """Reserva los recursos del ejecutor (idempotente)."""
+
+    def cerrar(self):
+        """Libera los recursos del ejecutor; iniciar() puede volver a reservarlos."""
+
+    @abstractmethod
+    def preparar(self, pedidos: List[Pedido]) -> List[Resultado]:
+        """
+        Prepara un lote de pedidos.
+        Args:
+            pedidos: Pedidos a preparar, en orden
+        Returns:
+            List[Resultado]: Un resultado por pedido, en el mismo orden
+        """
+        pass
+
+    def preparar_medido(self, pedidos: List[Pedido]) -> Tuple[List[Resultado], List[Tiempo]]:
+        """
+        Prepara un lote de pedidos y mide la preparación de cada uno.
+        La implementación base solo puede medir el lote entero: reparte su
+        duración en partes iguales, un pedido detrás de otro. Los ejecutores
+        que pueden medir cada pedido la redefinen.
+        Returns:
+            Tuple[List[Resultado], List[Tiempo]]: Un resultado y un Tiempo
+            por pedido, en el mismo orden
+        """
+        inicio = time.monotonic()
+        resultados = self.preparar(pedidos)
+        parte = (time.monotonic() - inicio) / len(pedidos)
+        return resultados, [(i * parte, parte) for i in range(len(pedidos))]
+
+
+class EjecutorHilos(EjecutorPedidos):
+    """preparar() en el hilo del cocinero (comportamiento original)."""
+
+    def preparar(self, pedidos: List[Pedido]) -> List[Resultado]:
+        return preparar_lote(pedidos)
+
+    def preparar_medido(self, pedidos: List[Pedido]) -> Tuple[List[Resultado], List[Tiempo]]:
+        tiempos: List[Tiempo] = []
+        return preparar_lote(pedidos, tiempos), tiempos
+
+
+class EjecutorEnLinea(EjecutorHilos):
+    """Sin cocineros en segundo plano: preparar() en el hilo del cliente."""
+    requiere_cocineros = False
+
+
+class EjecutorProcesos(EjecutorPedidos):
+    """
+    preparar() en un pool de procesos, para pedidos que consumen CPU.
+    Para aprovechar todos los procesos, el servicio necesita al menos tantos
+    cocineros como procesos: cada cocinero espera el resultado de su lote.
+    Attributes:
+        procesos (int | None): Procesos del pool (None: uno por núcleo)
+        tamano_lote (int): Pedidos por viaje al pool
+    """
+
+    def __init__(self, procesos: Optional[int] = None, tamano_lote: int = 8):
+        """
+        Args:
+            procesos: Cantidad de procesos del pool (None: os.cpu_count())
+            tamano_lote: Pedidos que se envían juntos en un viaje al pool
+        """
+        self.procesos = procesos
+        self.tamano_lote = tamano_lote
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Varios cocineros (hilos) usan el mismo pool
+        self._lock = threading.Lock()
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.procesos)
+            return self._pool
+
+    def iniciar(self):
+        self._obtener_pool()
+
+    def cerrar(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def preparar(self, pedidos: List[Pedido]) -> List[Resultado]:
+        return self.preparar_medido(pedidos)[0]
+
+    def preparar_medido(self, pedidos: List[Pedido]) -> Tuple[List[Resultado], List[Tiempo]]:
+        # Los tiempos se miden en el proceso trabajador, relativos a su propio
+        # inicio del lote: el viaje de ida y vuelta al pool no cuenta como
+        # preparación de ningún pedido
+        descripciones = [_describir(pedido) for pedido in pedidos]
+        return self._obtener_pool().submit(_preparar_en_proceso, descripciones).result()
+
+
+EJECUTORES = {"hilos": EjecutorHilos, "procesos": EjecutorProcesos, "en_linea": EjecutorEnLinea}
+
+
+def crear_ejecutor(ejecutor) -> EjecutorPedidos:
+    """
+    Devuelve el ejecutor a partir de su nombre o de una instancia ya creada.
+    Raises:
+        ValueError: Si el nombre no corresponde a ningún ejecutor
+    """
+    if isinstance(ejecutor, EjecutorPedidos):
+        return ejecutor
+    if ejecutor not in EJECUTORES:
+        raise ValueError(f"Ejecutor desconocido: {ejecutor!r} (opciones: {', '.join(EJECUTORES)})")
+    return EJECUTORES[ejecutor]()
@@ -0,0 +1,206 @@
+"""
+Módulo que implementa las métricas de latencia y del pool de cocineros.
+
+Cada TrabajoPedido lleva tres instantes (time.monotonic()): llegada (al
+encolarse), inicio (cuando empieza su propia preparación) y fin (cuando
+termina). Con ellos se calcula, por get_tipo():
+- espera: inicio - llegada (tiempo en la cola, más el que pasó detrás de los
+  pedidos anteriores de su mismo lote)
+- servicio: fin - inicio (tiempo de preparación de ese pedido)
+
+TIEMPOS DENTRO DE UN LOTE: el ejecutor mide cada preparar() por separado
+(ejecutores.preparar_medido()). Cuando solo se puede medir un grupo entero
+(el hook Pedido.preparar_lote(), o un ejecutor sin medición por pedido), la
+duración del grupo se reparte en partes iguales entre sus pedidos, uno
+detrás de otro: el servicio de cada uno es el promedio del grupo, no su
+duración real. Con EjecutorProcesos los tiempos se miden en el proceso
+trabajador, así que el viaje al pool no se cuenta como servicio.
+
+BAJO COSTO (pensado para dejarlo activo en producción):
+- Histograma logarítmico: cada muestra suma 1 a una cubeta; la memoria no
+  crece con la cantidad de pedidos y los percentiles tienen un error
+  relativo acotado (precision, 2% por defecto)
+- Los cocineros registran un lote entero con una sola toma del lock
+- Los percentiles se calculan solo al pedir un resumen
+
+VOLCADO PERIÓDICO: VolcadorMetricas agrega una línea JSON con
+ServicioPedidos.metricas() a un archivo cada cierto intervalo.
+"""
+
+import json
+import math
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# Duraciones menores (segundos) se cuentan en la primera cubeta
+DURACION_MINIMA = 1e-6
+PERCENTILES = (0.50, 0.95, 0.99)
+
+
+class Histograma:
+    """
+    Histograma de duraciones con cubetas de ancho logarítmico.
+    La cubeta i cubre (base^i, base^(i+1)] con base = 1 + precision, así que
+    un percentil se informa con un error relativo menor que precision.
+    Attributes:
+        cantidad (int): Muestras registradas
+        maximo (float): Mayor duración registrada
+    """
+
+    def __init__(self, precision: float = 0.02):
+        """
+        Args:
+            precision: Error relativo máximo de los percentiles
+        """
+        self._logaritmo_base = math.log1p(precision)
+        self._cubetas: Dict[int, int] = {}
+        self.cantidad = 0
+        self.maximo = 0.0
+
+    def registrar(self, duracion: float):
+        """Suma una duración en segundos."""
+        indice = math.ceil(math.log(max(duracion, DURACION_MINIMA)) / self._logaritmo_base)
+        self._cubetas[indice] = self._cubetas.get(indice, 0) + 1
+        self.cantidad += 1
+        if duracion > self.maximo:
+            self.maximo = duracion
+
+    def percentil(self, p: float) -> float:
+        """
+        Duración por debajo de la cual está la fracción p de las muestras.
+        Returns:
+            float: El borde superior de la cubeta (0.0 sin muestras)
+        """
+        if not self.cantidad:
+            return 0.0
+        objetivo = max(1, math.ceil(p * self.cantidad))
+        acumulado = 0
+        for indice in sorted(self._cubetas):
+            acumulado += self._cubetas[indice]
+            if acumulado >= objetivo:
+                return min(math.exp(indice * self._logaritmo_base), self.maximo)
+        return self.maximo
+
+    def resumen(self) -> dict:
+        """
+        Returns:
+            dict: {"cantidad", "p50_ms", "p95_ms", "p99_ms", "max_ms"}
+        """
+        resumen = {"cantidad": self.cantidad}
+        for p in PERCENTILES:
+            resumen[f"p{round(p * 100)}_ms"] = round(self.percentil(p) * 1000, 3)
+        resumen["max_ms"] = round(self.maximo * 1000, 3)
+        return resumen
+
+
+class Metricas:
+    """
+    Histogramas de espera y servicio por tipo de pedido, y rendimiento total.
+    Thread-safe: los cocineros registran desde sus hilos con un Lock propio.
+    Attributes:
+        completados (int): Pedidos terminados (bien o con error)
+        inicio (float): Instante (time.monotonic()) desde el que se mide
+    """
+
+    def __init__(self, precision: float = 0.02):
+        """
+        Args:
+            precision: Error relativo de los percentiles (ver Histograma)
+        """
+        self.precision = precision
+        self.completados = 0
+        self.inicio = time.monotonic()
+        self._por_tipo: Dict[str, Tuple[Histograma, Histograma]] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, muestras: Iterable[Tuple[str, float, float]]):
+        """
+        Registra un lote de pedidos terminados.
+        Args:
+            muestras: (tipo, espera, servicio) de cada pedido, en segundos
+        """
+        muestras = list(muestras)
+        with self._lock:
+            for tipo, espera, servicio in muestras:
+                histogramas = self._por_tipo.get(tipo)
+                if histogramas is None:
+                    histogramas = self._por_tipo[tipo] = (Histograma(self.precision),
+                                                          Histograma(self.precision))
+                histogramas[0].registrar(espera)
+                histogramas[1].registrar(servicio)
+            self.completados += len(muestras)
+
+    def resumen(self) -> dict:
+        """
+        Returns:
+            dict: {"completados", "rendimiento" (pedidos/s desde el inicio),
+            "por_tipo": {tipo: {"espera": {...}, "servicio": {...}}}}
+        """
+        with self._lock:
+            transcurrido = time.monotonic() - self.inicio
+            return {
+                "completados": self.completados,
+                "rendimiento": round(self.completados / transcurrido, 3) if transcurrido > 0 else 0.0,
+                "por_tipo": {
+                    tipo: {"espera": espera.resumen(), "servicio": servicio.resumen()}
+                    for tipo, (espera, servicio) in sorted(self._por_tipo.items())
+                },
+            }
+
+
+class VolcadorMetricas:
+    """
+    Hilo que agrega periódicamente servicio.metricas() a un archivo JSON lines.
+    Attributes:
+        servicio: Servicio con un método metricas() (ServicioPedidos)
+        ruta (str): Archivo al que se agregan las líneas
+        intervalo (float): Segundos entre volcados
+    """
+
+    def __init__(self, servicio, ruta: str, intervalo: float = 10.0):
+        """
+        Args:
+            servicio: Servicio a observar
+            ruta: Archivo JSON lines (se abre para agregar en cada volcado)
+            intervalo: Segundos entre volcados
+        """
+        self.servicio = servicio
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._detenido = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.detener()
+
+    def iniciar(self):
+        """Arranca el hilo de volcado (idempotente)."""
+        if self._hilo is not None:
+            return
+        self._detenido.clear()
+        self._hilo = threading.Thread(target=self._ejecutar, name="METRICAS", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo; antes hace un último volcado con el estado final."""
+        if self._hilo is None:
+            return
+        self._detenido.set()
+        self._hilo.join()
+        self._hilo = None
+
+    def volcar(self):
+        """Agrega una línea con la foto actual de las métricas."""
+        linea = json.dumps(self.servicio.metricas(), ensure_ascii=False)
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write(linea + "\n")
+
+    def _ejecutar(self):
+        while not self._detenido.wait(self.intervalo):
+            self.volcar()
+        self.volcar()
@@ -10,11 +10,16 @@ La clase abstracta define dos métodos principales:
 - preparar(): Retorna la descripción del pedido preparado
 - get_tipo(): Retorna el tipo de pedido para logging y seguimiento
 
+Y un hook opcional para preparar varios pedidos del mismo tipo juntos:
+- preparar_lote(pedidos): Las subclases lo redefinen cuando preparar un
+  lote cuesta menos que preparar cada pedido (ej: un horno de pizzas)
+
 Cada tipo de pedido concreto implementa estos métodos según sus características
 específicas.
 """
 
 from abc import ABC, abstractmethod
+from typing import List
 
 class Pedido(ABC):
     """
@@ -51,6 +56,20 @@ class Pedido(ABC):
         """
         pass
 
+    @classmethod
+    def preparar_lote(cls, pedidos: List["Pedido"]) -> List[str]:
+        """
+        Hook opcional: prepara juntos varios pedidos de esta clase.
+        La implementación base llama a preparar() de cada uno; los cocineros
+        solo usan el hook si la subclase lo redefine (si no, preparan pedido
+        por pedido y cada uno recibe su propia excepción).
+        Args:
+            pedidos: Pedidos de esta clase, todos del mismo get_tipo()
+        Returns:
+            List[str]: Un resultado por pedido, en el mismo orden
+        """
+        return [pedido.preparar() for pedido in pedidos]
+
 
 class PedidoHamburguesa(Pedido):
     """
@@ -0,0 +1,247 @@
+"""
+Módulo que implementa el registro (logging) estructurado de los cocineros.
+
+Los cocineros ya no imprimen directamente: arman eventos (EventoRegistro con
+origen, pedido, tipo, detalle e instante) y los entregan a un Registro.
+
+IMPLEMENTACIONES:
+- RegistroSincrono: formatea y escribe en el hilo del cocinero con el lock
+  de consola tomado. Es el comportamiento original: la escritura en consola
+  serializa a todos los cocineros
+- RegistroAsincrono: el cocinero solo encola el evento en una
+  queue.SimpleQueue (implementada en C, put() nunca bloquea ni toma un lock
+  de Python); un único hilo escritor los saca por lotes, los formatea y los
+  escribe con un write() y un flush() por lote, en consola o en un archivo
+
+ORDEN: Hay un solo escritor y una sola cola FIFO, así que los eventos salen
+en el orden en que se registraron; en particular, "Preparando" de un
+pedido siempre sale antes que su "listo".
+
+FORMATOS:
+- "texto": las mismas líneas de siempre ("[COCINERO 1] Pedido 3 listo: ...")
+- "json": un objeto JSON por línea con todos los campos del evento
+"""
+
+import json
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from queue import Empty, SimpleQueue
+from typing import Iterable, NamedTuple, Optional
+
+FORMATOS = ("texto", "json")
+
+
+class EventoRegistro(NamedTuple):
+    """
+    Un evento de registro.
+    Attributes:
+        origen (str): Quién lo registra ("COCINERO 1", "SISTEMA", "ESCALADO")
+        evento (str): "preparando", "listo", "error" o "mensaje"
+        numero_pedido (int | None): Pedido al que se refiere
+        tipo (str | None): get_tipo() del pedido
+        detalle (str): Resultado, error o texto libre
+        instante (float): time.time() al registrarlo
+    """
+    origen: str
+    evento: str
+    numero_pedido: Optional[int] = None
+    tipo: Optional[str] = None
+    detalle: str = ""
+    instante: float = 0.0
+
+
+def crear_evento(origen: str, evento: str, numero_pedido: Optional[int] = None,
+                 tipo: Optional[str] = None, detalle: str = "") -> EventoRegistro:
+    """Crea un EventoRegistro con el instante actual."""
+    return EventoRegistro(origen, evento, numero_pedido, tipo, detalle, time.time())
+
+
+def formatear(registro: EventoRegistro, formato: str = "texto") -> str:
+    """
+    Convierte un evento en una línea (sin salto de línea final).
+    Args:
+        registro: El evento
+        formato: "texto" o "json"
+    """
+    if formato == "json":
+        return json.dumps(registro._asdict(), ensure_ascii=False)
+    if registro.evento == "preparando":
+        return f"[{registro.origen}] Preparando pedido {registro.numero_pedido} ({registro.tipo})"
+    if registro.evento == "listo":
+        return f"[{registro.origen}] Pedido {registro.numero_pedido} listo: {registro.detalle}"
+    if registro.evento == "error":
+        return f"[{registro.origen}] Error procesando pedido: {registro.detalle}"
+    return f"[{registro.origen}] {registro.detalle}"
+
+
+class Registro(ABC):
+    """
+    Interfaz de los registros de eventos.
+    Attributes:
+        formato (str): "texto" o "json"
+    """
+
+    def __init__(self, destino=None, formato: str = "texto"):
+        """
+        Args:
+            destino: None (sys.stdout en el momento de escribir), un objeto
+                con write() o la ruta de un archivo (se abre para agregar)
+            formato: "texto" o "json"
+        Raises:
+            ValueError: Si el formato no existe
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconocido: {formato!r} (opciones: {', '.join(FORMATOS)})")
+        self.formato = formato
+        self._archivo_propio = isinstance(destino, str)
+        self._destino = open(destino, "a", encoding="utf-8") if self._archivo_propio else destino
+
+    def registrar(self, registro: EventoRegistro):
+        """Registra un evento."""
+        self.registrar_varios((registro,))
+
+    @abstractmethod
+    def registrar_varios(self, registros: Iterable[EventoRegistro]):
+        """Registra varios eventos seguidos, sin que otros se intercalen."""
+        pass
+
+    def vaciar(self):
+        """Bloquea hasta que todo lo registrado esté escrito."""
+
+    def cerrar(self):
+        """Escribe lo pendiente y cierra el archivo si lo abrió el registro."""
+        self.vaciar()
+        if self._archivo_propio:
+            self._destino.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _texto(self, registros: Iterable[EventoRegistro]) -> str:
+        """Las líneas formateadas de los eventos, cada una con su salto de línea."""
+        return "".join(formatear(registro, self.formato) + "\n" for registro in registros)
+
+    def _escribir(self, texto: str):
+        """Escribe con un solo write() y un flush()."""
+        destino = sys.stdout if self._destino is None else self._destino
+        destino.write(texto)
+        destino.flush()
+
+
+class RegistroSincrono(Registro):
+    """
+    Escribe en el hilo que registra, con un lock compartido.
+    Attributes:
+        lock (threading.Lock): Lock de la consola (el del servicio)
+    """
+
+    def __init__(self, lock: Optional[threading.Lock] = None, destino=None, formato: str = "texto"):
+        """
+        Args:
+            lock: Lock compartido para la salida (por defecto, uno propio)
+            destino: Ver Registro
+            formato: "texto" o "json"
+        """
+        super().__init__(destino, formato)
+        self.lock = threading.Lock() if lock is None else lock
+
+    def registrar_varios(self, registros: Iterable[EventoRegistro]):
+        # Se formatea fuera del lock; solo la escritura es sección crítica
+        texto = self._texto(registros)
+        with self.lock:
+            self._escribir(texto)
+
+
+class RegistroAsincrono(Registro):
+    """
+    Encola los eventos y los escribe un hilo escritor, por lotes.
+    Attributes:
+        tamano_lote (int): Máximo de eventos por write()
+    """
+
+    # Marca de fin del hilo escritor (cerrar)
+    _FIN = object()
+
+    def __init__(self, destino=None, formato: str = "texto", tamano_lote: int = 512):
+        """
+        Args:
+            destino: Ver Registro
+            formato: "texto" o "json"
+            tamano_lote: Máximo de eventos que el escritor junta por write()
+        """
+        super().__init__(destino, formato)
+        self.tamano_lote = tamano_lote
+        self._cola = SimpleQueue()
+        self._escritor = threading.Thread(target=self._ejecutar, name="REGISTRO", daemon=True)
+        self._escritor.start()
+
+    def registrar_varios(self, registros: Iterable[EventoRegistro]):
+        # Una sola entrada para todo el grupo: el escritor no lo parte
+        self._cola.put(tuple(registros))
+
+    def vaciar(self):
+        """
+        SINCRONIZACIÓN: Se encola un threading.Event detrás de lo registrado
+        hasta ahora; el escritor lo activa al llegar a él, cuando todo lo
+        anterior ya está escrito.
+        """
+        if not self._escritor.is_alive():
+            return
+        escrito = threading.Event()
+        self._cola.put(escrito)
+        escrito.wait()
+
+    def cerrar(self):
+        if self._escritor.is_alive():
+            self._cola.put(self._FIN)
+            self._escritor.join()
+        super().cerrar()
+
+    def _ejecutar(self):
+        """
+        Bucle del hilo escritor: bloquea hasta el primer elemento (sin sondeo)
+        y junta lo que ya esté en la cola, hasta tamano_lote eventos.
+        """
+        terminar = False
+        while not terminar:
+            elementos = [self._cola.get()]
+            cantidad = len(elementos[0]) if isinstance(elementos[0], tuple) else 0
+            while cantidad < self.tamano_lote:
+                try:
+                    elemento = self._cola.get_nowait()
+                except Empty:
+                    break
+                elementos.append(elemento)
+                if isinstance(elemento, tuple):
+                    cantidad += len(elemento)
+            lote = []
+            for elemento in elementos:
+                if isinstance(elemento, tuple):
+                    lote.extend(elemento)
+                    continue
+                # Marcas: lo anterior a ellas se escribe antes de atenderlas
+                self._escribir_lote(lote)
+                lote = []
+                if elemento is self._FIN:
+                    terminar = True
+                else:
+                    elemento.set()
+            self._escribir_lote(lote)
+
+    def _escribir_lote(self, lote: list):
+        """
+        MANEJO DE ERRORES: Un error de escritura se informa en stderr y se
+        pierde ese lote; el escritor sigue vivo para que vaciar() no se
+        bloquee para siempre.
+        """
+        if not lote:
+            return
+        try:
+            self._escribir(self._texto(lote))
+        except Exception as e:
+            print(f"[REGISTRO] No se pudieron escribir {len(lote)} eventos: {e}", file=sys.stderr)
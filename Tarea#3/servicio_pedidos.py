@@ -16,7 +16,8 @@ SINCRONIZACIÓN Y THREAD-SAFETY:
 Se utilizan tres mecanismos de sincronización:
 
 1. **Queue (Cola thread-safe)**:
-   - Implementada en queue.Queue de Python
+   - Implementada en queue.Queue de Python; ColaPedidos la extiende con
+     una espera sin sondeo que se interrumpe al detener un cocinero
    - Usa locks internos para operaciones atómicas (put, get)
    - Método join() espera hasta que todos los items sean procesados
    - Método task_done() notifica que un item ha sido procesado
@@ -28,20 +29,84 @@ Se utilizan tres mecanismos de sincronización:
    - Espera a que los threads terminen antes de continuar
    - Asegura cleanup ordenado de recursos
 
-FLUJO DE EJECUCIÓN:
+FLUJO DE EJECUCIÓN (modo lote):
 1. Cliente agrega pedidos a la cola (agregar_pedido)
 2. procesar_pedidos() crea y arranca los cocineros
 3. Cocineros consumen pedidos concurrentemente
 4. join() espera a que la cola esté vacía
 5. "Poison pills" (None) detienen a los cocineros
 6. join() en threads espera a que terminen limpiamente
+
+FLUJO DE EJECUCIÓN (modo servicio):
+1. iniciar() arranca el pool una sola vez (enviar() lo hace si hace falta)
+2. enviar(pedido) encola el pedido en cualquier momento y devuelve un Future
+3. Los cocineros preparan cada pedido apenas se libera uno: la latencia de un
+   pedido no depende de los demás pedidos enviados junto con él
+4. El Future se resuelve con el resultado de preparar() o con su excepción
+5. cerrar() detiene el pool de una de dos formas:
+   - Ordenada (por defecto): poison pills detrás de los pedidos pendientes,
+     que se preparan todos antes de que los cocineros terminen
+   - Inmediata (cancelar_pendientes=True): los pedidos que esperan en la cola
+     se retiran y sus Futures se cancelan; cada cocinero termina apenas
+     completa el pedido que tiene en las manos
+
+EJECUTORES (elegidos al construir el servicio, ver ejecutores.py):
+- "hilos" (por defecto): cada cocinero prepara en su propio hilo
+- "procesos": los cocineros envían lotes de pedidos a un pool de procesos,
+  para que preparar() con uso intensivo de CPU no quede limitado por el GIL
+- "en_linea": sin hilos; enviar() y procesar_pedidos() preparan los pedidos
+  en el hilo que llama
+
+PLANIFICACIÓN: Con cola_pedidos=ColaPlanificada(...) (cola_planificada.py)
+los pedidos salen por prioridad, costo estimado o plazo en lugar de FIFO;
+enviar() y agregar_pedido() aceptan prioridad y plazo.
+
+CONTRAPRESIÓN: Con capacidad > 0 la cola es acotada y la memoria no crece sin
+límite bajo sobrecarga. La política de desbordamiento decide qué pasa cuando
+está llena (ver cola_pedidos.py): bloquear al productor (con espera_maxima),
+rechazar el pedido con PedidoRechazado, o descartar el más antiguo o el de
+menor prioridad, cuyo Future termina con PedidoDescartado.
+
+REGISTRO: Los cocineros registran eventos estructurados en un Registro
+(registro.py). Por defecto, RegistroSincrono escribe con el lock de consola;
+con registro=RegistroAsincrono() un hilo escritor los escribe por lotes y
+los cocineros no esperan a la consola.
+
+MÉTRICAS: Cada pedido se marca al encolarse, al salir de la cola y al
+terminar. metricas() devuelve una foto con percentiles de espera y servicio
+por get_tipo(), utilización y rendimiento de cada cocinero y la profundidad
+de la cola (ver metricas.py; VolcadorMetricas la agrega a un archivo JSON
+lines cada cierto intervalo).
 """
 
 import threading
-from queue import Queue
-from typing import List
+import time
+from concurrent.futures import Future
+from queue import Full
+from typing import List, Optional
 from pedido import Pedido
 from cocinero import Cocinero
+from cola_pedidos import DESBORDAMIENTOS, ColaPedidos
+from ejecutores import EjecutorPedidos, crear_ejecutor
+from metricas import Metricas
+from registro import Registro, RegistroSincrono, crear_evento
+from trabajo_pedido import TrabajoPedido
+
+
+class PedidoRechazado(Exception):
+    """El pedido no entró en la cola llena (políticas "bloquear" y "rechazar")."""
+
+    def __init__(self, pedido: Pedido):
+        super().__init__(f"Pedido {pedido.numero_pedido} rechazado: la cola está llena")
+        self.pedido = pedido
+
+
+class PedidoDescartado(Exception):
+    """El pedido salió de la cola llena sin prepararse; llega a través de su Future."""
+
+    def __init__(self, pedido: Pedido):
+        super().__init__(f"Pedido {pedido.numero_pedido} descartado para hacer lugar en la cola")
+        self.pedido = pedido
 
 
 class ServicioPedidos:
@@ -55,47 +120,368 @@ class ServicioPedidos:
     - Gestionar el ciclo de vida del pool de cocineros
     - Coordinar la sincronización entre threads
     - Proporcionar interfaz simple para agregar y procesar pedidos
+    - Entregar el resultado de cada pedido a través de un Future
+    Se puede usar en modo lote (agregar_pedido + procesar_pedidos) o en modo
+    servicio (enviar + cerrar, o como context manager).
     Attributes:
-        cola_pedidos (Queue): Cola thread-safe para almacenar pedidos pendientes
+        cola_pedidos (ColaPedidos): Cola thread-safe de TrabajoPedido pendientes
         num_cocineros (int): Número de cocineros (workers) en el pool
         cocineros (List[Cocinero]): Lista de cocineros activos
         lock (threading.Lock): Lock compartido para sincronización de I/O
+        registro (Registro): Destino de los eventos de log
         pedidos_totales (int): Contador total de pedidos agregados
+        ejecutor (EjecutorPedidos): Dónde se ejecuta pedido.preparar()
+        tamano_lote (int | None): Pedidos por lote de cada cocinero
+        espera_lote_ms (float): Espera máxima para llenar un lote
+        desbordamiento (str): Política cuando la cola está llena
+        espera_maxima (float | None): Timeout de la política "bloquear"
+        pedidos_rechazados (int): Pedidos que no entraron en la cola
+        pedidos_descartados (int): Pedidos sacados de la cola para hacer lugar
     """
     
-    def __init__(self, num_cocineros: int = 2):
+    def __init__(self, num_cocineros: int = 2, ejecutor="hilos",
+                 cola_pedidos: Optional[ColaPedidos] = None,
+                 tamano_lote: Optional[int] = None, espera_lote_ms: float = 0,
+                 capacidad: int = 0, desbordamiento: str = "bloquear",
+                 espera_maxima: Optional[float] = None,
+                 registro: Optional[Registro] = None, medir: bool = True):
         """
         Inicializa el servicio de pedidos.
         Args:
             num_cocineros: Número de cocineros (hilos) que procesarán los 
             pedidos. Default: 2 cocineros para balance entre concurrencia y
             recursos.
+            ejecutor: "hilos", "procesos", "en_linea" o una instancia de
+            EjecutorPedidos. Con "procesos" conviene al menos un cocinero por
+            proceso, porque cada cocinero espera el resultado de su lote.
+            cola_pedidos: Cola a usar; por defecto una ColaPedidos (FIFO). Con
+            una ColaPlanificada los pedidos se ordenan por prioridad y plazo
+            tamano_lote: Pedidos que cada cocinero toma de la cola por vez
+            (por defecto, el del ejecutor: 1 con hilos)
+            espera_lote_ms: Milisegundos que un cocinero espera a que su
+            lote se llene (0: solo toma lo que ya está en la cola)
+            capacidad: Máximo de pedidos en la cola (0: la de cola_pedidos,
+            sin límite por defecto)
+            desbordamiento: "bloquear", "rechazar", "descartar_antiguo" o
+            "descartar_menor_prioridad"
+            espera_maxima: Segundos que "bloquear" espera lugar antes de
+            rechazar el pedido (None: sin límite)
+            registro: Dónde se registran los eventos (por defecto, un
+            RegistroSincrono con el lock de consola). El servicio lo vacía
+            al cerrar pero no lo cierra: es de quien lo creó
+            medir: Si se registran los tiempos de cada pedido para metricas()
+        Raises:
+            ValueError: Si el nombre del ejecutor o de la política no existe
         """
-        # Queue: Cola FIFO thread-safe de Python
+        if desbordamiento not in DESBORDAMIENTOS:
+            raise ValueError(f"Política de desbordamiento desconocida: {desbordamiento!r} "
+                             f"(opciones: {', '.join(DESBORDAMIENTOS)})")
+        self.ejecutor: EjecutorPedidos = crear_ejecutor(ejecutor)
+        # ColaPedidos: Cola FIFO thread-safe (una queue.Queue)
         # Características:
         # - put() y get() son operaciones atómicas
         # - Bloqueo automático cuando está vacía (get) o llena (put con maxsize)
         # - Tracking interno de tareas pendientes para join()
-        self.cola_pedidos = Queue()
+        # - obtener(): espera sin sondeo que se interrumpe al detener un cocinero
+        # ColaPlanificada: misma interfaz, ordenada por prioridad o plazo
+        self.cola_pedidos = ColaPedidos() if cola_pedidos is None else cola_pedidos
+        if capacidad:
+            self.cola_pedidos.maxsize = capacidad
+        self.desbordamiento = desbordamiento
+        self.espera_maxima = espera_maxima
+        # Contadores de contrapresión; los actualizan varios productores
+        self.pedidos_rechazados = 0
+        self.pedidos_descartados = 0
+        self._lock_contadores = threading.Lock()
         
         self.num_cocineros = num_cocineros
+        self.tamano_lote = tamano_lote
+        self.espera_lote_ms = espera_lote_ms
         self.cocineros: List[Cocinero] = []
         
         # Lock compartido para sincronizar salidas a consola
         # Previene que múltiples threads escriban simultáneamente
         self.lock = threading.Lock()
-    
-    def agregar_pedido(self, pedido: Pedido):
+        self.registro = RegistroSincrono(self.lock) if registro is None else registro
+        self._metricas: Optional[Metricas] = Metricas() if medir else None
+
+        # Lock del ciclo de vida del pool: iniciar() y cerrar() pueden llamarse
+        # desde varios hilos; sin él dos hilos podrían crear dos pools
+        self._lock_ciclo = threading.Lock()
+        # Cocineros de un pool cerrado sin esperar que todavía pueden estar
+        # consumiendo sus poison pills; iniciar() los espera antes de crear
+        # otro pool para que los cocineros nuevos no se coman esas señales
+        self._cocineros_cerrados: List[Cocinero] = []
+        # Número del próximo cocinero; no se repiten nombres aunque se retiren
+        self._proximo_cocinero = 1
+        # Con el ejecutor "en_linea" un único cocinero, que nunca se arranca
+        # como hilo, atiende la cola desde el hilo del cliente
+        self._cocinero_en_linea = None
+        if not self.ejecutor.requiere_cocineros:
+            self._cocinero_en_linea = Cocinero("COCINERO 1", self.cola_pedidos, self.lock,
+                                               self.ejecutor, tamano_lote, registro=self.registro,
+                                               metricas=self._metricas)
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar(esperar=True)
+
+    def iniciar(self):
+        """
+        Arranca el pool de cocineros si no está en marcha (operación idempotente).
+        A partir de aquí los pedidos se preparan a medida que llegan a la cola.
+        SINCRONIZACIÓN: Se ejecuta con _lock_ciclo tomado, así que llamadas
+        concurrentes crean un único pool.
+        """
+        with self._lock_ciclo:
+            self.ejecutor.iniciar()
+            if self.cocineros or not self.ejecutor.requiere_cocineros:
+                return
+            for cocinero in self._cocineros_cerrados:
+                cocinero.join()
+            self._cocineros_cerrados.clear()
+            self._proximo_cocinero = 1
+            # Cada cocinero es un thread que consumirá de la cola compartida
+            for _ in range(self.num_cocineros):
+                self._arrancar_cocinero()
+
+    def _arrancar_cocinero(self) -> Cocinero:
+        """Crea, registra y arranca un cocinero. Requiere _lock_ciclo tomado."""
+        cocinero = Cocinero(
+            nombre=f"COCINERO {self._proximo_cocinero}",
+            cola_pedidos=self.cola_pedidos,
+            lock=self.lock,
+            ejecutor=self.ejecutor,
+            tamano_lote=self.tamano_lote,
+            espera_lote_ms=self.espera_lote_ms,
+            registro=self.registro,
+            metricas=self._metricas
+        )
+        self._proximo_cocinero += 1
+        self.cocineros.append(cocinero)
+        # start() inicia el thread (ejecuta el método run() en paralelo)
+        cocinero.start()
+        return cocinero
+
+    def agregar_cocinero(self) -> Optional[Cocinero]:
+        """
+        Suma un cocinero al pool en marcha (lo usa el autoescalado).
+        Returns:
+            Cocinero | None: El cocinero nuevo, o None si el pool no está en
+            marcha (no se arranca un pool solo para sumarle un cocinero)
+        """
+        with self._lock_ciclo:
+            if not self.cocineros:
+                return None
+            return self._arrancar_cocinero()
+
+    def retirar_cocinero(self, cocinero: Cocinero) -> bool:
+        """
+        Detiene a un cocinero concreto del pool, sin afectar a los demás.
+        A diferencia de las poison pills, que toma cualquier cocinero, aquí
+        se usa detener(): si está ocioso termina enseguida y si está
+        preparando un lote termina al completarlo.
+        Args:
+            cocinero: Cocinero del pool a retirar
+        Returns:
+            bool: False si el cocinero ya no estaba en el pool o era el último
+        """
+        with self._lock_ciclo:
+            if cocinero not in self.cocineros or len(self.cocineros) == 1:
+                return False
+            self.cocineros.remove(cocinero)
+            cocinero.detener()
+            # iniciar() lo espera antes de crear otro pool, como a los cerrados
+            self._cocineros_cerrados.append(cocinero)
+            return True
+
+    def cerrar(self, esperar: bool = True, cancelar_pendientes: bool = False):
+        """
+        Detiene el pool de cocineros.
+        CIERRE ORDENADO (por defecto): Las poison pills se encolan detrás de
+        los pedidos pendientes, por lo que ningún pedido enviado antes de
+        cerrar() queda sin preparar.
+        CIERRE INMEDIATO (cancelar_pendientes=True): Se retiran de la cola los
+        pedidos que nadie empezó a preparar, se cancelan sus Futures y se
+        detiene cada cocinero con detener(); los ociosos terminan enseguida y
+        los ocupados al completar su pedido actual.
+        Args:
+            esperar: Si es True, bloquea hasta que los cocineros terminen y
+                libera el ejecutor (por ejemplo, su pool de procesos); si es
+                False, retorna enseguida y el pool termina en segundo plano
+            cancelar_pendientes: Si es True, cierre inmediato
+        """
+        with self._lock_ciclo:
+            cocineros = list(self.cocineros)
+            self.cocineros.clear()
+            if cancelar_pendientes:
+                # Incluye las poison pills de un cierre ordenado anterior sin
+                # esperar, así que esos cocineros también se detienen aquí
+                for trabajo in self.cola_pedidos.vaciar():
+                    if trabajo is not None:
+                        trabajo.futuro.cancel()
+                for cocinero in cocineros + self._cocineros_cerrados:
+                    cocinero.detener()
+            else:
+                # "Poison pill" pattern: una señal None por cocinero activo; a
+                # los ya detenidos una señal les sobraría y join() de la cola
+                # la esperaría para siempre. encolar_paradas() no espera
+                # lugar en una cola acotada llena: _lock_ciclo no se retiene
+                # hasta que los cocineros la vacíen
+                self.cola_pedidos.encolar_paradas(sum(1 for cocinero in cocineros if cocinero.activo))
+            if not esperar:
+                self._cocineros_cerrados.extend(cocineros)
+                return
+        # join() fuera del lock: los cocineros no lo necesitan para terminar
+        for cocinero in cocineros:
+            cocinero.join()
+        if self._cocinero_en_linea is not None and not cancelar_pendientes:
+            self._cocinero_en_linea.atender_pendientes()
+        self.ejecutor.cerrar()
+        # Con RegistroAsincrono, el log completo está escrito al retornar
+        self.registro.vaciar()
+
+    def agregar_pedido(self, pedido: Pedido, prioridad: int = 0,
+                       plazo: Optional[float] = None) -> Future:
         """
         Agrega un pedido a la cola para ser procesado (operación Producer).
         Esta operación es thread-safe gracias a Queue.put(), que usa locks
-        internos para garantizar atomicidad.
+        internos para garantizar atomicidad. Si el pool no está en marcha, el
+        pedido espera en la cola hasta iniciar() o procesar_pedidos().
         Args:
             pedido: El pedido a agregar a la cola
+            prioridad: Menor es más urgente (la cola FIFO la ignora)
+            plazo: Segundos desde ahora en los que debería estar listo (solo
+                lo usa ColaPlanificada)
+        Returns:
+            Future: Se resuelve con el resultado de pedido.preparar(), o con
+            PedidoDescartado si se lo saca de la cola para hacer lugar
+        Raises:
+            PedidoRechazado: Si la cola está llena y la política es
+                "rechazar", o "bloquear" y venció espera_maxima
         THREAD-SAFETY: Queue.put() es thread-safe, múltiples threads pueden
         agregar pedidos concurrentemente sin problemas.
         """
-        self.cola_pedidos.put(pedido)
+        trabajo = TrabajoPedido(pedido, prioridad=prioridad, plazo=plazo)
+        if self._cocinero_en_linea is not None and self.cola_pedidos.full():
+            # Sin hilos de cocineros nadie más liberaría lugar
+            self._cocinero_en_linea.atender_pendientes()
+        self._encolar(trabajo, self.desbordamiento, self.espera_maxima)
+        return trabajo.futuro
+
+    def intentar_agregar(self, pedido: Pedido, prioridad: int = 0,
+                         plazo: Optional[float] = None) -> Optional[Future]:
+        """
+        Como agregar_pedido(), pero nunca bloquea ni lanza PedidoRechazado.
+        Con la política "bloquear" se comporta como "rechazar"; con las de
+        descarte hace lugar igual que agregar_pedido().
+        Returns:
+            Future | None: El Future del pedido, o None si no entró en la cola
+        """
+        trabajo = TrabajoPedido(pedido, prioridad=prioridad, plazo=plazo)
+        desbordamiento = "rechazar" if self.desbordamiento == "bloquear" else self.desbordamiento
+        try:
+            self._encolar(trabajo, desbordamiento, None)
+        except PedidoRechazado:
+            return None
+        return trabajo.futuro
+
+    def _encolar(self, trabajo: TrabajoPedido, desbordamiento: str, timeout: Optional[float]):
+        """
+        Encola un trabajo con la política dada y actualiza los contadores.
+        MANEJO DE ERRORES: El Future del pedido descartado (que puede ser el
+        mismo trabajo) termina con PedidoDescartado, salvo que el cliente ya
+        lo haya cancelado.
+        """
+        try:
+            descartado = self.cola_pedidos.agregar(trabajo, desbordamiento, timeout)
+        except Full:
+            with self._lock_contadores:
+                self.pedidos_rechazados += 1
+            raise PedidoRechazado(trabajo.pedido) from None
+        if descartado is not None:
+            with self._lock_contadores:
+                self.pedidos_descartados += 1
+            if descartado.futuro.set_running_or_notify_cancel():
+                descartado.futuro.set_exception(PedidoDescartado(descartado.pedido))
+
+    def profundidad(self) -> int:
+        """Pedidos esperando en la cola en este momento."""
+        return self.cola_pedidos.qsize()
+
+    def metricas(self) -> dict:
+        """
+        Foto de las métricas del servicio (se puede llamar en cualquier momento).
+        Returns:
+            dict: "instante" (time.time()), "profundidad" de la cola, las
+            estadisticas() de la cola y la contrapresión, "cocineros" (nombre,
+            pedidos_procesados, utilización y rendimiento en pedidos/s de cada
+            uno) y, si medir=True, "completados", "rendimiento" y "por_tipo"
+            con los percentiles de espera y servicio en milisegundos
+        """
+        ahora = time.monotonic()
+        cocineros = list(self.cocineros)
+        if self._cocinero_en_linea is not None:
+            cocineros.append(self._cocinero_en_linea)
+        foto = {
+            "instante": time.time(),
+            "profundidad": self.profundidad(),
+            "cola": self.estadisticas(),
+            "cocineros": [
+                {
+                    "nombre": cocinero.nombre,
+                    "pedidos_procesados": cocinero.pedidos_procesados,
+                    "utilizacion": round(cocinero.utilizacion(), 4),
+                    "rendimiento": round(cocinero.pedidos_procesados / max(ahora - cocinero.arranque, 1e-9), 3),
+                }
+                for cocinero in cocineros
+            ],
+        }
+        if self._metricas is not None:
+            foto.update(self._metricas.resumen())
+        return foto
+
+    def estadisticas(self) -> dict:
+        """
+        Estado de la cola y de la contrapresión.
+        Returns:
+            dict: Las estadísticas de la cola ("pendientes" es la
+            profundidad actual; ColaPlanificada agrega los plazos) más
+            "capacidad" (0: sin límite), "rechazados" y "descartados"
+        """
+        estadisticas = self.cola_pedidos.estadisticas()
+        estadisticas["capacidad"] = self.cola_pedidos.maxsize
+        with self._lock_contadores:
+            estadisticas["rechazados"] = self.pedidos_rechazados
+            estadisticas["descartados"] = self.pedidos_descartados
+        return estadisticas
+
+    def enviar(self, pedido: Pedido, prioridad: int = 0,
+               plazo: Optional[float] = None) -> Future:
+        """
+        Envía un pedido al pool en marcha (modo servicio) y devuelve su Future.
+        Puede llamarse en cualquier momento, incluso mientras otros pedidos se
+        están preparando; arranca el pool si todavía no está en marcha.
+        Con el ejecutor "en_linea" el pedido se prepara antes de retornar, en
+        el hilo que llama, y el Future ya está resuelto.
+        Args:
+            pedido: El pedido a preparar
+            prioridad: Menor es más urgente (ver agregar_pedido())
+            plazo: Segundos desde ahora en los que debería estar listo
+        Returns:
+            Future: future.result() devuelve el resultado de preparar() o
+            relanza la excepción que haya producido
+        Raises:
+            PedidoRechazado: Si la cola está llena (ver agregar_pedido())
+        """
+        self.iniciar()
+        futuro = self.agregar_pedido(pedido, prioridad, plazo)
+        if self._cocinero_en_linea is not None:
+            self._cocinero_en_linea.atender_pendientes()
+        return futuro
     
     def procesar_pedidos(self):
         """
@@ -110,18 +496,15 @@ class ServicioPedidos:
         SINCRONIZACIÓN CRÍTICA:
         - cola_pedidos.join(): Bloquea hasta que todos los pedidos sean procesados
         - cocinero.join(): Bloquea hasta que cada thread termine limpiamente
+        Si el pool ya estaba en marcha (modo servicio), solo espera a que la
+        cola se vacíe y lo deja en marcha.
         """
-        # FASE 1: Crear e iniciar el pool de cocineros
-        # Cada cocinero es un thread que consumirá de la cola compartida
-        for i in range(self.num_cocineros):
-            cocinero = Cocinero(
-                nombre=f"COCINERO {i + 1}",
-                cola_pedidos=self.cola_pedidos,
-                lock=self.lock
-            )
-            self.cocineros.append(cocinero)
-            # start() inicia el thread (ejecuta el método run() en paralelo)
-            cocinero.start()
+        # FASE 1: Crear e iniciar el pool de cocineros (si no estaba en marcha)
+        pool_propio = not self.cocineros
+        self.iniciar()
+        if self._cocinero_en_linea is not None:
+            # Sin hilos: los pedidos se preparan aquí mismo
+            self._cocinero_en_linea.atender_pendientes()
         
         # FASE 2: Esperar a que se procesen todos los pedidos
         # join() bloquea hasta que:
@@ -130,21 +513,12 @@ class ServicioPedidos:
         # Esto asegura que todos los pedidos han sido completamente procesados
         self.cola_pedidos.join()
         
-        # FASE 3: Enviar señales de parada a todos los cocineros
-        # "Poison pill" pattern: None indica al worker que debe terminar
-        # Enviamos uno por cada cocinero para que todos reciban la señal
-        for _ in range(self.num_cocineros):
-            self.cola_pedidos.put(None)
-        
-        # FASE 4: Esperar a que todos los cocineros terminen limpiamente
-        # join() en cada thread bloquea hasta que el thread termine
-        # Esto asegura cleanup ordenado y previene zombie threads
-        for cocinero in self.cocineros:
-            cocinero.join()
-        
-        # FASE 5: Logging final y cleanup
-        with self.lock:
-            print("[SISTEMA] Todos los pedidos procesados")
+        # FASE 3 y 4: Enviar señales de parada (poison pills, una por cocinero)
+        # y esperar a que todos los cocineros terminen limpiamente.
+        # cerrar() también limpia la lista de cocineros para futuras ejecuciones
+        if pool_propio:
+            self.cerrar(esperar=True)
         
-        # Limpiar la lista de cocineros para futuras ejecuciones
-        self.cocineros.clear()
+        # FASE 5: Logging final (y esperar a que todo el log esté escrito)
+        self.registro.registrar(crear_evento("SISTEMA", "mensaje", detalle="Todos los pedidos procesados"))
+        self.registro.vaciar()
@@ -0,0 +1,253 @@
+"""
+Módulo que implementa el servicio de pedidos sobre asyncio.
+
+Es la contraparte asyncio de ServicioPedidos y Cocinero, para clientes que
+ya corren en un event loop: en lugar de hilos hay tareas (asyncio.Task) que
+consumen una asyncio.Queue, y enviar() es una corrutina que espera el
+resultado sin bloquear el loop ni pasar por otro hilo.
+
+ARQUITECTURA (la misma Producer-Consumer que la versión con hilos):
+- PRODUCER: Corrutinas del cliente llaman a await servicio.enviar(pedido)
+- CONSUMER: CocineroAsync, una tarea por cocinero dentro del mismo loop
+- QUEUE: asyncio.Queue de TrabajoPedido, cada uno con su asyncio.Future
+
+PEDIDOS SÍNCRONOS Y ASÍNCRONOS:
+- Si preparar() es una corrutina (async def), el cocinero la espera
+  directamente en el loop
+- Si preparar() es síncrono, por defecto se ejecuta en un ThreadPoolExecutor
+  con run_in_executor() para no bloquear el loop mientras cocina
+- Con preparar_en_hilo=False los preparar() síncronos se ejecutan en el
+  propio loop: conviene cuando son instantáneos (como PedidoHamburguesa y
+  PedidoPizza), porque se ahorra el paso a otro hilo por pedido
+
+SINCRONIZACIÓN:
+- No hace falta Lock para la consola: todas las tareas corren en el mismo
+  hilo y un print() nunca se interrumpe a la mitad
+- task_done()/join() de asyncio.Queue cumplen el mismo rol que en queue.Queue
+- iniciar() sí usa un asyncio.Lock: espera con await al pool cerrado antes
+  de crear el nuevo, y otra corrutina podría intercalarse en esa espera
+
+COMPATIBILIDAD:
+- Acepta cualquier Pedido, en particular los creados con las factories de
+  factory.py (CreadorHamburguesas, CreadorPizzas)
+
+EJEMPLO DE USO:
+    async with ServicioPedidosAsync(num_cocineros=4) as servicio:
+        resultado = await servicio.enviar(CreadorPizzas().crear_pedido(1))
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import List, Optional
+from pedido import Pedido
+from trabajo_pedido import TrabajoPedido
+
+
+class CocineroAsync:
+    """
+    Cocinero implementado como tarea asyncio en lugar de hilo.
+    Consume TrabajoPedido de una asyncio.Queue hasta recibir la poison pill
+    (None) o hasta que se cancele su tarea.
+    Attributes:
+        nombre (str): Identificador del cocinero para logging
+        cola_pedidos (asyncio.Queue): Cola compartida de TrabajoPedido
+        ejecutor (Executor | None): Donde se ejecutan los preparar() síncronos
+            (None: el ejecutor por defecto del loop)
+        preparar_en_hilo (bool): Si es False, los preparar() síncronos se
+            ejecutan directamente en el loop
+        pedidos_procesados (int): Contador de pedidos completados
+    """
+
+    def __init__(self, nombre: str, cola_pedidos: asyncio.Queue,
+                 ejecutor: Optional[Executor] = None, preparar_en_hilo: bool = True):
+        """
+        Inicializa un cocinero asíncrono.
+        Args:
+            nombre: Identificador del cocinero (ej: "COCINERO 1")
+            cola_pedidos: Cola compartida de donde se obtienen los trabajos
+            ejecutor: Executor para los preparar() síncronos
+            preparar_en_hilo: Si los preparar() síncronos se pasan al ejecutor
+        """
+        self.nombre = nombre
+        self.cola_pedidos = cola_pedidos
+        self.ejecutor = ejecutor
+        self.preparar_en_hilo = preparar_en_hilo
+        self.pedidos_procesados = 0
+
+    async def ejecutar(self):
+        """
+        Corrutina principal del cocinero (equivalente a Cocinero.run()).
+        SINCRONIZACIÓN: task_done() se llama siempre, también si preparar()
+        falla o si la tarea se cancela mientras espera un pedido en proceso.
+        """
+        while True:
+            trabajo = await self.cola_pedidos.get()
+            try:
+                # None es la "poison pill" - señal para terminar la tarea
+                if trabajo is None:
+                    break
+                await self._procesar_trabajo(trabajo)
+            finally:
+                self.cola_pedidos.task_done()
+
+    async def _procesar_trabajo(self, trabajo: TrabajoPedido):
+        """
+        Prepara el pedido de un trabajo y publica el resultado en su Future.
+        Args:
+            trabajo: El trabajo obtenido de la cola
+        MANEJO DE ERRORES: Una excepción de preparar() se registra y se
+        entrega al cliente a través del Future. Si la tarea se cancela a
+        mitad de la preparación, el Future del pedido también se cancela.
+        """
+        if trabajo.futuro.done():
+            # El cliente dejó de esperar (su enviar() fue cancelado)
+            return
+        try:
+            resultado = await self._procesar_pedido(trabajo.pedido)
+        except asyncio.CancelledError:
+            trabajo.futuro.cancel()
+            raise
+        except Exception as e:
+            print(f"[{self.nombre}] Error procesando pedido: {e}")
+            if not trabajo.futuro.done():
+                trabajo.futuro.set_exception(e)
+        else:
+            self.pedidos_procesados += 1
+            if not trabajo.futuro.done():
+                trabajo.futuro.set_result(resultado)
+
+    async def _procesar_pedido(self, pedido: Pedido):
+        """
+        Prepara un pedido, sea preparar() una corrutina o una función síncrona.
+        Args:
+            pedido: El pedido a procesar
+        Returns:
+            str: El resultado de pedido.preparar()
+        """
+        print(f"[{self.nombre}] Preparando pedido {pedido.numero_pedido} ({pedido.get_tipo()})")
+        if inspect.iscoroutinefunction(pedido.preparar):
+            resultado = await pedido.preparar()
+        elif self.preparar_en_hilo:
+            loop = asyncio.get_running_loop()
+            resultado = await loop.run_in_executor(self.ejecutor, pedido.preparar)
+        else:
+            resultado = pedido.preparar()
+        print(f"[{self.nombre}] Pedido {pedido.numero_pedido} listo: {resultado}")
+        return resultado
+
+
+class ServicioPedidosAsync:
+    """
+    Servicio de pedidos con cocineros como tareas asyncio.
+    Misma interfaz que el modo servicio de ServicioPedidos, pero con
+    corrutinas: iniciar(), enviar() y cerrar() se usan con await, y el
+    servicio es un async context manager.
+    Attributes:
+        num_cocineros (int): Número de cocineros (tareas) en el pool
+        cocineros (List[CocineroAsync]): Cocineros del pool en marcha
+        cola_pedidos (asyncio.Queue | None): Cola de TrabajoPedido (se crea
+            en iniciar(), dentro del loop que la va a usar)
+    """
+
+    def __init__(self, num_cocineros: int = 2, ejecutor: Optional[Executor] = None,
+                 preparar_en_hilo: bool = True):
+        """
+        Inicializa el servicio sin arrancar el pool.
+        Args:
+            num_cocineros: Número de cocineros (tareas)
+            ejecutor: Executor para los preparar() síncronos (None: el del loop)
+            preparar_en_hilo: Si es False, los preparar() síncronos se
+                ejecutan en el loop sin pasar por el ejecutor
+        """
+        self.num_cocineros = num_cocineros
+        self.ejecutor = ejecutor
+        self.preparar_en_hilo = preparar_en_hilo
+        self.cocineros: List[CocineroAsync] = []
+        self.cola_pedidos: Optional[asyncio.Queue] = None
+        self._tareas: List[asyncio.Task] = []
+        # Tareas de un pool cerrado sin esperar; iniciar() las espera antes de
+        # crear otro pool para que los cocineros nuevos no tomen sus pills
+        self._tareas_cerradas: List[asyncio.Task] = []
+        # Serializa iniciar(): se crea en el primer uso, dentro del loop
+        self._lock_ciclo: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cerrar(esperar=True)
+
+    async def iniciar(self):
+        """
+        Arranca el pool de cocineros si no está en marcha (idempotente).
+        SINCRONIZACIÓN: Esperar las tareas de un pool cerrado sin esperar es
+        un await; mientras tanto otra corrutina podría ver _tareas vacío y
+        arrancar un segundo pool sobre la misma cola, cuyos cocineros se
+        comerían las pills de los viejos. _lock_ciclo hace que la espera, la
+        revisión y la creación de las tareas ocurran de a una llamada.
+        """
+        if self._lock_ciclo is None:
+            # Sin await entre la revisión y la asignación: no hay carrera
+            self._lock_ciclo = asyncio.Lock()
+        async with self._lock_ciclo:
+            if self._tareas_cerradas:
+                cerradas, self._tareas_cerradas = self._tareas_cerradas, []
+                await asyncio.gather(*cerradas, return_exceptions=True)
+            if self._tareas:
+                return
+            if self.cola_pedidos is None:
+                self.cola_pedidos = asyncio.Queue()
+            for i in range(self.num_cocineros):
+                cocinero = CocineroAsync(f"COCINERO {i + 1}", self.cola_pedidos,
+                                         self.ejecutor, self.preparar_en_hilo)
+                self.cocineros.append(cocinero)
+                self._tareas.append(asyncio.create_task(cocinero.ejecutar(), name=cocinero.nombre))
+
+    async def enviar(self, pedido: Pedido):
+        """
+        Envía un pedido y espera su resultado.
+        Arranca el pool si todavía no está en marcha. Para enviar muchos
+        pedidos a la vez, combinar con asyncio.gather().
+        Args:
+            pedido: El pedido a preparar
+        Returns:
+            str: El resultado de pedido.preparar() (o relanza su excepción)
+        """
+        await self.iniciar()
+        trabajo = TrabajoPedido(pedido, asyncio.get_running_loop().create_future())
+        self.cola_pedidos.put_nowait(trabajo)
+        return await trabajo.futuro
+
+    async def cerrar(self, esperar: bool = True, cancelar_pendientes: bool = False):
+        """
+        Detiene el pool de cocineros.
+        CIERRE ORDENADO (por defecto): poison pills detrás de los pedidos
+        pendientes; todos se preparan antes de que los cocineros terminen.
+        CIERRE INMEDIATO (cancelar_pendientes=True): se vacía la cola, se
+        cancelan los Futures pendientes y se cancelan las tareas de los
+        cocineros, incluso a mitad de una preparación.
+        Args:
+            esperar: Si es True, espera a que las tareas terminen
+            cancelar_pendientes: Si es True, cierre inmediato
+        """
+        tareas, self._tareas = self._tareas, []
+        self.cocineros = []
+        if not tareas:
+            return
+        if cancelar_pendientes:
+            while not self.cola_pedidos.empty():
+                trabajo = self.cola_pedidos.get_nowait()
+                self.cola_pedidos.task_done()
+                if trabajo is not None:
+                    trabajo.futuro.cancel()
+            for tarea in tareas:
+                tarea.cancel()
+        else:
+            for _ in tareas:
+                self.cola_pedidos.put_nowait(None)
+        if esperar:
+            await asyncio.gather(*tareas, return_exceptions=True)
+        else:
+            self._tareas_cerradas.extend(tareas)
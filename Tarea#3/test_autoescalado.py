@@ -0,0 +1,105 @@
+"""
+Pruebas de ControladorEscalado con una ráfaga de pedidos.
+
+Se llama a evaluar() directamente (sin el hilo del controlador) para que
+cada decisión sea determinista: subir con la cola profunda, no pasar de
+maximo ni bajar de minimo, y retirar solo al cocinero elegido.
+
+Uso:
+    python -m pytest test_autoescalado.py
+"""
+
+import threading
+import time
+import unittest
+from autoescalado import ControladorEscalado
+from pedido import PedidoHamburguesa
+from registro import RegistroSincrono
+from servicio_pedidos import ServicioPedidos
+from test_cocinero import ESPERA, _Nula
+
+
+def _esperar(condicion) -> bool:
+    """Espera hasta ESPERA segundos a que condicion() sea verdadera."""
+    limite = time.monotonic() + ESPERA
+    while not condicion():
+        if time.monotonic() > limite:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestControladorEscalado(unittest.TestCase):
+
+    def setUp(self):
+        self.liberar = threading.Event()
+        liberar = self.liberar
+
+        class PedidoBloqueado(PedidoHamburguesa):
+            def preparar(self) -> str:
+                liberar.wait(ESPERA)
+                return super().preparar()
+
+        self.PedidoBloqueado = PedidoBloqueado
+        self.servicio = ServicioPedidos(num_cocineros=2, registro=RegistroSincrono(destino=_Nula()))
+        self.servicio.iniciar()
+        self.addCleanup(self.servicio.cerrar)
+        self.addCleanup(self.liberar.set)
+        self.controlador = ControladorEscalado(self.servicio, minimo=2, maximo=5,
+                                               umbral_profundidad=4, enfriamiento=0)
+
+    def enviar_rafaga(self, cantidad: int) -> list:
+        return [self.servicio.enviar(self.PedidoBloqueado(i)) for i in range(cantidad)]
+
+    def test_sube_con_la_cola_profunda_sin_pasar_el_maximo(self):
+        futuros = self.enviar_rafaga(40)
+        self.assertEqual(self.controlador.evaluar(), "subir")
+        # 40 pedidos a 4 por cocinero pedirían 10: se queda en el máximo
+        self.assertEqual(len(self.servicio.cocineros), 5)
+        self.assertIsNone(self.controlador.evaluar())
+        self.assertEqual(len(self.servicio.cocineros), 5)
+        self.liberar.set()
+        for futuro in futuros:
+            futuro.result(timeout=ESPERA)
+
+    def test_no_sube_con_la_cola_corta(self):
+        futuros = self.enviar_rafaga(4)
+        self.assertIsNone(self.controlador.evaluar())
+        self.assertEqual(len(self.servicio.cocineros), 2)
+        self.liberar.set()
+        for futuro in futuros:
+            futuro.result(timeout=ESPERA)
+
+    def test_baja_hasta_el_minimo_cuando_la_cola_se_vacia(self):
+        futuros = self.enviar_rafaga(40)
+        self.assertEqual(self.controlador.evaluar(), "subir")
+        self.liberar.set()
+        for futuro in futuros:
+            futuro.result(timeout=ESPERA)
+        self.assertTrue(_esperar(lambda: all(cocinero.ocioso_desde is not None
+                                             for cocinero in self.servicio.cocineros)))
+        self.assertEqual(self.controlador.evaluar(), "bajar")
+        self.assertEqual(len(self.servicio.cocineros), 2)
+        self.assertIsNone(self.controlador.evaluar())
+        self.assertEqual([accion for _, accion, _ in self.controlador.historial], ["subir", "bajar"])
+
+    def test_retirar_detiene_solo_al_cocinero_elegido(self):
+        self.servicio.agregar_cocinero()
+        cocineros = list(self.servicio.cocineros)
+        elegido = cocineros[1]
+        otros = [cocinero for cocinero in cocineros if cocinero is not elegido]
+        self.assertTrue(self.servicio.retirar_cocinero(elegido))
+        elegido.join(ESPERA)
+        self.assertFalse(elegido.is_alive())
+        self.assertTrue(all(cocinero.is_alive() for cocinero in otros))
+        self.assertEqual(self.servicio.cocineros, otros)
+        # Los que quedan siguen atendiendo
+        self.liberar.set()
+        futuros = self.enviar_rafaga(len(otros) * 2)
+        for futuro in futuros:
+            futuro.result(timeout=ESPERA)
+        self.assertFalse(self.servicio.retirar_cocinero(elegido))
+
+
+if __name__ == "__main__":
+    unittest.main()
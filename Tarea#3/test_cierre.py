@@ -0,0 +1,69 @@
+"""
+Pruebas del tiempo de cierre de un pool de 100 cocineros.
+
+Con la espera sin sondeo, cerrar() no depende de que cada cocinero se
+despierte por timeout: el cierre ordenado tarda lo que tarden los pedidos
+pendientes y el inmediato, lo que tarde el pedido que se está preparando.
+Las cotas son holgadas (una máquina lenta no debe fallarlas); con
+get(timeout=1) cada cierre tardaba del orden de un segundo o más.
+
+Uso:
+    python -m pytest test_cierre.py
+"""
+
+import time
+import unittest
+from benchmark_cierre import PedidoLento
+from registro import RegistroSincrono
+from servicio_pedidos import ServicioPedidos
+from test_cocinero import _Nula
+
+COCINEROS = 100
+PENDIENTES = 1000
+PREPARACION = 0.005
+# Milisegundos
+COTA_OCIOSO = 500
+COTA_ORDENADO = 2000
+COTA_INMEDIATO = 500
+
+
+def _pool() -> ServicioPedidos:
+    servicio = ServicioPedidos(num_cocineros=COCINEROS, registro=RegistroSincrono(destino=_Nula()))
+    servicio.iniciar()
+    return servicio
+
+
+def _cerrar(servicio: ServicioPedidos, **opciones) -> float:
+    """Milisegundos que tarda servicio.cerrar(**opciones)."""
+    inicio = time.perf_counter()
+    servicio.cerrar(**opciones)
+    return (time.perf_counter() - inicio) * 1000
+
+
+class TestCierreConCienCocineros(unittest.TestCase):
+
+    def test_cierre_ordenado_con_el_pool_ocioso(self):
+        servicio = _pool()
+        cocineros = list(servicio.cocineros)
+        milisegundos = _cerrar(servicio)
+        self.assertLess(milisegundos, COTA_OCIOSO)
+        self.assertFalse(any(cocinero.is_alive() for cocinero in cocineros))
+
+    def test_cierre_ordenado_prepara_los_pendientes(self):
+        servicio = _pool()
+        futuros = [servicio.enviar(PedidoLento(i, PREPARACION)) for i in range(PENDIENTES)]
+        milisegundos = _cerrar(servicio)
+        self.assertLess(milisegundos, COTA_ORDENADO)
+        self.assertTrue(all(futuro.done() and not futuro.cancelled() for futuro in futuros))
+
+    def test_cierre_inmediato_cancela_los_pendientes(self):
+        servicio = _pool()
+        futuros = [servicio.enviar(PedidoLento(i, PREPARACION)) for i in range(PENDIENTES)]
+        milisegundos = _cerrar(servicio, cancelar_pendientes=True)
+        self.assertLess(milisegundos, COTA_INMEDIATO)
+        self.assertTrue(all(futuro.done() for futuro in futuros))
+        self.assertTrue(any(futuro.cancelled() for futuro in futuros))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Pruebas del manejo de errores de los cocineros.
+
+Un error fuera de preparar() (get_tipo() del pedido o el registro) debe
+llegar al Future de los pedidos afectados sin matar al cocinero: los
+pedidos siguientes se siguen atendiendo. Dentro de un lote, cada pedido se
+mide por su propia preparación.
+
+Uso:
+    python -m pytest test_cocinero.py
+"""
+
+import threading
+import time
+import unittest
+from ejecutores import EjecutorHilos, preparar_lote
+from pedido import PedidoHamburguesa
+from registro import RegistroSincrono
+from servicio_pedidos import ServicioPedidos
+
+ESPERA = 5
+
+
+class _Nula:
+    """Destino de registro que descarta todo."""
+
+    def write(self, texto):
+        return len(texto)
+
+    def flush(self):
+        pass
+
+
+class PedidoSinTipo(PedidoHamburguesa):
+    """Pedido cuyo get_tipo() falla."""
+
+    def get_tipo(self) -> str:
+        raise RuntimeError("tipo roto")
+
+
+class RegistroQueFalla(RegistroSincrono):
+    """Registro que falla la primera vez que se usa."""
+
+    def __init__(self):
+        super().__init__()
+        self.fallas = 1
+
+    def registrar_varios(self, registros):
+        if self.fallas:
+            self.fallas -= 1
+            raise OSError("consola rota")
+
+
+class TestErroresFueraDePreparar(unittest.TestCase):
+
+    def test_get_tipo_que_falla_no_detiene_al_cocinero(self):
+        with ServicioPedidos(num_cocineros=1, registro=RegistroSincrono(destino=_Nula())) as servicio:
+            roto = servicio.enviar(PedidoSinTipo(1))
+            sano = servicio.enviar(PedidoHamburguesa(2))
+            with self.assertRaisesRegex(RuntimeError, "tipo roto"):
+                roto.result(timeout=ESPERA)
+            self.assertEqual(sano.result(timeout=ESPERA), "Hamburguesa 2 preparada")
+
+    def test_get_tipo_que_falla_en_un_lote_solo_afecta_a_su_pedido(self):
+        # Con el cocinero bloqueado en el primer pedido, los siguientes se
+        # juntan en la cola y se atienden en un solo lote
+        liberar = threading.Event()
+
+        class PedidoLento(PedidoHamburguesa):
+            def preparar(self) -> str:
+                liberar.wait(ESPERA)
+                return super().preparar()
+
+        with ServicioPedidos(num_cocineros=1, tamano_lote=8,
+                             registro=RegistroSincrono(destino=_Nula())) as servicio:
+            primero = servicio.enviar(PedidoLento(0))
+            futuros = [servicio.enviar(PedidoSinTipo(1) if i == 2 else PedidoHamburguesa(i))
+                       for i in range(1, 5)]
+            liberar.set()
+            primero.result(timeout=ESPERA)
+            for i, futuro in enumerate(futuros, 1):
+                if i == 2:
+                    with self.assertRaises(RuntimeError):
+                        futuro.result(timeout=ESPERA)
+                else:
+                    self.assertEqual(futuro.result(timeout=ESPERA), f"Hamburguesa {i} preparada")
+
+    def test_registro_que_falla_se_entrega_en_el_futuro(self):
+        with ServicioPedidos(num_cocineros=1, registro=RegistroQueFalla()) as servicio:
+            afectado = servicio.enviar(PedidoHamburguesa(1))
+            with self.assertRaisesRegex(OSError, "consola rota"):
+                afectado.result(timeout=ESPERA)
+            siguiente = servicio.enviar(PedidoHamburguesa(2))
+            self.assertEqual(siguiente.result(timeout=ESPERA), "Hamburguesa 2 preparada")
+
+
+class TestTiemposPorPedido(unittest.TestCase):
+
+    def test_cada_pedido_del_lote_mide_su_propia_preparacion(self):
+        liberar = threading.Event()
+        demora = 0.03
+
+        class PedidoLento(PedidoHamburguesa):
+            def preparar(self) -> str:
+                liberar.wait(ESPERA)
+                return super().preparar()
+
+        class PedidoDemorado(PedidoHamburguesa):
+            def get_tipo(self) -> str:
+                return "Demorado"
+
+            def preparar(self) -> str:
+                time.sleep(demora)
+                return super().preparar()
+
+        with ServicioPedidos(num_cocineros=1, tamano_lote=8,
+                             registro=RegistroSincrono(destino=_Nula())) as servicio:
+            primero = servicio.enviar(PedidoLento(0))
+            futuros = [servicio.enviar(PedidoDemorado(i)) for i in range(1, 5)]
+            liberar.set()
+            primero.result(timeout=ESPERA)
+            for futuro in futuros:
+                futuro.result(timeout=ESPERA)
+            resumen = servicio.metricas()["por_tipo"]["Demorado"]
+        # Con un único inicio y fin por lote, cada pedido habría medido las
+        # cuatro preparaciones; la espera crece con la posición en el lote
+        self.assertEqual(resumen["servicio"]["cantidad"], 4)
+        self.assertLess(resumen["servicio"]["max_ms"], 2.5 * demora * 1000)
+        self.assertGreater(resumen["espera"]["max_ms"], 2.5 * demora * 1000)
+
+    def test_hook_de_lote_reparte_su_duracion(self):
+        class PizzaHorno(PedidoHamburguesa):
+            @classmethod
+            def preparar_lote(cls, pedidos):
+                time.sleep(0.02)
+                return [pedido.preparar() for pedido in pedidos]
+
+        tiempos = []
+        resultados = preparar_lote([PizzaHorno(1), PizzaHorno(2)], tiempos)
+        self.assertTrue(all(exito for exito, _ in resultados))
+        (desde_1, parte_1), (desde_2, parte_2) = tiempos
+        self.assertAlmostEqual(parte_1, parte_2)
+        self.assertAlmostEqual(desde_2, desde_1 + parte_1)
+
+    def test_tiempos_en_orden_con_el_ejecutor_de_hilos(self):
+        _, tiempos = EjecutorHilos().preparar_medido([PedidoHamburguesa(i) for i in range(3)])
+        self.assertEqual(len(tiempos), 3)
+        for (desde, duracion), (siguiente, _) in zip(tiempos, tiempos[1:]):
+            self.assertLessEqual(desde + duracion, siguiente)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Pruebas de ColaPlanificada: contadores de plazos y cálculo de la clave.
+
+Solo cuentan los pedidos preparados: uno descartado por la política de
+desbordamiento o cuyo preparar() falló no es un plazo cumplido ni incumplido.
+La clave se calcula fuera del mutex de la cola: un get_tipo() lento no
+bloquea a los demás y uno que falla no deja la cola a medias.
+
+Uso:
+    python -m pytest test_cola_planificada.py
+"""
+
+import threading
+import unittest
+from cola_planificada import ColaPlanificada
+from pedido import PedidoHamburguesa
+from registro import RegistroSincrono
+from servicio_pedidos import PedidoDescartado, ServicioPedidos
+from trabajo_pedido import TrabajoPedido
+
+ESPERA = 5
+
+
+class _Nula:
+    """Destino de registro que descarta todo."""
+
+    def write(self, texto):
+        return len(texto)
+
+    def flush(self):
+        pass
+
+
+class PedidoQueFalla(PedidoHamburguesa):
+    """Pedido cuyo preparar() falla."""
+
+    def preparar(self) -> str:
+        raise RuntimeError("se quemó")
+
+
+class TestPlazos(unittest.TestCase):
+
+    def crear_servicio(self, **kwargs) -> ServicioPedidos:
+        servicio = ServicioPedidos(num_cocineros=1, cola_pedidos=ColaPlanificada("edf"),
+                                   registro=RegistroSincrono(destino=_Nula()), **kwargs)
+        self.addCleanup(servicio.cerrar)
+        return servicio
+
+    def plazos(self, servicio: ServicioPedidos) -> tuple:
+        estadisticas = servicio.cola_pedidos.estadisticas()
+        return estadisticas["plazos_cumplidos"], estadisticas["plazos_incumplidos"]
+
+    def test_pedido_descartado_no_cuenta(self):
+        servicio = self.crear_servicio(capacidad=1, desbordamiento="descartar_antiguo")
+        # Sin iniciar el pool los pedidos esperan en la cola: el segundo
+        # desplaza al primero
+        descartado = servicio.agregar_pedido(PedidoHamburguesa(1), plazo=60)
+        atendido = servicio.agregar_pedido(PedidoHamburguesa(2), plazo=60)
+        with self.assertRaises(PedidoDescartado):
+            descartado.result(timeout=ESPERA)
+        self.assertEqual(self.plazos(servicio), (0, 0))
+        servicio.iniciar()
+        self.assertEqual(atendido.result(timeout=ESPERA), "Hamburguesa 2 preparada")
+        # El callback del Future corre después de despertar a result():
+        # cerrar() espera a que el cocinero termine
+        servicio.cerrar()
+        self.assertEqual(self.plazos(servicio), (1, 0))
+
+    def test_pedido_fallido_no_cuenta(self):
+        servicio = self.crear_servicio()
+        fallido = servicio.enviar(PedidoQueFalla(1), plazo=60)
+        with self.assertRaises(RuntimeError):
+            fallido.result(timeout=ESPERA)
+        servicio.enviar(PedidoHamburguesa(2), plazo=0).result(timeout=ESPERA)
+        servicio.cerrar()
+        self.assertEqual(self.plazos(servicio), (0, 1))
+
+
+class TestClaveFueraDelMutex(unittest.TestCase):
+
+    def test_get_tipo_lento_no_bloquea_la_cola(self):
+        cola = ColaPlanificada("sjf", costos={"Hamburguesa": 0.01})
+        entrando = threading.Event()
+        liberar = threading.Event()
+
+        class PedidoLento(PedidoHamburguesa):
+            def get_tipo(self) -> str:
+                entrando.set()
+                liberar.wait(ESPERA)
+                return super().get_tipo()
+
+        productor = threading.Thread(target=cola.put, args=(TrabajoPedido(PedidoLento(1)),))
+        productor.start()
+        try:
+            self.assertTrue(entrando.wait(ESPERA))
+            # Con get_tipo() dentro de _put() esto esperaría el mutex
+            rapido = TrabajoPedido(PedidoHamburguesa(2))
+            hecho = threading.Thread(target=cola.put, args=(rapido,))
+            hecho.start()
+            hecho.join(ESPERA / 5)
+            self.assertFalse(hecho.is_alive(), "put() quedó esperando el mutex")
+            self.assertEqual(cola.qsize(), 1)
+        finally:
+            liberar.set()
+            productor.join(ESPERA)
+        # Mismo costo: sale primero el que llegó antes
+        self.assertIsNot(cola.get_nowait(), rapido)
+        self.assertIs(cola.get_nowait(), rapido)
+
+    def test_get_tipo_que_falla_no_rompe_la_cola(self):
+        cola = ColaPlanificada("sjf", maxsize=2)
+
+        class PedidoSinTipo(PedidoHamburguesa):
+            def get_tipo(self) -> str:
+                raise RuntimeError("sin tipo")
+
+        for desbordamiento in ("bloquear", "descartar_antiguo"):
+            with self.assertRaises(RuntimeError):
+                cola.agregar(TrabajoPedido(PedidoSinTipo(1)), desbordamiento)
+        self.assertEqual(cola.qsize(), 0)
+        self.assertEqual(cola.unfinished_tasks, 0)
+        trabajo = TrabajoPedido(PedidoHamburguesa(2))
+        cola.agregar(trabajo)
+        self.assertIs(cola.get_nowait(), trabajo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Pruebas de preparar_lote() con clases que redefinen el hook Pedido.preparar_lote().
+
+El hook puede redefinirse como classmethod, staticmethod o método común; en
+todos los casos el grupo se prepara con una sola llamada, y un hook que falla
+solo afecta a los pedidos de su grupo.
+
+Uso:
+    python -m pytest test_ejecutores.py
+"""
+
+import unittest
+from ejecutores import preparar_lote
+from pedido import PedidoHamburguesa, PedidoPizza
+
+
+class PizzaHornoClase(PedidoPizza):
+    """Redefine el hook como classmethod."""
+
+    @classmethod
+    def preparar_lote(cls, pedidos):
+        return [f"horno {pedido.numero_pedido}" for pedido in pedidos]
+
+
+class PizzaHornoEstatico(PedidoPizza):
+    """Redefine el hook como staticmethod."""
+
+    @staticmethod
+    def preparar_lote(pedidos):
+        return [f"estático {pedido.numero_pedido}" for pedido in pedidos]
+
+
+class PizzaHornoRoto(PedidoPizza):
+    """Redefine el hook y falla."""
+
+    @staticmethod
+    def preparar_lote(pedidos):
+        raise RuntimeError("horno roto")
+
+
+class PizzaSinHook(PedidoPizza):
+    """Subclase que hereda el hook base: se prepara pedido por pedido."""
+
+
+class TestHookPrepararLote(unittest.TestCase):
+
+    def test_hook_classmethod(self):
+        resultados = preparar_lote([PizzaHornoClase(1), PedidoHamburguesa(2), PizzaHornoClase(3)])
+        self.assertEqual(resultados, [(True, "horno 1"), (True, "Hamburguesa 2 preparada"),
+                                      (True, "horno 3")])
+
+    def test_hook_staticmethod(self):
+        resultados = preparar_lote([PizzaHornoEstatico(1), PedidoHamburguesa(2)])
+        self.assertEqual(resultados, [(True, "estático 1"), (True, "Hamburguesa 2 preparada")])
+
+    def test_hook_que_falla_solo_afecta_a_su_grupo(self):
+        resultados = preparar_lote([PizzaHornoRoto(1), PedidoHamburguesa(2), PizzaHornoRoto(3)])
+        self.assertEqual(resultados[1], (True, "Hamburguesa 2 preparada"))
+        for exito, valor in (resultados[0], resultados[2]):
+            self.assertFalse(exito)
+            self.assertIsInstance(valor, RuntimeError)
+
+    def test_sin_redefinir_el_hook_se_usa_preparar(self):
+        tiempos = []
+        resultados = preparar_lote([PizzaSinHook(1), PizzaSinHook(2)], tiempos)
+        self.assertEqual(resultados, [(True, PedidoPizza(1).preparar()), (True, PedidoPizza(2).preparar())])
+        self.assertEqual(len(tiempos), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
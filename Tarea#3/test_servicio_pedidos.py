@@ -0,0 +1,62 @@
+"""
+Pruebas del ciclo de vida de ServicioPedidos.
+
+cerrar() no debe quedar esperando lugar en una cola acotada llena: las
+poison pills se encolan sin respetar la capacidad, y el lock del ciclo de
+vida queda libre para agregar_cocinero() y retirar_cocinero().
+
+Uso:
+    python -m pytest test_servicio_pedidos.py
+"""
+
+import threading
+import unittest
+from pedido import PedidoHamburguesa
+from registro import RegistroSincrono
+from servicio_pedidos import ServicioPedidos
+from test_cocinero import ESPERA, _Nula
+
+
+class TestCerrarConColaLlena(unittest.TestCase):
+
+    def test_cerrar_no_bloquea_con_la_cola_acotada_llena(self):
+        liberar = threading.Event()
+        empezados = threading.Semaphore(0)
+
+        class PedidoLento(PedidoHamburguesa):
+            def preparar(self) -> str:
+                empezados.release()
+                liberar.wait(ESPERA)
+                return super().preparar()
+
+        servicio = ServicioPedidos(num_cocineros=2, capacidad=2,
+                                   registro=RegistroSincrono(destino=_Nula()))
+        servicio.iniciar()
+        cocineros = list(servicio.cocineros)
+        try:
+            # Los dos cocineros quedan ocupados y la cola, llena
+            futuros = [servicio.enviar(PedidoLento(i)) for i in range(2)]
+            for _ in range(2):
+                self.assertTrue(empezados.acquire(timeout=ESPERA))
+            futuros += [servicio.enviar(PedidoHamburguesa(i)) for i in range(2, 4)]
+            self.assertEqual(servicio.cola_pedidos.qsize(), 2)
+
+            cierre = threading.Thread(target=servicio.cerrar, kwargs={"esperar": False})
+            cierre.start()
+            cierre.join(ESPERA)
+            self.assertFalse(cierre.is_alive(), "cerrar() quedó esperando lugar en la cola")
+            # El lock del ciclo de vida quedó libre (el pool ya no está en marcha)
+            self.assertIsNone(servicio.agregar_cocinero())
+        finally:
+            liberar.set()
+        # Cierre ordenado: los pedidos encolados antes de cerrar() se preparan igual
+        for i, futuro in enumerate(futuros):
+            self.assertEqual(futuro.result(timeout=ESPERA), f"Hamburguesa {i} preparada")
+        for cocinero in cocineros:
+            cocinero.join(ESPERA)
+            self.assertFalse(cocinero.is_alive())
+        self.assertEqual(servicio.cola_pedidos.qsize(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
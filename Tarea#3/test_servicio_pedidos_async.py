@@ -0,0 +1,50 @@
+"""
+Pruebas del ciclo de vida de ServicioPedidosAsync.
+
+Dos iniciar() concurrentes mientras se espera un pool cerrado sin esperar
+deben arrancar un único pool nuevo: si arrancaran dos sobre la misma cola,
+los cocineros nuevos tomarían las pills de los viejos.
+
+Uso:
+    python -m pytest test_servicio_pedidos_async.py
+"""
+
+import asyncio
+import unittest
+from pedido import PedidoHamburguesa
+from servicio_pedidos_async import ServicioPedidosAsync
+
+ESPERA = 5
+
+
+class PedidoLento(PedidoHamburguesa):
+    """Pedido asíncrono que tarda un poco, para que el pool cerrado siga vivo."""
+
+    async def preparar(self) -> str:
+        await asyncio.sleep(0.05)
+        return PedidoHamburguesa.preparar(self)
+
+
+class TestIniciarConcurrente(unittest.TestCase):
+
+    def test_iniciar_concurrente_arranca_un_solo_pool(self):
+        async def escenario():
+            servicio = ServicioPedidosAsync(num_cocineros=2, preparar_en_hilo=False)
+            await servicio.iniciar()
+            pendientes = [asyncio.create_task(servicio.enviar(PedidoLento(i))) for i in range(2)]
+            await asyncio.sleep(0)
+            viejas = list(servicio._tareas)
+            await servicio.cerrar(esperar=False)
+            await asyncio.gather(servicio.iniciar(), servicio.iniciar())
+            self.assertEqual(len(servicio._tareas), 2)
+            self.assertTrue(all(tarea.done() for tarea in viejas))
+            self.assertEqual(await servicio.enviar(PedidoHamburguesa(3)), "Hamburguesa 3 preparada")
+            await servicio.cerrar()
+            return await asyncio.gather(*pendientes)
+
+        resultados = asyncio.run(asyncio.wait_for(escenario(), ESPERA))
+        self.assertEqual(resultados, ["Hamburguesa 0 preparada", "Hamburguesa 1 preparada"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Módulo que define el trabajo que viaja por la cola de pedidos.
+
+Cada pedido encolado se envuelve en un TrabajoPedido que lo asocia con el
+Future donde se publicará su resultado. Así el cocinero que lo prepare puede
+notificar al cliente que lo envió sin que ambos se conozcan (el Future es el
+único canal entre producer y consumer para ese pedido).
+
+POR QUÉ concurrent.futures.Future:
+- Es thread-safe: el cocinero lo completa y el cliente lo espera desde hilos
+  distintos sin sincronización adicional
+- Propaga excepciones: si preparar() falla, result() relanza el error en el
+  hilo del cliente
+- Permite cancelar pedidos que aún no empezaron a prepararse
+- Es la misma interfaz que usan ThreadPoolExecutor y asyncio.wrap_future()
+
+El servicio asyncio (servicio_pedidos_async.py) usa la misma clase con un
+asyncio.Future, que tiene los mismos métodos set_result/set_exception/cancel.
+"""
+
+import time
+from concurrent.futures import Future
+from typing import Optional
+from pedido import Pedido
+
+
+class TrabajoPedido:
+    """
+    Unidad de trabajo de la cola: un pedido y el Future de su resultado.
+    Attributes:
+        pedido (Pedido): El pedido a preparar
+        futuro (Future | asyncio.Future): Se resuelve con el resultado de
+            pedido.preparar() o con la excepción que haya lanzado
+        prioridad (int): Menor es más urgente (solo la usa ColaPlanificada)
+        limite (float | None): Instante (time.monotonic()) en que vence el
+            plazo del pedido, o None si no tiene plazo
+        llegada (float): Instante (time.monotonic()) en que se creó el trabajo,
+            justo antes de encolarlo
+        inicio (float | None): Instante en que empezó su propia preparación
+        fin (float | None): Instante en que terminó su preparación
+        clave (float | None): Clave de orden en ColaPlanificada, calculada
+            al encolarlo
+    """
+
+    def __init__(self, pedido: Pedido, futuro: Optional[Future] = None,
+                 prioridad: int = 0, plazo: Optional[float] = None):
+        """
+        Crea el trabajo para un pedido con un Future pendiente.
+        Args:
+            pedido: El pedido a preparar
+            futuro: Future a usar; por defecto un concurrent.futures.Future
+            prioridad: Prioridad del pedido (0 por defecto)
+            plazo: Segundos desde ahora en los que debería estar listo
+        """
+        self.pedido = pedido
+        self.futuro = Future() if futuro is None else futuro
+        self.prioridad = prioridad
+        self.llegada = time.monotonic()
+        self.inicio: Optional[float] = None
+        self.fin: Optional[float] = None
+        self.limite = None if plazo is None else self.llegada + plazo
+        self.clave: Optional[float] = None